@@ -1,4 +1,12 @@
 import logging
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Dict
 
 from .analytics.api_facebook_analytics import ApiFacebookAnalytics
 from .analytics.api_instagram_analytics import ApiInstagramAnalytics
@@ -10,11 +18,16 @@ from .instagram.instagram_client import InstagramClient
 from .planka.planka_client import PlankaClient
 from .sheets.sheets_client import GoogleSheetsClient
 from .strings import StringsDBClient
+from .tg.access_rights import AccessRights
 from .tg.tg_client import TgClient
 from .utils.singleton import Singleton
 
 logger = logging.getLogger(__name__)
 
+# startup sheet downloads, can be overridden in the sheets config
+STARTUP_FETCH_WORKERS = 4
+STARTUP_FETCH_TIMEOUT_SEC = 60
+
 
 class AppContext(Singleton):
     """
@@ -41,8 +54,7 @@ class AppContext(Singleton):
         self.db_client = DBClient(db_config=config_manager.get_db_config())
 
         if not skip_db_update:
-            self.strings_db_client.fetch_strings_sheet(self.sheets_client)
-            self.db_client.fetch_all(self.sheets_client)
+            self._sync_sheets()
 
         self.planka_client = PlankaClient(
             planka_config=config_manager.get_planka_config()
@@ -62,5 +74,148 @@ class AppContext(Singleton):
         tg_config = config_manager.get_telegram_config()
         self.set_access_rights(tg_config)
 
+    def _sync_sheets(self):
+        """
+        Downloads strings, curators, team and rubrics sheets concurrently,
+        then writes them to the DBs one by one. Strings go first, since
+        the other sheets are parsed with column names from strings.
+        A sheet that fails or times out is skipped, keeping its DB data.
+        """
+        sheets_config = self.config_manager.get_sheets_config()
+        syncs = {
+            "strings": (
+                self.sheets_client.fetch_strings,
+                self.strings_db_client.sync_strings_sheet,
+            ),
+            "curators": (
+                self.sheets_client.fetch_curators,
+                self.db_client.sync_curators_sheet,
+            ),
+            "team": (self.sheets_client.fetch_hr_team, self.db_client.sync_team_sheet),
+            "rubrics": (
+                self.sheets_client.fetch_rubrics,
+                self.db_client.sync_rubrics_sheet,
+            ),
+        }
+        start = time.monotonic()
+        tables, fetch_times = _fetch_concurrently(
+            {name: fetch for name, (fetch, _) in syncs.items()},
+            workers=sheets_config.get("startup_fetch_workers", STARTUP_FETCH_WORKERS),
+            timeout_sec=sheets_config.get(
+                "startup_fetch_timeout_sec", STARTUP_FETCH_TIMEOUT_SEC
+            ),
+        )
+        fetched = time.monotonic()
+
+        sync_times = {}
+        for name, (_, sync) in syncs.items():
+            if name not in tables:
+                continue
+            sync_start = time.monotonic()
+            sync(tables[name])
+            sync_times[name] = time.monotonic() - sync_start
+        done = time.monotonic()
+
+        def _format(times: Dict[str, float]) -> str:
+            return ", ".join(
+                f"{name} {seconds:.2f}s" for name, seconds in times.items()
+            )
+
+        logger.info(
+            f"Sheets synced in {done - start:.2f}s: "
+            f"download {fetched - start:.2f}s ({_format(fetch_times)}), "
+            f"db write {done - fetched:.2f}s ({_format(sync_times)})"
+        )
+
     def set_access_rights(self, tg_config: dict):
         self.admin_chat_ids = set(tg_config["admin_chat_ids"])
+        self.manager_chat_ids = set(tg_config.get("manager_chat_ids", []))
+        self._access_rights = self._build_access_rights()
+
+    def get_access_rights(self) -> AccessRights:
+        """
+        Permission sets for handlers. Follows curators sheet updates
+        through the identity resolver generation.
+        """
+        access_rights = self._access_rights
+        if (
+            access_rights.generation
+            != self.db_client.get_identity_resolver().generation
+        ):
+            access_rights = self._access_rights = self._build_access_rights()
+        return access_rights
+
+    def _build_access_rights(self) -> AccessRights:
+        resolver = self.db_client.get_identity_resolver()
+        return AccessRights(
+            self.admin_chat_ids, resolver.curator_logins, resolver.generation
+        )
+
+
+def _fetch_concurrently(
+    fetchers: Dict[str, Callable[[], object]], workers: int, timeout_sec: float
+):
+    """
+    Runs fetchers on a bounded thread pool. Returns results and durations
+    of the fetchers that succeeded within timeout_sec after their own start,
+    so that fetchers queued behind slow ones get the full timeout too.
+    """
+    # fetcher name -> time.monotonic() when it started running
+    starts = {}
+
+    def _timed(name, fetch):
+        starts[name] = time.monotonic()
+        return fetch(), time.monotonic() - starts[name]
+
+    results = {}
+    durations = {}
+    max_workers = min(workers, len(fetchers))
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="SheetFetch"
+    )
+    try:
+        pending = {
+            name: executor.submit(_timed, name, fetch)
+            for name, fetch in fetchers.items()
+        }
+        # timed out fetchers keep their workers until they return
+        timed_out = []
+        while pending:
+            now = time.monotonic()
+            for name, future in list(pending.items()):
+                if future.done():
+                    del pending[name]
+                    try:
+                        results[name], durations[name] = future.result()
+                    except CancelledError:
+                        pass
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch {name} sheet", exc_info=e)
+                elif name in starts and now - starts[name] >= timeout_sec:
+                    del pending[name]
+                    timed_out.append(future)
+                    logger.warning(
+                        f"Fetching {name} sheet timed out after {timeout_sec}s"
+                    )
+            if not pending:
+                break
+            timed_out = [future for future in timed_out if not future.done()]
+            if len(timed_out) >= max_workers:
+                for name, future in pending.items():
+                    future.cancel()
+                    logger.warning(
+                        f"Fetching {name} sheet not started, no free workers"
+                    )
+                break
+            deadlines = [
+                starts[name] + timeout_sec for name in pending if name in starts
+            ]
+            wait(
+                list(pending.values()),
+                timeout=max(min(deadlines, default=now + timeout_sec) - now, 0),
+                return_when=FIRST_COMPLETED,
+            )
+    finally:
+        # don't wait for the downloads that timed out
+        executor.shutdown(wait=False)
+    return results, durations
@@ -1,14 +1,18 @@
+import copy
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import create_engine, desc, inspect, text
+from sheetfu import Table
+from sqlalchemy import bindparam, desc, inspect, text
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from .. import consts
 from ..sheets.sheets_client import GoogleSheetsClient
 from ..utils.singleton import Singleton
-from ..utils.telegram import normalize_telegram_username
 from .db_objects import (
     Base,
     Chat,
@@ -18,53 +22,113 @@ from .db_objects import (
     TeamMember,
     TrelloAnalytics,
     User,
+    normalize_identity,
 )
+from .engine import create_db_engine
+from .identity_resolver import IdentityResolver
+from .sheet_sync import sync_table
 
 logger = logging.getLogger(__name__)
 
+# team columns missing in databases created by older versions of the bot
+TEAM_EXTRA_COLUMNS = (
+    ("telegram_id", "INTEGER"),
+    ("telegram_norm", "VARCHAR"),
+    ("trello_norm", "VARCHAR"),
+    ("focalboard_norm", "VARCHAR"),
+)
+# indexes missing in databases created by older versions of the bot
+EXTRA_INDEXES = (
+    ("ix_reminders_next_reminder_datetime", "reminders", "next_reminder_datetime"),
+)
+
 
 class DBClient(Singleton):
     def __init__(self, db_config=None):
         if self.was_initialized():
             return
 
-        self._db_config = db_config
+        self._db_config = copy.deepcopy(db_config)
+        self._identity_lock = threading.Lock()
+        self._identity_generation = 0
+        self._identity_resolver = None
+        self._identity_resolver_builds = 0
+        # claims due reminders, so that concurrent callers don't send them twice
+        self._reminders_lock = threading.Lock()
+        self._reminder_listeners: List[Callable[[int, Optional[datetime]], None]] = []
         self._update_from_config()
         logger.info("DBClient successfully initialized")
 
     def update_config(self, new_db_config: dict):
-        """To be called after config automatic update"""
-        self._db_config = new_db_config
+        """
+        To be called after config automatic update.
+        The engine is only rebuilt if the db config has actually changed.
+        """
+        if new_db_config == self._db_config:
+            logger.debug("DB config not changed, keeping the engine")
+            return
+        self._db_config = copy.deepcopy(new_db_config)
+        old_engine = self.engine
         self._update_from_config()
+        # Sessions still running on the old engine keep their connections,
+        # the disposed pool closes them once they are returned.
+        old_engine.dispose()
+        logger.info("DB engine rebuilt after config update")
 
     def _update_from_config(self):
-        self.engine = create_engine(
-            self._db_config["uri"],
-            connect_args={"check_same_thread": False},
-            echo=False,
-        )
-        session_factory = sessionmaker(bind=self.engine)
-        self.Session = scoped_session(session_factory)
-        Base.metadata.create_all(self.engine)
-        self._ensure_team_telegram_id_column()
-
-    def _ensure_team_telegram_id_column(self):
-        inspector = inspect(self.engine)
+        # prepare the new engine completely before switching to it
+        engine = create_db_engine(self._db_config)
+        Base.metadata.create_all(engine)
+        self._ensure_team_columns(engine)
+        self._ensure_indexes(engine)
+        self.engine = engine
+        self.Session = scoped_session(sessionmaker(bind=engine))
+        self._invalidate_identity_resolver()
+
+    def _ensure_team_columns(self, engine):
+        """Adds columns introduced after the team table was created"""
+        inspector = inspect(engine)
         if "team" not in inspector.get_table_names():
             return
 
         column_names = {column["name"] for column in inspector.get_columns("team")}
-        if "telegram_id" in column_names:
+        missing_columns = [
+            (name, column_type)
+            for name, column_type in TEAM_EXTRA_COLUMNS
+            if name not in column_names
+        ]
+        if not missing_columns:
             return
 
-        with self.engine.begin() as connection:
-            connection.execute(text("ALTER TABLE team ADD COLUMN telegram_id INTEGER"))
-            connection.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS "
-                    "ix_team_telegram_id ON team (telegram_id)"
+        with engine.begin() as connection:
+            for name, column_type in missing_columns:
+                connection.execute(
+                    text(f"ALTER TABLE team ADD COLUMN {name} {column_type}")
+                )
+                connection.execute(
+                    text(f"CREATE INDEX IF NOT EXISTS ix_team_{name} ON team ({name})")
+                )
+        if any(name.endswith("_norm") for name, _ in missing_columns):
+            self._backfill_team_norm_columns(engine)
+
+    def _ensure_indexes(self, engine):
+        """Adds indexes introduced after the tables were created"""
+        with engine.begin() as connection:
+            for name, table, column in EXTRA_INDEXES:
+                connection.execute(
+                    text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
                 )
-            )
+
+    def _backfill_team_norm_columns(self, engine):
+        session = sessionmaker(bind=engine)()
+        try:
+            for member in session.query(TeamMember).all():
+                member.telegram_norm = normalize_identity(member.telegram)
+                member.trello_norm = normalize_identity(member.trello)
+                member.focalboard_norm = normalize_identity(member.focalboard)
+            session.commit()
+        finally:
+            session.close()
 
     def fetch_all(self, sheets_client: GoogleSheetsClient):
         self.fetch_curators_sheet(sheets_client)
@@ -72,132 +136,234 @@ class DBClient(Singleton):
         self.fetch_rubrics_sheet(sheets_client)
 
     def fetch_curators_sheet(self, sheets_client: GoogleSheetsClient):
-        session = self.Session()
         try:
-            # clean this table
-            session.query(Curator).delete()
-            # re-download it
             curators = sheets_client.fetch_curators()
-            for item in curators:
-                curator = Curator.from_sheetfu_item(item)
-                session.add(curator)
+        except Exception as e:
+            logger.warning("Failed to fetch curators sheet", exc_info=e)
+            return 0
+        return self.sync_curators_sheet(curators)
+
+    def sync_curators_sheet(self, curators: Table) -> int:
+        """Writes downloaded curators sheet to the DB"""
+        session = self.Session()
+        try:
+            result = sync_table(
+                session.connection(),
+                Curator.__table__,
+                (_row_values(Curator.from_sheetfu_item(item)) for item in curators),
+            )
             session.commit()
         except Exception as e:
             logger.warning("Failed to update curators table from sheet", exc_info=e)
             session.rollback()
             return 0
+        finally:
+            self._invalidate_identity_resolver()
+        logger.info(f"Curators table synced: {result}")
         return len(curators)
 
     def fetch_team_sheet(self, sheets_client: GoogleSheetsClient):
-        session = self.Session()
         try:
-            # clean this table
-            session.query(TeamMember).delete()
-            # re-download it
             team = sheets_client.fetch_hr_team()
+        except Exception as e:
+            logger.warning("Failed to fetch team sheet", exc_info=e)
+            return 0
+        return self.sync_team_sheet(team)
+
+    def sync_team_sheet(self, team: Table) -> int:
+        """Writes downloaded team sheet to the DB and links users to members"""
+        session = self.Session()
+        try:
+            # keep already linked telegram ids unless the login has changed
+            linked_ids = {
+                member_id: (telegram_norm, telegram_id)
+                for member_id, telegram_norm, telegram_id in session.query(
+                    TeamMember.id, TeamMember.telegram_norm, TeamMember.telegram_id
+                )
+            }
+            rows = []
             for item in team:
-                member = TeamMember.from_sheetfu_item(item)
-                session.add(member)
+                row = _row_values(TeamMember.from_sheetfu_item(item))
+                telegram_norm, telegram_id = linked_ids.get(row["id"], (None, None))
+                if telegram_norm == row["telegram_norm"]:
+                    row["telegram_id"] = telegram_id
+                rows.append(row)
+            result = sync_table(session.connection(), TeamMember.__table__, rows)
             session.commit()
             self._link_users_to_team_members(session)
         except Exception as e:
             logger.warning("Failed to update team table from sheet", exc_info=e)
             session.rollback()
             return 0
+        finally:
+            self._invalidate_identity_resolver()
+        logger.info(f"Team table synced: {result}")
         return len(team)
 
     def _link_users_to_team_members(self, session):
-        users_by_tg_id = {
-            u.telegram_user_id: u
-            for u in session.query(User).all()
-            if u.telegram_user_id
-        }
+        """
+        Links users to team members by telegram id or login.
+        Reads plain rows once and writes changes with two executemany UPDATEs.
+        """
+        start = time.monotonic()
+        users = session.query(
+            User.id, User.telegram_user_id, User.telegram_username, User.team_member_id
+        ).all()
+        users_by_tg_id = {u.telegram_user_id: u for u in users if u.telegram_user_id}
         users_by_username = {
-            u.telegram_username.lower(): u
-            for u in session.query(User).all()
-            if u.telegram_username
+            u.telegram_username.lower(): u for u in users if u.telegram_username
         }
-        for member in session.query(TeamMember).all():
+        member_telegram_ids = {}
+        user_member_ids = {}
+        for member_id, telegram_id, telegram_norm in session.query(
+            TeamMember.id, TeamMember.telegram_id, TeamMember.telegram_norm
+        ):
             user = None
-            if member.telegram_id:
-                user = users_by_tg_id.get(member.telegram_id)
-            if user is None and member.telegram:
-                normalized = member.telegram.strip().lstrip("@").lower()
-                user = users_by_username.get(normalized)
-            if user:
-                if member.telegram_id is None:
-                    member.telegram_id = user.telegram_user_id
-                if user.team_member_id != member.id:
-                    user.team_member_id = member.id
+            if telegram_id:
+                user = users_by_tg_id.get(telegram_id)
+            if user is None and telegram_norm:
+                user = users_by_username.get(telegram_norm)
+            if user is None:
+                continue
+            if telegram_id is None and user.telegram_user_id is not None:
+                member_telegram_ids[member_id] = user.telegram_user_id
+            if user_member_ids.get(user.id, user.team_member_id) != member_id:
+                user_member_ids[user.id] = member_id
+
+        team_table = TeamMember.__table__
+        users_table = User.__table__
+        if member_telegram_ids:
+            session.execute(
+                team_table.update().where(team_table.c.id == bindparam("_id")),
+                [
+                    {"_id": member_id, "telegram_id": telegram_id}
+                    for member_id, telegram_id in member_telegram_ids.items()
+                ],
+            )
+        if user_member_ids:
+            session.execute(
+                users_table.update().where(users_table.c.id == bindparam("_id")),
+                [
+                    {"_id": user_id, "team_member_id": member_id}
+                    for user_id, member_id in user_member_ids.items()
+                ],
+            )
         session.commit()
+        logger.info(
+            f"Linked team members: {len(member_telegram_ids)} telegram ids, "
+            f"{len(user_member_ids)} users updated in "
+            f"{time.monotonic() - start:.3f}s"
+        )
 
     def fetch_rubrics_sheet(self, sheets_client: GoogleSheetsClient):
-        session = self.Session()
         try:
-            # clean this table
-            session.query(Rubric).delete()
-            # re-download it
             rubrics = sheets_client.fetch_rubrics()
+        except Exception as e:
+            logger.warning("Failed to fetch rubrics sheet", exc_info=e)
+            return 0
+        return self.sync_rubrics_sheet(rubrics)
+
+    def sync_rubrics_sheet(self, rubrics: Table) -> int:
+        """Writes downloaded rubrics sheet to the DB"""
+        session = self.Session()
+        try:
+            rows = []
             for item in rubrics:
                 rubric = Rubric.from_sheetfu_item(item)
                 if rubric is None:
                     continue
-                session.add(rubric)
+                rows.append(_row_values(rubric))
+            result = sync_table(session.connection(), Rubric.__table__, rows)
             session.commit()
         except Exception as e:
             logger.warning("Failed to update rubric table from sheet", exc_info=e)
             session.rollback()
             return 0
+        logger.info(f"Rubrics table synced: {result}")
         return len(rubrics)
 
+    def get_identity_resolver(self) -> IdentityResolver:
+        """
+        Identity maps for the current team/curators sheet generation.
+        Rebuilt lazily after the sheets are re-fetched.
+        """
+        resolver = self._identity_resolver
+        if resolver is not None and resolver.generation == self._identity_generation:
+            return resolver
+        with self._identity_lock:
+            generation = self._identity_generation
+            resolver = self._identity_resolver
+            if resolver is None or resolver.generation != generation:
+                session = self.Session()
+                # plain rows rather than entities, so that objects cached in
+                # this thread's session can't shadow freshly synced data
+                resolver = IdentityResolver(
+                    session.query(
+                        TeamMember.id,
+                        TeamMember.telegram,
+                        TeamMember.telegram_id,
+                        TeamMember.focalboard,
+                        TeamMember.telegram_norm,
+                        TeamMember.trello_norm,
+                        TeamMember.focalboard_norm,
+                    ).all(),
+                    session.query(Curator.telegram).all(),
+                    generation=generation,
+                )
+                self._identity_resolver = resolver
+                self._identity_resolver_builds += 1
+                logger.debug(f"Identity resolver rebuilt, generation {generation}")
+            return resolver
+
+    def get_identity_resolver_stats(self) -> dict:
+        stats = self.get_identity_resolver().stats()
+        stats["builds"] = self._identity_resolver_builds
+        return stats
+
+    @contextmanager
+    def _read_session(self):
+        """
+        Short-lived session for read helpers. Objects it returns are fully
+        loaded and detached, so commits in the thread's scoped session
+        don't expire them and touching their attributes issues no queries.
+        """
+        session = self.Session.session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def _invalidate_identity_resolver(self):
+        with self._identity_lock:
+            self._identity_generation += 1
+
     def find_telegram_id_by_focalboard_username(
         self, focalboard_username: str
     ) -> Optional[int]:
-        normalized = focalboard_username.strip().lstrip("@").lower()
-        members = self.Session().query(TeamMember).all()
-        member = next(
-            (
-                m
-                for m in members
-                if m.focalboard
-                and m.focalboard.strip().lstrip("@").lower() == normalized
-            ),
-            None,
+        return self.get_identity_resolver().telegram_id_by_focalboard(
+            focalboard_username
         )
-        return member.telegram_id if member else None
 
     def find_focalboard_username_by_telegram_username(self, telegram_username: str):
-        normalized = telegram_username.strip().lstrip("@").lower()
-        members = self.Session().query(TeamMember).all()
-        member = next(
-            (
-                m
-                for m in members
-                if m.telegram and m.telegram.strip().lstrip("@").lower() == normalized
-            ),
-            None,
+        focalboard = self.get_identity_resolver().focalboard_by_telegram(
+            telegram_username
         )
-        if member is None:
+        if focalboard is None:
             logger.warning(f"Focalboard id not found for telegram {telegram_username}")
-            return None
-        return member.focalboard
+        return focalboard
 
     def find_author_telegram_by_trello(self, trello_id: str):
-        normalized = normalize_telegram_username(trello_id)
-        members = self.Session().query(TeamMember).all()
-        member = next(
-            (
-                m
-                for m in members
-                if normalize_telegram_username(m.trello) == normalized
-                or normalize_telegram_username(m.focalboard) == normalized
-            ),
-            None,
-        )
-        if member is None:
+        telegram = self.get_identity_resolver().telegram_by_trello(trello_id)
+        if telegram is None:
             logger.warning(f"Telegram id not found for team member {trello_id}")
-            return None
-        return member.telegram
+        return telegram
+
+    def find_team_member_id_by_telegram_username(
+        self, telegram_username: str
+    ) -> Optional[str]:
+        return self.get_identity_resolver().team_member_id_by_telegram(
+            telegram_username
+        )
 
     def get_curator_by_telegram(self, telegram: str) -> Curator:
         session = self.Session()
@@ -213,8 +379,18 @@ class DBClient(Singleton):
         return self.Session().query(Rubric).all()
 
     def get_all_chats(self) -> List[Chat]:
-        session = self.Session()
-        return session.query(Chat).all()
+        with self._read_session() as session:
+            return session.query(Chat).all()
+
+    def get_chat_names(self, chat_ids: Iterable[int]) -> Dict[int, str]:
+        """Titles of known chats by id, in one query"""
+        chat_ids = set(chat_ids)
+        if not chat_ids:
+            return {}
+        with self._read_session() as session:
+            return dict(
+                session.query(Chat.id, Chat.title).filter(Chat.id.in_(chat_ids))
+            )
 
     def get_all_members(self) -> List[TeamMember]:
         session = self.Session()
@@ -341,39 +517,74 @@ class DBClient(Singleton):
         """
         If user_chat_id is None, shows all reminders
         """
-        session = self.Session()
-        if user_chat_id is None:
-            reminders = session.query(Reminder, Chat).join(Chat).all()
-        else:
+        with self._read_session() as session:
+            query = session.query(Reminder, Chat).join(Chat)
+            if user_chat_id is not None:
+                query = query.filter(Reminder.creator_chat_id == user_chat_id)
+            return query.all()
+
+    def get_reminders_to_send(self) -> List[Reminder]:
+        """
+        Claims due reminders: moves them to their next date in one batched
+        UPDATE and returns those due within the last 3 hours.
+        """
+        with self._reminders_lock:
+            session = self.Session()
+            now = self._get_now_msk_naive()
             reminders = (
-                session.query(Reminder, Chat)
-                .join(Chat)
-                .filter(Reminder.creator_chat_id == user_chat_id)
+                session.query(Reminder)
+                .filter(Reminder.next_reminder_datetime <= now)
                 .all()
             )
-        return reminders
+            # if there's more than 3 hours lag then don't send
+            reminders_to_send = [
+                reminder
+                for reminder in reminders
+                if reminder.next_reminder_datetime >= now - timedelta(hours=3)
+            ]
+            next_dates = {
+                reminder.id: reminder.next_reminder_datetime
+                + timedelta(days=reminder.frequency_days)
+                for reminder in reminders
+            }
+            if next_dates:
+                reminders_table = Reminder.__table__
+                session.execute(
+                    reminders_table.update().where(
+                        reminders_table.c.id == bindparam("_id")
+                    ),
+                    [
+                        {"_id": reminder_id, "next_reminder_datetime": next_date}
+                        for reminder_id, next_date in next_dates.items()
+                    ],
+                )
+            session.commit()
+        for reminder_id, next_date in next_dates.items():
+            self._notify_reminder_listeners(reminder_id, next_date)
+        return reminders_to_send
 
-    def get_reminders_to_send(self) -> List[Reminder]:
+    def get_reminder_times(self) -> List[Tuple[int, datetime]]:
+        """(reminder id, next reminder datetime) for all reminders"""
         session = self.Session()
-        now = self._get_now_msk_naive()
-        reminders = (
-            session.query(Reminder).filter(Reminder.next_reminder_datetime <= now).all()
-        )
-        # if there's more than 3 hours lag then don't send
-        reminders_to_send = [
-            reminder
-            for reminder in reminders
-            if reminder.next_reminder_datetime >= now - timedelta(hours=3)
-        ]
-        for reminder in reminders:
-            next_date = reminder.next_reminder_datetime + timedelta(
-                days=reminder.frequency_days
-            )
-            session.query(Reminder).filter(Reminder.id == reminder.id).update(
-                {Reminder.next_reminder_datetime: next_date}
-            )
-        session.commit()
-        return reminders_to_send
+        return session.query(Reminder.id, Reminder.next_reminder_datetime).all()
+
+    def add_reminder_listener(
+        self, listener: Callable[[int, Optional[datetime]], None]
+    ):
+        """
+        Listener is called with reminder id and its new next reminder datetime
+        (None for deleted reminders) after every change of the schedule.
+        """
+        self._reminder_listeners.append(listener)
+
+    def _notify_reminder_listeners(
+        self, reminder_id: int, next_reminder_datetime: Optional[datetime]
+    ):
+        for listener in self._reminder_listeners:
+            try:
+                listener(reminder_id, next_reminder_datetime)
+            except Exception as e:
+                logger.error(f"Reminder listener {listener} failed", exc_info=e)
 
     def add_reminder(
         self,
@@ -389,21 +600,21 @@ class DBClient(Singleton):
         session = self.Session()
         next_reminder = self._make_next_reminder_ts(weekday_num, time)
 
-        session.add(
-            Reminder(
-                group_chat_id=group_chat_id,
-                creator_chat_id=creator_chat_id,
-                name=name,
-                text=text,
-                weekday=weekday_num,
-                time=time,
-                next_reminder_datetime=next_reminder,
-                frequency_days=frequency_days,
-                is_active=True,
-                send_poll=send_poll,
-            )
+        reminder = Reminder(
+            group_chat_id=group_chat_id,
+            creator_chat_id=creator_chat_id,
+            name=name,
+            text=text,
+            weekday=weekday_num,
+            time=time,
+            next_reminder_datetime=next_reminder,
+            frequency_days=frequency_days,
+            is_active=True,
+            send_poll=send_poll,
         )
+        session.add(reminder)
         session.commit()
+        self._notify_reminder_listeners(reminder.id, next_reminder)
 
     def get_reminder_by_id(self, reminder_id: int) -> Reminder:
         session = self.Session()
@@ -419,11 +630,16 @@ class DBClient(Singleton):
             kwargs["send_poll"] = bool(kwargs["send_poll"])
         session.query(Reminder).filter(Reminder.id == reminder_id).update(kwargs)
         session.commit()
+        if "next_reminder_datetime" in kwargs:
+            self._notify_reminder_listeners(
+                reminder_id, kwargs["next_reminder_datetime"]
+            )
 
     def delete_reminder(self, reminder_id: int):
         session = self.Session()
         session.query(Reminder).filter(Reminder.id == reminder_id).delete()
         session.commit()
+        self._notify_reminder_listeners(reminder_id, None)
 
     @staticmethod
     def _get_now_msk_naive() -> datetime:
@@ -463,3 +679,11 @@ class DBClient(Singleton):
         return (
             session.query(TrelloAnalytics).order_by(desc(TrelloAnalytics.date)).first()
         )
+
+
+def _row_values(obj: Base) -> dict:
+    """
+    Column values of an ORM object for bulk Core statements,
+    including columns computed by ORM validators (e.g. TeamMember.*_norm)
+    """
+    return {column.name: getattr(obj, column.name) for column in obj.__table__.columns}
@@ -5,9 +5,11 @@ from typing import Optional
 from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import validates
 from sqlalchemy.types import TypeDecorator, CHAR
 
 from ..strings import load
+from ..utils.telegram import normalize_telegram_username
 
 Base = declarative_base()
 
@@ -103,10 +105,20 @@ class TeamMember(Base):
     # Nullable while Telegram IDs are being bootstrapped from existing form/team data.
     # Once new-member intake reliably captures IDs, make this non-null.
     telegram_id = Column(Integer, nullable=True, index=True)
+    # Normalized copies of the identity columns for indexed lookups,
+    # kept in sync by _normalize_identity below.
+    telegram_norm = Column(String, nullable=True, index=True)
+    trello_norm = Column(String, nullable=True, index=True)
+    focalboard_norm = Column(String, nullable=True, index=True)
 
     def __repr__(self):
         return f"Team member {self.name} tg={self.telegram}"
 
+    @validates("telegram", "trello", "focalboard")
+    def _normalize_identity(self, key, value):
+        setattr(self, f"{key}_norm", normalize_identity(value))
+        return value
+
     @classmethod
     def from_dict(cls, data):
         member = cls()
@@ -151,6 +163,11 @@ class TeamMember(Base):
         return member
 
 
+def normalize_identity(username) -> Optional[str]:
+    """Value for *_norm columns: lowercase username without @, None if empty"""
+    return normalize_telegram_username(username) or None
+
+
 def _get_str_data_item(data: dict, item_name: str) -> str:
     """Preprocess string data item from sheets"""
     return data[item_name].strip() if data.get(item_name) else ""
@@ -177,7 +194,7 @@ class Reminder(Base):
     text = Column(String)  # full reminder text
     weekday = Column(Integer)  # e.g. monday is 0
     time = Column(String)  # e.g. "15:00"
-    next_reminder_datetime = Column(DateTime)  # Moscow timezone
+    next_reminder_datetime = Column(DateTime, index=True)  # Moscow timezone
     frequency_days = Column(Integer)
     is_active = Column(Boolean, default=True)
     send_poll = Column(
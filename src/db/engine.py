@@ -0,0 +1,65 @@
+import logging
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+# SQLite profile, can be overridden with the "sqlite" section of the db config
+JOURNAL_MODE = "wal"
+SYNCHRONOUS = "normal"
+MMAP_SIZE_BYTES = 64 * 1024 * 1024
+# negative value is in KiB, see https://www.sqlite.org/pragma.html#pragma_cache_size
+CACHE_SIZE = -16 * 1024
+BUSY_TIMEOUT_MS = 5000
+
+
+def create_db_engine(db_config: dict) -> Engine:
+    """
+    Creates an engine for db_config["uri"].
+    File-based SQLite databases get a pragma profile applied on every new
+    connection and a NullPool. DBClient sessions are thread-local and may
+    hold their connection for the thread lifetime, so a bounded pool would
+    run out with the scheduler and handler threads; with NullPool every
+    session opens its own connection, and WAL keeps readers from blocking
+    behind writers.
+    """
+    url = make_url(db_config["uri"])
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url, echo=False)
+    if url.database in (None, "", ":memory:"):
+        # every connection to :memory: is a separate database,
+        # keep the default per-thread pool
+        return create_engine(url, connect_args={"check_same_thread": False}, echo=False)
+
+    profile = db_config.get("sqlite", {})
+    engine = create_engine(
+        url,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": profile.get("busy_timeout_ms", BUSY_TIMEOUT_MS) / 1000,
+        },
+        poolclass=NullPool,
+        echo=False,
+    )
+    pragmas = {
+        "journal_mode": profile.get("journal_mode", JOURNAL_MODE),
+        "synchronous": profile.get("synchronous", SYNCHRONOUS),
+        "mmap_size": profile.get("mmap_size_bytes", MMAP_SIZE_BYTES),
+        "cache_size": profile.get("cache_size", CACHE_SIZE),
+        "busy_timeout": profile.get("busy_timeout_ms", BUSY_TIMEOUT_MS),
+    }
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    logger.info(f"SQLite engine for {url.database} created with {pragmas}")
+    return engine
@@ -0,0 +1,108 @@
+import threading
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
+
+from .db_objects import Curator, TeamMember, normalize_identity
+
+
+def _freeze(mapping: dict) -> Mapping:
+    return MappingProxyType(mapping)
+
+
+class IdentityResolver:
+    """
+    Immutable maps between Telegram, Trello and Focalboard/Planka identities
+    of team members and curators, built once per team/curators sheet sync.
+    Accepts entities or rows with the same attribute names.
+    All keys are normalized with normalize_identity.
+    """
+
+    def __init__(
+        self,
+        team_members: Iterable[TeamMember],
+        curators: Iterable[Curator],
+        generation: int = 0,
+    ):
+        self.generation = generation
+        telegram_by_trello = {}
+        telegram_by_focalboard = {}
+        telegram_id_by_focalboard = {}
+        focalboard_by_telegram = {}
+        member_id_by_telegram = {}
+        # first matching row wins, same as .first() on the team table
+        for member in team_members:
+            if member.trello_norm:
+                telegram_by_trello.setdefault(member.trello_norm, member.telegram)
+            if member.focalboard_norm:
+                telegram_by_focalboard.setdefault(
+                    member.focalboard_norm, member.telegram
+                )
+                telegram_id_by_focalboard.setdefault(
+                    member.focalboard_norm, member.telegram_id
+                )
+            if member.telegram_norm:
+                focalboard_by_telegram.setdefault(
+                    member.telegram_norm, member.focalboard
+                )
+                member_id_by_telegram.setdefault(member.telegram_norm, member.id)
+        self._telegram_by_trello = _freeze(telegram_by_trello)
+        self._telegram_by_focalboard = _freeze(telegram_by_focalboard)
+        self._telegram_id_by_focalboard = _freeze(telegram_id_by_focalboard)
+        self._focalboard_by_telegram = _freeze(focalboard_by_telegram)
+        self._member_id_by_telegram = _freeze(member_id_by_telegram)
+        self.curator_logins = frozenset(
+            normalize_identity(curator.telegram)
+            for curator in curators
+            if normalize_identity(curator.telegram)
+        )
+
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def telegram_by_trello(self, trello_id: str) -> Optional[str]:
+        """Telegram login of a member by Trello or Focalboard username"""
+        normalized = normalize_identity(trello_id)
+        telegram = self._telegram_by_trello.get(normalized)
+        if telegram is None:
+            telegram = self._telegram_by_focalboard.get(normalized)
+        return self._lookup_result(telegram)
+
+    def telegram_id_by_focalboard(self, focalboard_username: str) -> Optional[int]:
+        return self._lookup_result(
+            self._telegram_id_by_focalboard.get(normalize_identity(focalboard_username))
+        )
+
+    def focalboard_by_telegram(self, telegram_username: str) -> Optional[str]:
+        return self._lookup_result(
+            self._focalboard_by_telegram.get(normalize_identity(telegram_username))
+        )
+
+    def team_member_id_by_telegram(self, telegram_username: str) -> Optional[str]:
+        return self._lookup_result(
+            self._member_id_by_telegram.get(normalize_identity(telegram_username))
+        )
+
+    def is_curator(self, telegram_username: str) -> bool:
+        found = normalize_identity(telegram_username) in self.curator_logins
+        self._record(found)
+        return found
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "generation": self.generation,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def _lookup_result(self, value):
+        self._record(value is not None)
+        return value
+
+    def _record(self, found: bool):
+        with self._stats_lock:
+            if found:
+                self._hits += 1
+            else:
+                self._misses += 1
@@ -0,0 +1,100 @@
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from sqlalchemy import Table, and_, bindparam, select
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+class SyncResult(NamedTuple):
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    def __str__(self):
+        return (
+            f"{self.inserted} inserted, {self.updated} updated, "
+            f"{self.deleted} deleted, {self.unchanged} unchanged"
+        )
+
+
+def sync_table(
+    connection: Connection, table: Table, rows: Iterable[dict]
+) -> SyncResult:
+    """
+    Makes table contents equal to rows, keyed by the table primary key.
+    Only the columns present in the rows are compared and written, so
+    derived columns (e.g. TeamMember.*_norm, normally set by ORM validators)
+    must be filled in by the caller.
+    Values are compared as strings, since sheet cells may hold numbers for
+    String columns (5 and "5" are the same value).
+    Runs inside the transaction of the given connection; for duplicate keys
+    the first row wins.
+    """
+    key_columns = [column.name for column in table.primary_key.columns]
+    new_rows: Dict[Tuple, dict] = {}
+    for row in rows:
+        key = tuple(_comparable(row[name]) for name in key_columns)
+        if key in new_rows:
+            logger.warning(f"Skipping duplicate {table.name} row with key {key}")
+            continue
+        new_rows[key] = row
+    if not new_rows:
+        deleted = connection.execute(table.delete()).rowcount
+        return SyncResult(deleted=max(deleted, 0))
+    column_names = list(next(iter(new_rows.values())))
+    value_columns = [name for name in column_names if name not in key_columns]
+
+    existing_rows = {
+        tuple(_comparable(row[name]) for name in key_columns): row
+        for row in connection.execute(select([table.c[name] for name in column_names]))
+    }
+
+    inserts: List[dict] = []
+    updates: List[dict] = []
+    unchanged = 0
+    for key, row in new_rows.items():
+        existing = existing_rows.get(key)
+        if existing is None:
+            inserts.append(row)
+        elif any(
+            _comparable(existing[name]) != _comparable(row[name])
+            for name in value_columns
+        ):
+            params = {name: row[name] for name in value_columns}
+            params.update(_key_params(existing, key_columns))
+            updates.append(params)
+        else:
+            unchanged += 1
+    deletes = [
+        _key_params(existing, key_columns)
+        for key, existing in existing_rows.items()
+        if key not in new_rows
+    ]
+
+    key_clause = and_(
+        *(table.c[name] == bindparam(f"_key_{name}") for name in key_columns)
+    )
+    if deletes:
+        connection.execute(table.delete().where(key_clause), deletes)
+    if updates:
+        # SET clause is derived from the value columns in the parameters
+        connection.execute(table.update().where(key_clause), updates)
+    if inserts:
+        connection.execute(table.insert(), inserts)
+    return SyncResult(
+        inserted=len(inserts),
+        updated=len(updates),
+        deleted=len(deletes),
+        unchanged=unchanged,
+    )
+
+
+def _comparable(value):
+    return None if value is None else str(value)
+
+
+def _key_params(existing_row, key_columns: List[str]) -> dict:
+    return {f"_key_{name}": existing_row[name] for name in key_columns}
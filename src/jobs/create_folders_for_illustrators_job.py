@@ -66,6 +66,9 @@ class CreateFoldersForIllustratorsJob(BaseJob):
         logger.info("Started creating illustrator folders")
         list_ids = app_context.planka_client.get_list_id_from_aliases(list_aliases)
         cards = app_context.planka_client.get_cards(list_ids)
+        custom_fields = app_context.planka_client.get_custom_fields_bulk(
+            card.id for card in cards if card
+        )
 
         parse_failure_counter = 0
         result = []
@@ -74,7 +77,7 @@ class CreateFoldersForIllustratorsJob(BaseJob):
                 parse_failure_counter += 1
                 continue
 
-            card_fields = app_context.planka_client.get_custom_fields(card.id)
+            card_fields = custom_fields[card.id]
             label_names = [
                 label.name
                 for label in card.labels
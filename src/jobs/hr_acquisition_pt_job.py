@@ -1,13 +1,11 @@
 import logging
 from typing import Callable, List
 
-from sheetfu import Table
-
 from ..app_context import AppContext
-from ..sheets.sheets_objects import HRPersonPTProcessed, HRPersonPTRaw
+from ..sheets.hr_forms_pipeline import HRFormsPipeline
+from ..sheets.sheets_objects import HRPersonPTProcessed, HRPersonPTRaw, SheetsTable
 from ..strings import load
 from ..tg.sender import pretty_send
-from ..utils.telegram import normalize_telegram_username
 from .base_job import BaseJob
 
 logger = logging.getLogger(__name__)
@@ -35,8 +33,12 @@ class HRAcquisitionPTJob(BaseJob):
     def _process_new_people(
         app_context: AppContext,
     ) -> List[HRPersonPTProcessed]:
-        forms_raw = app_context.sheets_client.fetch_hr_pt_forms_raw()
-        forms_processed = app_context.sheets_client.fetch_hr_pt_forms_processed()
+        forms_raw = SheetsTable(
+            app_context.sheets_client.fetch_hr_pt_forms_raw(), HRPersonPTRaw
+        )
+        forms_processed = SheetsTable(
+            app_context.sheets_client.fetch_hr_pt_forms_processed(), HRPersonPTProcessed
+        )
 
         new_items = HRAcquisitionPTJob._process_raw_forms(forms_raw, forms_processed)
 
@@ -50,37 +52,21 @@ class HRAcquisitionPTJob(BaseJob):
 
     @staticmethod
     def _process_raw_forms(
-        forms_raw: Table, forms_processed: Table
+        forms_raw: SheetsTable, forms_processed: SheetsTable
     ) -> List[HRPersonPTProcessed]:
-        people = [HRPersonPTRaw(item) for item in forms_raw]
-        existing_people = [person for person in people if person.status]
-        new_people = [person for person in people if not person.status]
-        existing_telegrams = {
-            normalize_telegram_username(p.telegram)
-            for p in existing_people
-            if p.telegram
-        }
-        new_items = []
-
-        for person in new_people:
-            # filter out incomplete responses
-            if not person.telegram:
-                person.status = load("sheets__hr__pt__raw__status_rejection")
-                continue
-            normalized = normalize_telegram_username(person.telegram)
-            new_telegrams = {
-                normalize_telegram_username(p.telegram) for p in new_items if p.telegram
-            }
-            if normalized in existing_telegrams or normalized in new_telegrams:
-                person.status = load("sheets__hr__pt__raw__status_double")
-                continue
-
-            # move good ones to another sheet
-            person.status = load("sheets__hr__pt__raw__status_processed")
-            # TODO: PR to sheetfu which will allow better API here
-            person_dict = {
-                "id": len(forms_processed)
-                + 2,  # 1 for starting with 1 and 1 for the header
+        pipeline = HRFormsPipeline(
+            contact_fields=("telegram",),
+            required_fields=("telegram",),
+            rejected_status=load("sheets__hr__pt__raw__status_rejection"),
+            double_status=load("sheets__hr__pt__raw__status_double"),
+            processed_status=load("sheets__hr__pt__raw__status_processed"),
+        )
+        return pipeline.run(
+            forms_raw,
+            forms_processed,
+            lambda person: {
+                # 1 for starting with 1 and 1 for the header
+                "id": len(forms_processed) + 2,
                 "name": person.name,
                 "interests": person.interests,
                 "about": person.about,
@@ -88,12 +74,8 @@ class HRAcquisitionPTJob(BaseJob):
                 "referral": person.referral,
                 "telegram": person.telegram,
                 "status": "TODO",  # this is a legitimate value, not an actual TODO
-            }
-            new_items.append(
-                HRPersonPTProcessed.add_one_to_table(forms_processed, person_dict)
-            )
-
-        return new_items
+            },
+        )
 
     @staticmethod
     def _get_new_person_paragraph(item: HRPersonPTProcessed) -> str:
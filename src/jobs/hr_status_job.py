@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Callable, List
 
 from ..app_context import AppContext
-from ..sheets.sheets_objects import HRPersonProcessed
+from ..sheets.sheets_objects import HRPersonProcessed, SheetsTable
 from ..strings import load
 from ..tg.sender import pretty_send
 from .base_job import BaseJob
@@ -78,7 +78,9 @@ class HRStatusJob(BaseJob):
 
     @staticmethod
     def _get_people(app_context: AppContext) -> List[HRPersonProcessed]:
-        return [
-            HRPersonProcessed(item)
-            for item in app_context.sheets_client.fetch_hr_forms_processed()
-        ]
+        return list(
+            SheetsTable(
+                app_context.sheets_client.fetch_hr_forms_processed(read_only=True),
+                HRPersonProcessed,
+            )
+        )
@@ -82,6 +82,9 @@ class PublicationPlansJob(BaseJob):
         if show_due:
             cards.sort(key=lambda card: card.due or datetime.datetime.min)
         parse_failure_counter = 0
+        custom_fields = planka_client.get_custom_fields_bulk(
+            card.id for card in cards if card
+        )
 
         paragraphs = [
             load("common_report__list_title_and_size", title=title, length=len(cards))
@@ -92,7 +95,7 @@ class PublicationPlansJob(BaseJob):
                 parse_failure_counter += 1
                 continue
 
-            card_fields = planka_client.get_custom_fields(card.id)
+            card_fields = custom_fields[card.id]
             display_name = card_fields.title or card.name
             label_names = [
                 label.name
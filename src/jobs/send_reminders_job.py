@@ -16,30 +16,53 @@ class SendRemindersJob(BaseJob):
     ):
         sender = TelegramSender()
         reminders = app_context.db_client.get_reminders_to_send()
+        poll_options = {
+            "question": load("manage_reminders_handler__poll_name"),
+            "options": [
+                load("manage_reminders_handler__poll_option_yes_btn"),
+                load("manage_reminders_handler__poll_option_no_btn"),
+            ],
+            "is_anonymous": False,
+        }
+        # message and then poll of every reminder, in order within each chat
+        messages_by_chat = {}
+        # (reminder, indexes of its messages in the chat messages)
+        sent_reminders = []
         for reminder in reminders:
-            try:
-                if reminder.is_active:
-                    sender.send_to_chat_id(reminder.text, reminder.group_chat_id)
-                    if reminder.send_poll:
-                        poll_options = {
-                            "question": load("manage_reminders_handler__poll_name"),
-                            "options": [
-                                load("manage_reminders_handler__poll_option_yes_btn"),
-                                load("manage_reminders_handler__poll_option_no_btn"),
-                            ],
-                            "is_anonymous": False,
-                        }
-                        sender.send_to_chat_id(
-                            "", reminder.group_chat_id, poll_options=poll_options
-                        )
-                else:
-                    logger.info(f"Reminder {reminder.name} not sent (deactivated)")
-            except Exception as e:
+            if not reminder.is_active:
+                logger.info(f"Reminder {reminder.name} not sent (deactivated)")
+                continue
+            chat_messages = messages_by_chat.setdefault(reminder.group_chat_id, [])
+            first_message = len(chat_messages)
+            chat_messages.append((reminder.text, {}))
+            if reminder.send_poll:
+                chat_messages.append(("", {"poll_options": poll_options}))
+            sent_reminders.append((reminder, range(first_message, len(chat_messages))))
+
+        results = sender.send_to_chats_concurrently(messages_by_chat)
+        latencies = []
+        for reminder, message_indexes in sent_reminders:
+            chat_results = results.get(reminder.group_chat_id, [])
+            reminder_results = [
+                chat_results[i] if i < len(chat_results) else (False, 0.0)
+                for i in message_indexes
+            ]
+            seconds = reminder_results[-1][1]
+            if all(sent for sent, _ in reminder_results):
+                latencies.append(f"{reminder.name}: {seconds:.2f}s")
+            else:
                 logger.error(
-                    f"Failed to send reminder {reminder.id} {reminder.name} to chat {reminder.group_chat_id}: {e}"
+                    f"Failed to send reminder {reminder.id} {reminder.name} "
+                    f"to chat {reminder.group_chat_id}"
                 )
-                continue
-        send(load("send_reminders_job__success", length=len(reminders)))
+                latencies.append(f"{reminder.name}: failed after {seconds:.2f}s")
+        if latencies:
+            logger.info(f"Reminders sent: {', '.join(latencies)}")
+        send(
+            "\n".join(
+                [load("send_reminders_job__success", length=len(reminders))] + latencies
+            )
+        )
 
     @staticmethod
     def _usage_muted():
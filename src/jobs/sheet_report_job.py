@@ -1,6 +1,5 @@
 import logging
 import re
-import time
 from datetime import datetime
 from typing import Callable
 
@@ -59,12 +58,15 @@ class SheetReportJob(BaseJob):
         except SheetNameNoMatchError:
             raise KeyError(f"sheet_report_job can't find sheet '{sheet_name}'")
         message_template_substituted = message_template
-        # looking for all placeholders in format [[A1]] and substituting them
-        for element in re.findall(r"(\[\[[a-zA-Z]+[0-9]+\]\])", message_template):
-            cell_range = sheet.get_range_from_a1(element[2:-2])
-            value = str(cell_range.get_values()[0][0])
+        # looking for all placeholders in format [[A1]] and substituting them,
+        # all cells are read with a single request
+        placeholders = re.findall(r"(\[\[[a-zA-Z]+[0-9]+\]\])", message_template)
+        values = app_context.sheets_client.get_cell_values(
+            sheet, [element[2:-2] for element in placeholders]
+        )
+        logger.info(f"Sheet report {kwargs.get('name')}: {len(values)} cells read")
+        for element in placeholders:
             message_template_substituted = message_template_substituted.replace(
-                element, value
+                element, str(values.get(element[2:-2], ""))
             )
-            time.sleep(2)
         pretty_send([message_template_substituted], send)
@@ -0,0 +1,161 @@
+import copy
+import time
+from typing import Dict, List, Optional, Tuple
+
+# included collections holding per-card records, replaced on card updates
+CARD_COLLECTIONS = ("cardMemberships", "cardLabels", "customFieldValues")
+
+
+class BoardSnapshot:
+    """
+    Indexed view over a single Planka boards/{id} payload.
+    Built once per fetch, so that PlankaClient getters don't have
+    to re-walk the raw json on every call. Treat it as read-only.
+    """
+
+    def __init__(self, board_id: str, data: dict, fetched_at: float = None):
+        self.board_id = board_id
+        self.data = data
+        # unix timestamp of the API response the snapshot was built from
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        # when the whole board was last downloaded, kept by incremental updates
+        self.full_sync_at = self.fetched_at
+        # id of the newest board action seen at sync time ("" for no actions),
+        # None if board actions were not requested
+        self.latest_action_id: Optional[str] = None
+        included = data.get("included", {})
+
+        self.users_by_id: Dict[str, dict] = {
+            user["id"]: user for user in included.get("users", []) if "id" in user
+        }
+        self.labels_by_id: Dict[str, dict] = {
+            label["id"]: label for label in included.get("labels", []) if "id" in label
+        }
+        self.member_user_ids: List[str] = [
+            membership.get("userId")
+            for membership in included.get("boardMemberships", [])
+            if membership.get("boardId") == board_id
+        ]
+
+        self.active_lists: List[dict] = [
+            item for item in included.get("lists", []) if item.get("type") == "active"
+        ]
+        self.sorted_lists: List[dict] = sorted(
+            self.active_lists, key=lambda item: item.get("position") or 0
+        )
+        self.lists_by_id: Dict[str, dict] = {
+            item["id"]: item for item in self.active_lists if "id" in item
+        }
+
+        # (position in payload, card) pairs to keep the payload order across lists
+        self.cards_by_list: Dict[str, List[Tuple[int, dict]]] = {}
+        for index, card in enumerate(included.get("cards", [])):
+            list_id = card.get("listId")
+            if list_id not in self.lists_by_id or card.get("isClosed"):
+                continue
+            self.cards_by_list.setdefault(list_id, []).append((index, card))
+
+        self.card_label_ids = self._group_by_card_id(
+            included.get("cardLabels", []), "labelId"
+        )
+        self.card_member_ids = self._group_by_card_id(
+            included.get("cardMemberships", []), "userId"
+        )
+
+        # lookups by name resolve to the last field, updates go to the first one
+        self.custom_field_ids_by_name: Dict[str, str] = {}
+        self.custom_fields_by_name: Dict[str, dict] = {}
+        for custom_field in included.get("customFields", []):
+            if "name" in custom_field and "id" in custom_field:
+                self.custom_field_ids_by_name[custom_field["name"]] = custom_field["id"]
+            if "name" in custom_field:
+                self.custom_fields_by_name.setdefault(
+                    custom_field["name"], custom_field
+                )
+        self.custom_field_values: Dict[Tuple[str, str], Optional[str]] = {}
+        self.group_id_by_custom_field: Dict[str, str] = {}
+        for item in included.get("customFieldValues", []):
+            if "customFieldId" not in item:
+                continue
+            self.custom_field_values[(item.get("cardId"), item["customFieldId"])] = (
+                item.get("content")
+            )
+            if item.get("customFieldGroupId"):
+                self.group_id_by_custom_field.setdefault(
+                    item["customFieldId"], item["customFieldGroupId"]
+                )
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def renewed(self) -> "BoardSnapshot":
+        """Same board contents, confirmed to be up to date right now"""
+        snapshot = copy.copy(self)
+        snapshot.fetched_at = time.time()
+        return snapshot
+
+    def with_card_changes(self, cards: Dict[str, Optional[dict]]) -> "BoardSnapshot":
+        """
+        New snapshot with given cards replaced by cards/{id} payloads,
+        or removed from the board if mapped to None.
+        """
+        included = dict(self.data.get("included", {}))
+        # updated cards keep their place in the payload, new ones go last
+        updated_cards = {
+            card_id: card_data["item"]
+            for card_id, card_data in cards.items()
+            if card_data is not None
+        }
+        board_cards = []
+        for card in included.get("cards", []):
+            if card.get("id") not in cards:
+                board_cards.append(card)
+            elif card["id"] in updated_cards:
+                board_cards.append(updated_cards.pop(card["id"]))
+        board_cards.extend(updated_cards.values())
+        included["cards"] = board_cards
+        for collection in CARD_COLLECTIONS:
+            included[collection] = [
+                item
+                for item in included.get(collection, [])
+                if item.get("cardId") not in cards
+            ]
+        for card_data in cards.values():
+            if card_data is None:
+                continue
+            for collection in CARD_COLLECTIONS:
+                included[collection].extend(
+                    card_data.get("included", {}).get(collection, [])
+                )
+        snapshot = BoardSnapshot(self.board_id, dict(self.data, included=included))
+        snapshot.full_sync_at = self.full_sync_at
+        return snapshot
+
+    def get_cards(self, list_ids=None) -> List[dict]:
+        """Raw non-closed cards on active lists, optionally limited to list_ids"""
+        if list_ids is None:
+            list_ids = self.cards_by_list.keys()
+        indexed_cards = [
+            indexed_card
+            for list_id in list_ids
+            for indexed_card in self.cards_by_list.get(list_id, [])
+        ]
+        if len(list_ids) > 1:
+            indexed_cards.sort(key=lambda indexed_card: indexed_card[0])
+        return [card for _, card in indexed_cards]
+
+    def get_custom_field_value(
+        self, card_id: str, custom_field_name: str
+    ) -> Optional[str]:
+        custom_field_id = self.custom_field_ids_by_name.get(custom_field_name)
+        return self.custom_field_values.get((card_id, custom_field_id))
+
+    @staticmethod
+    def _group_by_card_id(items, value_key) -> Dict[str, List[str]]:
+        grouped = {}
+        for item in items:
+            card_id = item.get("cardId")
+            value = item.get(value_key)
+            if card_id and value:
+                grouped.setdefault(card_id, []).append(value)
+        return grouped
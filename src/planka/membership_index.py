@@ -0,0 +1,50 @@
+import time
+from typing import Dict, FrozenSet, List
+
+from .board_objects import TrelloBoard
+from .board_snapshot import BoardSnapshot
+
+
+def normalize_planka_username(username: str) -> str:
+    return username.strip().lstrip("@").lower()
+
+
+class BoardMembershipIndex:
+    """
+    Immutable mapping from normalized Planka username to the boards
+    the user is a member of. Rebuilt as a whole and swapped on refresh.
+    """
+
+    def __init__(
+        self,
+        boards: List[TrelloBoard],
+        snapshots: Dict[str, BoardSnapshot],
+    ):
+        self.built_at = time.monotonic()
+        # keep boards in projects order, so lookups return them in that order
+        self.boards = [board for board in boards if snapshots.get(board.id)]
+        board_ids_by_username = {}
+        for board in self.boards:
+            snapshot = snapshots[board.id]
+            for user_id in snapshot.member_user_ids:
+                user = snapshot.users_by_id.get(user_id)
+                if not user or not user.get("username"):
+                    continue
+                username = normalize_planka_username(user["username"])
+                board_ids_by_username.setdefault(username, set()).add(board.id)
+        self._board_ids_by_username: Dict[str, FrozenSet[str]] = {
+            username: frozenset(board_ids)
+            for username, board_ids in board_ids_by_username.items()
+        }
+
+    def get_boards(self, username: str) -> List[TrelloBoard]:
+        board_ids = self._board_ids_by_username.get(
+            normalize_planka_username(username), frozenset()
+        )
+        return [board for board in self.boards if board.id in board_ids]
+
+    def age(self) -> float:
+        return time.monotonic() - self.built_at
+
+    def __len__(self):
+        return len(self._board_ids_by_username)
@@ -1,22 +1,94 @@
-import builtins
 import html
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Iterable, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 from urllib.parse import urljoin
 
 import requests
 from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..consts import TrelloCardColor, TrelloCustomFieldTypeAlias
 from ..db import db_client
 from ..strings import load
 from . import board_objects as objects
 from .board_objects import TIME_FORMAT
+from .board_snapshot import BoardSnapshot
+from .membership_index import BoardMembershipIndex, normalize_planka_username
+from .snapshot_store import SnapshotStore
+from ..utils.single_flight import SingleFlight
 from ..utils.singleton import Singleton
 
 logger = logging.getLogger(__name__)
 
+# Defaults for the optional planka config keys with the same lowercase names.
+POOL_SIZE = 16
+CONNECT_TIMEOUT_SEC = 5
+READ_TIMEOUT_SEC = 30
+MAX_RETRIES = 3
+RETRY_BACKOFF_SEC = 0.5
+BOARD_FETCH_WORKERS = 8
+# Board snapshots older than the soft TTL are served while being refreshed
+# in the background, the ones older than the hard TTL are never served.
+# Equal TTLs mean plain expiration without stale-while-revalidate.
+BOARD_CACHE_SOFT_TTL_SEC = 30
+BOARD_CACHE_HARD_TTL_SEC = 30
+# Payloads persisted to planka snapshot_dir (if configured) are served
+# after a restart until refreshed, unless they are older than this.
+SNAPSHOT_MAX_AGE_SEC = 60 * 60
+PROJECTS_SNAPSHOT_KEY = "projects"
+# With incremental_sync enabled, boards are refreshed by re-fetching only
+# the cards mentioned in new board actions. Some changes (e.g. card renames,
+# custom field edits or list renames) produce no actions, so the whole board
+# is still re-downloaded at least every FULL_SYNC_INTERVAL_SEC.
+FULL_SYNC_INTERVAL_SEC = 10 * 60
+CARD_ACTION_TYPES = frozenset(
+    {
+        "createCard",
+        "moveCard",
+        "addMemberToCard",
+        "removeMemberFromCard",
+        "completeTask",
+        "uncompleteTask",
+    }
+)
+MEMBERSHIP_INDEX_REFRESH_SEC = 60
+
+
+class EndpointStats:
+    """Thread-safe request counters and latencies, grouped by endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, endpoint: str, seconds: float, failed: bool = False):
+        with self._lock:
+            stats = self._stats.setdefault(
+                endpoint,
+                {"count": 0, "errors": 0, "total_sec": 0.0, "max_sec": 0.0},
+            )
+            stats["count"] += 1
+            stats["errors"] += int(failed)
+            stats["total_sec"] += seconds
+            stats["max_sec"] = max(stats["max_sec"], seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                endpoint: dict(stats, avg_sec=stats["total_sec"] / stats["count"])
+                for endpoint, stats in self._stats.items()
+            }
+
+    @staticmethod
+    def endpoint_name(uri: str) -> str:
+        """boards/123 and boards/456 are accounted as the same boards endpoint"""
+        return uri.strip("/").split("/")[0]
+
 
 class PlankaClient(Singleton):
     def __init__(self, planka_config=None):
@@ -24,11 +96,34 @@ class PlankaClient(Singleton):
             return
 
         self._planka_config = planka_config or {}
+        self._session = None
+        self._board_fetch_executor = None
+        self._board_fetches = SingleFlight()
+        # cachetools caches are not thread-safe, guard every access
+        self._board_cache_lock = threading.Lock()
+        # bumped on invalidation, so that fetches started before a write
+        # don't put outdated payloads back into the cache
+        self._board_generations = {}
+        self._refreshes_pending = set()
+        # latest snapshot per board to apply incremental updates to
+        self._synced_boards = {}
+        self.board_sync_stats = {"full": 0, "incremental": 0, "fallbacks": 0}
+        # payloads read from disk, used until the first successful fetch
+        self._restored = {}
+        self._restored_lock = threading.Lock()
+        self._membership_index_lock = threading.Lock()
+        self._membership_index_refreshing = False
+        self._membership_index_stats = {
+            "refresh_count": 0,
+            "refresh_failures": 0,
+            "last_refresh_sec": None,
+        }
+        self.request_stats = EndpointStats()
         self._update_from_config()
         logger.info("PlankaClient successfully initialized")
 
     def get_boards_for_user(self) -> List[objects.TrelloBoard]:
-        _, data = self._make_request("projects")
+        data = self._get_projects_data()
         boards_data = data.get("included", {}).get("boards", [])
         boards = [self._board_from_planka_dict(board) for board in boards_data]
         logger.debug(f"get_boards_for_user: {boards}")
@@ -49,21 +144,10 @@ class PlankaClient(Singleton):
             )
             return []
 
-        planka_username = raw_planka.strip().lstrip("@").lower()
+        planka_username = normalize_planka_username(raw_planka)
         logger.debug(f"Normalized Planka username from DB = {planka_username!r}")
 
-        accessible = []
-        for board in self.get_boards_for_user():
-            try:
-                member_usernames = [
-                    member.username.strip().lstrip("@").lower()
-                    for member in self.get_members(board.id)
-                    if member.username
-                ]
-                if planka_username in member_usernames:
-                    accessible.append(board)
-            except Exception as e:
-                logger.error(f"Error fetching members for board {board.id}", exc_info=e)
+        accessible = self._get_membership_index().get_boards(planka_username)
 
         logger.info(
             f"Telegram user @{telegram_username} has access to {len(accessible)} boards: "
@@ -71,91 +155,127 @@ class PlankaClient(Singleton):
         )
         return accessible
 
+    def refresh_membership_index(self) -> BoardMembershipIndex:
+        """Rebuilds username -> boards index from projects and board payloads"""
+        start = time.monotonic()
+        try:
+            boards = self.get_boards_for_user()
+            snapshots = self._get_board_snapshots([board.id for board in boards])
+            index = BoardMembershipIndex(boards, snapshots)
+        except Exception:
+            with self._membership_index_lock:
+                self._membership_index_stats["refresh_failures"] += 1
+            raise
+        with self._membership_index_lock:
+            self._membership_index = index
+            self._membership_index_stats["refresh_count"] += 1
+            self._membership_index_stats["last_refresh_sec"] = time.monotonic() - start
+        logger.info(
+            f"Planka membership index refreshed: {len(index)} users, "
+            f"{len(index.boards)} boards"
+        )
+        return index
+
+    def get_membership_index_stats(self) -> dict:
+        with self._membership_index_lock:
+            index = self._membership_index
+            stats = dict(self._membership_index_stats)
+        stats["age_sec"] = index.age() if index else None
+        stats["users"] = len(index) if index else 0
+        stats["boards"] = len(index.boards) if index else 0
+        return stats
+
+    def _get_membership_index(self) -> BoardMembershipIndex:
+        """
+        Returns current membership index, building it on first use.
+        Once it gets older than membership_index_refresh_sec, the stale
+        index is still served while a refresh runs in the background.
+        """
+        index = self._membership_index
+        if index is None:
+            return self.refresh_membership_index()
+        refresh_sec = self._planka_config.get(
+            "membership_index_refresh_sec", MEMBERSHIP_INDEX_REFRESH_SEC
+        )
+        if index.age() > refresh_sec:
+            with self._membership_index_lock:
+                start_refresh = not self._membership_index_refreshing
+                self._membership_index_refreshing = True
+            if start_refresh:
+                threading.Thread(
+                    target=self._refresh_membership_index_in_background,
+                    name="planka-membership-index",
+                    daemon=True,
+                ).start()
+        return index
+
+    def _refresh_membership_index_in_background(self):
+        try:
+            self.refresh_membership_index()
+        except Exception as e:
+            logger.error("Failed to refresh Planka membership index", exc_info=e)
+        finally:
+            with self._membership_index_lock:
+                self._membership_index_refreshing = False
+
     def get_lists(self, board_id=None, sorted=False):
         board_id = board_id or self.board_id
-        data = self._get_board_data(board_id)
-        lists_data = data.get("included", {}).get("lists", [])
-        lists = [
-            self._list_from_planka_dict(item)
-            for item in lists_data
-            if item.get("type") == "active"
-        ]
-        if sorted:
-            lists = builtins.sorted(
-                lists,
-                key=lambda item: self._list_position(lists_data, item.id),
-            )
+        snapshot = self._get_board_snapshot(board_id)
+        lists_data = snapshot.sorted_lists if sorted else snapshot.active_lists
+        lists = [self._list_from_planka_dict(item) for item in lists_data]
         logger.debug(f"get_lists: {lists}")
         return lists
 
     def get_list(self, board_id, list_id):
-        lists = self.get_lists(board_id)
-        suitable_lists = [lst for lst in lists if lst.id == list_id]
-        if not suitable_lists:
+        snapshot = self._get_board_snapshot(board_id)
+        if list_id not in snapshot.lists_by_id:
             raise ValueError(f"List {list_id} not found on board {board_id}")
-        lst = suitable_lists[0]
+        lst = self._list_from_planka_dict(snapshot.lists_by_id[list_id])
         logger.debug(f"get_list: {lst}")
         return lst
 
     def get_members(self, board_id) -> List[objects.TrelloMember]:
-        data = self._get_board_data(board_id)
-        included = data.get("included", {})
-        users_by_id = {
-            user["id"]: user for user in included.get("users", []) if "id" in user
-        }
-        members = []
-        for membership in included.get("boardMemberships", []):
-            if membership.get("boardId") != board_id:
-                continue
-
-            user = users_by_id.get(membership.get("userId"))
-            if user:
-                members.append(self._member_from_planka_dict(user))
+        members = self._members_from_snapshot(self._get_board_snapshot(board_id))
         logger.debug(f"get_members: {members}")
         return members
 
     def get_cards(self, list_ids=None, board_id=None):
         board_id = board_id or self.board_id
         list_id_filter = self._normalize_list_ids(list_ids)
-        data = self._get_board_data(board_id)
-        included = data.get("included", {})
-
-        lists_by_id = {lst.id: lst for lst in self.get_lists(board_id)}
-        labels_by_id = {
-            label["id"]: self._label_from_planka_dict(label)
-            for label in included.get("labels", [])
-            if "id" in label
-        }
-        users_by_id = {
-            user["id"]: self._member_from_planka_dict(user)
-            for user in included.get("users", [])
-            if "id" in user
-        }
-        card_memberships = self._group_by_card_id(
-            included.get("cardMemberships", []), "userId"
-        )
-        card_labels = self._group_by_card_id(included.get("cardLabels", []), "labelId")
+        snapshot = self._get_board_snapshot(board_id)
 
+        cards_data = snapshot.get_cards(list_id_filter)
+        lists_by_id = {}
+        labels_by_id = {}
+        users_by_id = {}
         cards = []
-        for card_data in included.get("cards", []):
-            list_id = card_data.get("listId")
-            if list_id_filter is not None and list_id not in list_id_filter:
-                continue
-            if list_id not in lists_by_id or card_data.get("isClosed"):
-                continue
+        for card_data in cards_data:
+            list_id = card_data["listId"]
+            if list_id not in lists_by_id:
+                lists_by_id[list_id] = self._list_from_planka_dict(
+                    snapshot.lists_by_id[list_id]
+                )
 
             card = self._card_from_planka_dict(card_data)
             card.lst = lists_by_id[list_id]
-            card.labels = [
-                labels_by_id[label_id]
-                for label_id in card_labels.get(card.id, [])
-                if label_id in labels_by_id
-            ]
-            card.members = [
-                users_by_id[user_id]
-                for user_id in card_memberships.get(card.id, [])
-                if user_id in users_by_id
-            ]
+            card.labels = []
+            for label_id in snapshot.card_label_ids.get(card.id, []):
+                if label_id not in snapshot.labels_by_id:
+                    continue
+                if label_id not in labels_by_id:
+                    labels_by_id[label_id] = self._label_from_planka_dict(
+                        snapshot.labels_by_id[label_id]
+                    )
+                card.labels.append(labels_by_id[label_id])
+            card.members = []
+            for user_id in snapshot.card_member_ids.get(card.id, []):
+                if user_id not in snapshot.users_by_id:
+                    continue
+                if user_id not in users_by_id:
+                    users_by_id[user_id] = self._member_from_planka_dict(
+                        snapshot.users_by_id[user_id]
+                    )
+                card.members.append(users_by_id[user_id])
             cards.append(card)
 
         logger.debug(f"get_cards: {cards}")
@@ -163,11 +283,10 @@ class PlankaClient(Singleton):
 
     def get_labels(self, board_id=None) -> List[objects.TrelloCardLabel]:
         board_id = board_id or self.board_id
-        data = self._get_board_data(board_id)
+        snapshot = self._get_board_snapshot(board_id)
         labels = [
             self._label_from_planka_dict(label)
-            for label in data.get("included", {}).get("labels", [])
-            if "id" in label
+            for label in snapshot.labels_by_id.values()
         ]
         logger.debug(f"get_labels: {labels}")
         return labels
@@ -187,58 +306,27 @@ class PlankaClient(Singleton):
         return result
 
     def get_custom_fields(self, card_id: str) -> objects.CardCustomFields:
-        data = self._get_board_data(self.board_id)
-        included = data.get("included", {})
-
-        name_to_id = {
-            cf["name"]: cf["id"]
-            for cf in included.get("customFields", [])
-            if "name" in cf and "id" in cf
-        }
-        card_items = {
-            item["customFieldId"]: item.get("content")
-            for item in included.get("customFieldValues", [])
-            if item.get("cardId") == card_id and "customFieldId" in item
-        }
-
-        def _get(alias):
-            return card_items.get(name_to_id.get(load(alias.value)))
-
-        card_fields = objects.CardCustomFields(card_id)
-        card_fields.title = _get(TrelloCustomFieldTypeAlias.TITLE)
-
-        author_val = _get(TrelloCustomFieldTypeAlias.AUTHOR)
-        card_fields.authors = (
-            [a.strip() for a in author_val.split(",")] if author_val else []
+        snapshot = self._get_board_snapshot(self.board_id)
+        return self._custom_fields_from_snapshot(
+            snapshot, card_id, self._custom_field_names()
         )
 
-        editor_val = _get(TrelloCustomFieldTypeAlias.EDITOR)
-        card_fields.editors = (
-            [e.strip() for e in editor_val.split(",")] if editor_val else []
-        )
-
-        illustrator_val = _get(TrelloCustomFieldTypeAlias.ILLUSTRATOR)
-        card_fields.illustrators = (
-            [i.strip() for i in illustrator_val.split(",")] if illustrator_val else []
-        )
-
-        card_fields.cover = _get(TrelloCustomFieldTypeAlias.COVER)
-        card_fields.google_doc = _get(TrelloCustomFieldTypeAlias.GOOGLE_DOC)
-        return card_fields
+    def get_custom_fields_bulk(
+        self, card_ids: Iterable[str]
+    ) -> Dict[str, objects.CardCustomFields]:
+        """Same as get_custom_fields, but for many cards in a single pass"""
+        snapshot = self._get_board_snapshot(self.board_id)
+        field_names = self._custom_field_names()
+        return {
+            card_id: self._custom_fields_from_snapshot(snapshot, card_id, field_names)
+            for card_id in card_ids
+        }
 
     def set_card_custom_field(self, card, field_alias, value: str):
-        data = self._get_board_data(self.board_id)
-        included = data.get("included", {})
+        snapshot = self._get_board_snapshot(self.board_id)
 
         field_name = load(field_alias.value)
-        custom_field = next(
-            (
-                cf
-                for cf in included.get("customFields", [])
-                if cf.get("name") == field_name
-            ),
-            None,
-        )
+        custom_field = snapshot.custom_fields_by_name.get(field_name)
         if not custom_field:
             logger.error(
                 f"Custom field '{field_name}' not found on board {self.board_id}"
@@ -248,19 +336,10 @@ class PlankaClient(Singleton):
         custom_field_id = custom_field["id"]
 
         # customFieldGroupId comes from the field definition; fall back to
-        # scanning existing values for any card that already has this field.
-        group_id = custom_field.get("customFieldGroupId")
-        if not group_id:
-            existing = next(
-                (
-                    item
-                    for item in included.get("customFieldValues", [])
-                    if item.get("customFieldId") == custom_field_id
-                ),
-                None,
-            )
-            if existing:
-                group_id = existing.get("customFieldGroupId")
+        # existing values for any card that already has this field.
+        group_id = custom_field.get(
+            "customFieldGroupId"
+        ) or snapshot.group_id_by_custom_field.get(custom_field_id)
         if not group_id:
             logger.error(
                 f"Cannot determine customFieldGroupId for field '{field_name}' "
@@ -274,7 +353,7 @@ class PlankaClient(Singleton):
             f"/customFieldGroupId:{group_id}:customFieldId:{custom_field_id}"
         )
         self._make_patch_request(uri, payload={"content": value})
-        self._board_cache.pop(self.board_id, None)
+        self._invalidate_board(self.board_id)
 
     def update_config(self, new_planka_config):
         """To be called after config automatic update."""
@@ -292,31 +371,416 @@ class PlankaClient(Singleton):
             "Content-Type": "application/json",
             "X-Api-Key": self.api_key,
         }
-        self._board_cache = TTLCache(maxsize=1000, ttl=30)
+        self.board_cache_soft_ttl = self._planka_config.get(
+            "board_cache_soft_ttl", BOARD_CACHE_SOFT_TTL_SEC
+        )
+        self.board_cache_hard_ttl = max(
+            self.board_cache_soft_ttl,
+            self._planka_config.get("board_cache_hard_ttl", BOARD_CACHE_HARD_TTL_SEC),
+        )
+        with self._board_cache_lock:
+            self._board_cache = TTLCache(maxsize=1000, ttl=self.board_cache_hard_ttl)
+            self._synced_boards = {}
+        self.incremental_sync = self._planka_config.get("incremental_sync", False)
+        self.full_sync_interval = self._planka_config.get(
+            "full_sync_interval_sec", FULL_SYNC_INTERVAL_SEC
+        )
+        with self._restored_lock:
+            self._restored = {}
+        snapshot_dir = self._planka_config.get("snapshot_dir")
+        self._snapshot_store = SnapshotStore(snapshot_dir) if snapshot_dir else None
+        self.snapshot_max_age = self._planka_config.get(
+            "snapshot_max_age_sec", SNAPSHOT_MAX_AGE_SEC
+        )
+        self._membership_index = None
+        self.timeout = (
+            self._planka_config.get("connect_timeout", CONNECT_TIMEOUT_SEC),
+            self._planka_config.get("read_timeout", READ_TIMEOUT_SEC),
+        )
+        if self._session is not None:
+            self._session.close()
+        self._session = self._create_session()
+        if self._board_fetch_executor is not None:
+            self._board_fetch_executor.shutdown(wait=False)
+        self._board_fetch_executor = ThreadPoolExecutor(
+            max_workers=self._planka_config.get(
+                "board_fetch_workers", BOARD_FETCH_WORKERS
+            ),
+            thread_name_prefix="planka",
+        )
 
-    def _make_request(self, uri, payload=None):
-        response = requests.get(
-            urljoin(self.api_url, uri.lstrip("/")),
-            params=payload or {},
-            headers=self.headers,
+    def _create_session(self) -> requests.Session:
+        """Keep-alive session, so that every request doesn't open a new TLS connection"""
+        pool_size = self._planka_config.get("pool_size", POOL_SIZE)
+        retry = Retry(
+            total=self._planka_config.get("max_retries", MAX_RETRIES),
+            backoff_factor=self._planka_config.get("retry_backoff", RETRY_BACKOFF_SEC),
+            status_forcelist=(500, 502, 503, 504),
+            # card custom field PATCH sets a value, so it's safe to repeat
+            allowed_methods=frozenset({"GET", "PATCH"}),
+            raise_on_status=False,
         )
-        logger.debug(f"{response.url}")
-        return response.status_code, response.json()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def _make_request(self, uri, payload=None):
+        return self._send_request("GET", uri, params=payload or {})
 
     def _make_patch_request(self, uri, payload=None):
-        response = requests.patch(
-            urljoin(self.api_url, uri.lstrip("/")),
-            json=payload or {},
-            headers=self.headers,
+        return self._send_request("PATCH", uri, json=payload or {})
+
+    def _send_request(self, method: str, uri: str, **kwargs):
+        endpoint = EndpointStats.endpoint_name(uri)
+        start = time.monotonic()
+        try:
+            response = self._session.request(
+                method,
+                urljoin(self.api_url, uri.lstrip("/")),
+                timeout=self.timeout,
+                **kwargs,
+            )
+        except requests.RequestException:
+            self.request_stats.record(endpoint, time.monotonic() - start, failed=True)
+            raise
+        self.request_stats.record(
+            endpoint, time.monotonic() - start, failed=not response.ok
         )
-        logger.debug(f"{response.url}")
+        logger.debug(f"{method} {response.url}: {response.status_code}")
         return response.status_code, response.json()
 
-    def _get_board_data(self, board_id):
-        if board_id not in self._board_cache:
-            _, data = self._make_request(f"boards/{board_id}")
-            self._board_cache[board_id] = data
-        return self._board_cache[board_id]
+    def _get_board_snapshot(self, board_id) -> BoardSnapshot:
+        """
+        Returns cached board snapshot or fetches it.
+        Concurrent callers missing the cache for the same board
+        wait for the single fetch in flight instead of starting their own.
+        Snapshots past the soft TTL are returned as is and refreshed
+        in the background.
+        """
+        snapshot = self._get_cached_board(board_id)
+        if snapshot is not None:
+            if snapshot.age() > self.board_cache_soft_ttl:
+                self._refresh_board_in_background(board_id)
+            return snapshot
+        snapshot = self._get_restored(
+            board_id, lambda data, fetched_at: BoardSnapshot(board_id, data, fetched_at)
+        )
+        if snapshot is not None:
+            self._refresh_board_in_background(board_id)
+            return snapshot
+        return self._board_fetches.do(board_id, lambda: self._fetch_board(board_id))
+
+    def _fetch_board(self, board_id) -> BoardSnapshot:
+        # a fetch for this board may have completed while we were waiting
+        snapshot = self._get_cached_board(board_id)
+        if snapshot is not None and snapshot.age() <= self.board_cache_soft_ttl:
+            return snapshot
+        with self._board_cache_lock:
+            generation = self._board_generations.get(board_id, 0)
+            previous = self._synced_boards.get(board_id)
+        snapshot = None
+        if self.incremental_sync and previous is not None:
+            snapshot = self._sync_board_incrementally(previous)
+        if snapshot is None:
+            snapshot = self._load_full_board(board_id)
+        with self._board_cache_lock:
+            if self._board_generations.get(board_id, 0) != generation:
+                return snapshot
+            self._board_cache[board_id] = snapshot
+            self._synced_boards[board_id] = snapshot
+        self._drop_restored(board_id)
+        self._save_snapshot(board_id, snapshot.data, snapshot.fetched_at)
+        return snapshot
+
+    def _load_full_board(self, board_id) -> BoardSnapshot:
+        latest_action_id = None
+        if self.incremental_sync:
+            # read actions first, so that changes made during the board
+            # download show up as new actions on the next sync
+            actions = self._get_board_actions(board_id)
+            if actions is not None:
+                latest_action_id = actions[0].get("id", "") if actions else ""
+        _, data = self._make_request(f"boards/{board_id}")
+        snapshot = BoardSnapshot(board_id, data)
+        snapshot.latest_action_id = latest_action_id
+        self._count_board_sync("full")
+        return snapshot
+
+    def _sync_board_incrementally(
+        self, previous: BoardSnapshot
+    ) -> Optional[BoardSnapshot]:
+        """
+        Patches previous snapshot with cards changed since it was synced.
+        Returns None if the board has to be downloaded as a whole.
+        """
+        board_id = previous.board_id
+        if (
+            previous.latest_action_id is None
+            or time.time() - previous.full_sync_at > self.full_sync_interval
+        ):
+            return None
+        try:
+            actions = self._get_board_actions(board_id)
+            if actions is None:
+                raise ValueError(f"Failed to get actions of board {board_id}")
+            new_actions = self._get_new_actions(actions, previous.latest_action_id)
+            if new_actions is None:
+                logger.info(f"Lost track of actions on board {board_id}, reloading it")
+                self._count_board_sync("fallbacks")
+                return None
+            if any(
+                action.get("type") not in CARD_ACTION_TYPES or not action.get("cardId")
+                for action in new_actions
+            ):
+                logger.info(f"Board {board_id} changed beyond its cards, reloading it")
+                self._count_board_sync("fallbacks")
+                return None
+            changed_cards = self._get_changed_cards(
+                previous, {action["cardId"] for action in new_actions}
+            )
+        except Exception as e:
+            logger.warning(
+                f"Incremental sync of board {board_id} failed, reloading it",
+                exc_info=e,
+            )
+            self._count_board_sync("fallbacks")
+            return None
+        if changed_cards is None:
+            logger.info(f"Cards of board {board_id} moved to new lists, reloading it")
+            self._count_board_sync("fallbacks")
+            return None
+
+        if not changed_cards:
+            snapshot = previous.renewed()
+        else:
+            snapshot = previous.with_card_changes(changed_cards)
+            logger.debug(
+                f"Board {board_id}: {len(new_actions)} new actions, "
+                f"{len(changed_cards)} cards changed"
+            )
+        if actions:
+            snapshot.latest_action_id = actions[0].get("id", "")
+        else:
+            snapshot.latest_action_id = previous.latest_action_id
+        self._count_board_sync("incremental")
+        return snapshot
+
+    @staticmethod
+    def _get_new_actions(
+        actions: List[dict], latest_action_id: str
+    ) -> Optional[List[dict]]:
+        """
+        Actions newer than the latest_action_id one, from a page of board
+        actions (newest first). None if the page doesn't reach it, so some
+        actions may be missing whatever the page size is.
+        """
+        for index, action in enumerate(actions):
+            if action.get("id") == latest_action_id:
+                return actions[:index]
+        if not actions and not latest_action_id:
+            return []
+        return None
+
+    def _get_changed_cards(
+        self, previous: BoardSnapshot, card_ids: Set[str]
+    ) -> Optional[Dict[str, Optional[dict]]]:
+        """
+        Cards/{id} payloads of the cards mentioned in new actions, None for
+        the ones deleted or moved off the board. Returns None if the board
+        has to be downloaded as a whole. Raises on failed requests.
+        """
+        included = previous.data.get("included", {})
+        list_ids = {item["id"] for item in included.get("lists", [])}
+        changed_cards = {}
+        for card_id in card_ids:
+            status_code, card_data = self._make_request(f"cards/{card_id}")
+            if status_code == 404:
+                changed_cards[card_id] = None
+            elif status_code != 200:
+                raise ValueError(f"cards/{card_id} returned {status_code}")
+            elif card_data["item"].get("boardId") != previous.board_id:
+                changed_cards[card_id] = None
+            elif card_data["item"].get("listId") not in list_ids:
+                # moved to a list created after the full sync
+                return None
+            else:
+                changed_cards[card_id] = card_data
+        return changed_cards
+
+    def _count_board_sync(self, kind: str):
+        with self._board_cache_lock:
+            self.board_sync_stats[kind] += 1
+
+    def _get_board_actions(self, board_id) -> Optional[List[dict]]:
+        """Most recent page of actions on the board, newest first"""
+        status_code, data = self._make_request(f"boards/{board_id}/actions")
+        if status_code != 200:
+            logger.warning(f"Failed to get actions of board {board_id}: {status_code}")
+            return None
+        return data.get("items", [])
+
+    def _get_projects_data(self) -> dict:
+        restored = self._get_restored(
+            PROJECTS_SNAPSHOT_KEY, lambda data, fetched_at: data
+        )
+        if restored is not None:
+            self._refresh_in_background(PROJECTS_SNAPSHOT_KEY, self._fetch_projects)
+            return restored
+        return self._fetch_projects()
+
+    def _fetch_projects(self) -> dict:
+        _, data = self._make_request("projects")
+        self._drop_restored(PROJECTS_SNAPSHOT_KEY)
+        self._save_snapshot(PROJECTS_SNAPSHOT_KEY, data, time.time())
+        return data
+
+    def _get_restored(self, key, build):
+        """
+        Returns build(data, fetched_at) for the payload saved to disk
+        before restart, if there is one within snapshot_max_age.
+        Disk is read at most once per key.
+        """
+        if self._snapshot_store is None:
+            return None
+        with self._restored_lock:
+            if key not in self._restored:
+                loaded = self._snapshot_store.load(key)
+                self._restored[key] = (build(*loaded), loaded[1]) if loaded else None
+            restored = self._restored[key]
+        if restored is None or time.time() - restored[1] > self.snapshot_max_age:
+            return None
+        return restored[0]
+
+    def _drop_restored(self, key):
+        # keep the key, so that outdated payload is not read from disk again
+        with self._restored_lock:
+            self._restored[key] = None
+
+    def _save_snapshot(self, key, data, fetched_at):
+        if self._snapshot_store is None:
+            return
+        try:
+            self._snapshot_store.save(key, data, fetched_at)
+        except Exception as e:
+            logger.warning(f"Failed to save Planka snapshot {key}", exc_info=e)
+
+    def _refresh_board_in_background(self, board_id):
+        self._refresh_in_background(
+            board_id,
+            lambda: self._board_fetches.do(
+                board_id, lambda: self._fetch_board(board_id)
+            ),
+        )
+
+    def _refresh_in_background(self, key, fetch):
+        """Runs fetch on the board fetch pool, unless one is already queued for key"""
+        with self._board_cache_lock:
+            if key in self._refreshes_pending:
+                return
+            self._refreshes_pending.add(key)
+        self._board_fetch_executor.submit(self._refresh, key, fetch)
+
+    def _refresh(self, key, fetch):
+        try:
+            fetch()
+        except Exception as e:
+            logger.error(f"Failed to refresh Planka {key}", exc_info=e)
+        finally:
+            with self._board_cache_lock:
+                self._refreshes_pending.discard(key)
+
+    def _get_cached_board(self, board_id) -> Optional[BoardSnapshot]:
+        with self._board_cache_lock:
+            snapshot = self._board_cache.get(board_id)
+        if snapshot is None or snapshot.age() > self.board_cache_hard_ttl:
+            return None
+        return snapshot
+
+    def _invalidate_board(self, board_id):
+        with self._board_cache_lock:
+            self._board_generations[board_id] = (
+                self._board_generations.get(board_id, 0) + 1
+            )
+            self._board_cache.pop(board_id, None)
+            self._synced_boards.pop(board_id, None)
+        self._drop_restored(board_id)
+
+    def _get_board_snapshots(self, board_ids) -> Dict[str, Optional[BoardSnapshot]]:
+        """
+        Fetches several boards concurrently on a bounded worker pool.
+        Boards that failed to load are logged and mapped to None.
+        """
+        futures = {
+            board_id: self._board_fetch_executor.submit(
+                self._get_board_snapshot, board_id
+            )
+            for board_id in board_ids
+        }
+        snapshots = {}
+        for board_id, future in futures.items():
+            try:
+                snapshots[board_id] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching board {board_id}", exc_info=e)
+                snapshots[board_id] = None
+        return snapshots
+
+    def _members_from_snapshot(
+        self, snapshot: BoardSnapshot
+    ) -> List[objects.TrelloMember]:
+        return [
+            self._member_from_planka_dict(snapshot.users_by_id[user_id])
+            for user_id in snapshot.member_user_ids
+            if user_id in snapshot.users_by_id
+        ]
+
+    @staticmethod
+    def _custom_field_names() -> Dict[TrelloCustomFieldTypeAlias, str]:
+        aliases = (
+            TrelloCustomFieldTypeAlias.TITLE,
+            TrelloCustomFieldTypeAlias.AUTHOR,
+            TrelloCustomFieldTypeAlias.EDITOR,
+            TrelloCustomFieldTypeAlias.ILLUSTRATOR,
+            TrelloCustomFieldTypeAlias.COVER,
+            TrelloCustomFieldTypeAlias.GOOGLE_DOC,
+        )
+        return {alias: load(alias.value) for alias in aliases}
+
+    @staticmethod
+    def _custom_fields_from_snapshot(
+        snapshot: BoardSnapshot,
+        card_id: str,
+        field_names: Dict[TrelloCustomFieldTypeAlias, str],
+    ) -> objects.CardCustomFields:
+        def _get(alias):
+            return snapshot.get_custom_field_value(card_id, field_names[alias])
+
+        card_fields = objects.CardCustomFields(card_id)
+        card_fields.title = _get(TrelloCustomFieldTypeAlias.TITLE)
+
+        author_val = _get(TrelloCustomFieldTypeAlias.AUTHOR)
+        card_fields.authors = (
+            [a.strip() for a in author_val.split(",")] if author_val else []
+        )
+
+        editor_val = _get(TrelloCustomFieldTypeAlias.EDITOR)
+        card_fields.editors = (
+            [e.strip() for e in editor_val.split(",")] if editor_val else []
+        )
+
+        illustrator_val = _get(TrelloCustomFieldTypeAlias.ILLUSTRATOR)
+        card_fields.illustrators = (
+            [i.strip() for i in illustrator_val.split(",")] if illustrator_val else []
+        )
+
+        card_fields.cover = _get(TrelloCustomFieldTypeAlias.COVER)
+        card_fields.google_doc = _get(TrelloCustomFieldTypeAlias.GOOGLE_DOC)
+        return card_fields
 
     def _board_from_planka_dict(self, data):
         board = objects.TrelloBoard()
@@ -377,16 +841,6 @@ class PlankaClient(Singleton):
         member.full_name = data.get("name") or data.get("username")
         return member
 
-    @staticmethod
-    def _group_by_card_id(items, value_key):
-        grouped = {}
-        for item in items:
-            card_id = item.get("cardId")
-            value = item.get(value_key)
-            if card_id and value:
-                grouped.setdefault(card_id, []).append(value)
-        return grouped
-
     @staticmethod
     def _normalize_list_ids(list_ids) -> Optional[Set[str]]:
         if list_ids is None:
@@ -413,10 +867,3 @@ class PlankaClient(Singleton):
         if not raw_url or raw_url.endswith("/"):
             return raw_url
         return f"{raw_url}/"
-
-    @staticmethod
-    def _list_position(lists_data, list_id):
-        for item in lists_data:
-            if item.get("id") == list_id:
-                return item.get("position") or 0
-        return 0
@@ -0,0 +1,53 @@
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """
+    Gzipped json copies of Planka API payloads on disk, keyed by name
+    (e.g. board id), together with the time they were fetched.
+    Used to serve reads right after a restart, before the first fetch.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, key: str, data: dict, fetched_at: float):
+        record = {"key": key, "fetched_at": fetched_at, "data": data}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            # GzipFile doesn't close a file object it was given
+            with os.fdopen(fd, "wb") as raw, gzip.open(
+                raw, "wt", encoding="utf-8"
+            ) as fout:
+                json.dump(record, fout, ensure_ascii=False)
+            # readers never see a partially written snapshot
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, key: str) -> Optional[Tuple[dict, float]]:
+        """Returns (data, fetched_at) or None if there is no readable snapshot"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as fin:
+                record = json.load(fin)
+            return record["data"], record["fetched_at"]
+        except Exception as e:
+            logger.warning(f"Failed to read Planka snapshot {path}", exc_info=e)
+            return None
+
+    def _path(self, key: str) -> str:
+        safe_key = re.sub(r"[^\w.-]", "_", key)
+        return os.path.join(self.directory, f"{safe_key}.json.gz")
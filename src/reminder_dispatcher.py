@@ -0,0 +1,135 @@
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .db.db_client import DBClient
+
+logger = logging.getLogger(__name__)
+
+# upper bound for a single wait, so that wall clock jumps are noticed
+MAX_WAIT_SEC = 60
+# delay before another attempt to send reminders that are still due after
+# a dispatch, e.g. because sending failed before they were claimed
+RETRY_DELAY_SEC = 60
+
+
+class ReminderDispatcher:
+    """
+    Fires reminders exactly at their next_reminder_datetime.
+    Keeps a heap of upcoming reminder times, loaded from the DB on start and
+    updated by DBClient on every reminder change. When the earliest reminder
+    is due, calls send_reminders (SendRemindersJob), which claims due
+    reminders in the DB, so DB stays the single source of truth.
+    Reminders still due in the DB after a dispatch are retried after
+    RETRY_DELAY_SEC.
+    """
+
+    def __init__(self, db_client: DBClient, send_reminders: Callable[[], None]):
+        self._db_client = db_client
+        self._send_reminders = send_reminders
+        self._condition = threading.Condition()
+        # (next reminder datetime, reminder id), may contain outdated entries
+        self._heap: List[Tuple[datetime, int]] = []
+        self._next_times: Dict[int, datetime] = {}
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        self._db_client.add_reminder_listener(self.schedule)
+        for reminder_id, next_time in self._db_client.get_reminder_times():
+            self.schedule(reminder_id, next_time)
+        self._thread = threading.Thread(
+            target=self._run, name="ReminderDispatcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"ReminderDispatcher started with {len(self._next_times)} reminders"
+        )
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def schedule(self, reminder_id: int, next_time: Optional[datetime]):
+        """Sets next reminder time, None removes the reminder"""
+        with self._condition:
+            if next_time is None:
+                self._next_times.pop(reminder_id, None)
+            else:
+                self._next_times[reminder_id] = next_time
+                heapq.heappush(self._heap, (next_time, reminder_id))
+            self._condition.notify()
+
+    def next_due(self) -> Optional[datetime]:
+        with self._condition:
+            self._drop_outdated()
+            return self._heap[0][0] if self._heap else None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._wait_for_due()
+                if due is None:
+                    return
+            logger.info(f"Reminders {due} are due")
+            try:
+                self._send_reminders()
+            except Exception as e:
+                logger.error("Failed to send due reminders", exc_info=e)
+            self._reschedule_unclaimed(due)
+
+    def _reschedule_unclaimed(self, due: List[int]):
+        """
+        Puts back reminders that were not claimed by the dispatch, so that
+        they are not lost until restart.
+        """
+        now = DBClient._get_now_msk_naive()
+        retry_time = now + timedelta(seconds=RETRY_DELAY_SEC)
+        try:
+            next_times = dict(self._db_client.get_reminder_times())
+        except Exception as e:
+            logger.error("Failed to reload reminder times", exc_info=e)
+            next_times = {reminder_id: retry_time for reminder_id in due}
+        with self._condition:
+            for reminder_id in due:
+                next_time = next_times.get(reminder_id)
+                if next_time is None or reminder_id in self._next_times:
+                    # deleted or already rescheduled by the DB
+                    continue
+                if next_time <= now:
+                    logger.warning(f"Reminder {reminder_id} is still due, retrying")
+                    next_time = retry_time
+                self.schedule(reminder_id, next_time)
+
+    def _wait_for_due(self) -> Optional[List[int]]:
+        """Blocks until some reminders are due, returns their ids"""
+        while not self._stopped:
+            self._drop_outdated()
+            now = DBClient._get_now_msk_naive()
+            if self._heap and self._heap[0][0] <= now:
+                return self._pop_due(now)
+            timeout = MAX_WAIT_SEC
+            if self._heap:
+                timeout = min(timeout, (self._heap[0][0] - now).total_seconds())
+            self._condition.wait(timeout)
+        return None
+
+    def _pop_due(self, now: datetime) -> List[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_time, reminder_id = heapq.heappop(self._heap)
+            if self._next_times.get(reminder_id) == next_time:
+                # rescheduled by the DB once the reminder is claimed
+                del self._next_times[reminder_id]
+                due.append(reminder_id)
+        return due
+
+    def _drop_outdated(self):
+        while self._heap:
+            next_time, reminder_id = self._heap[0]
+            if self._next_times.get(reminder_id) == next_time:
+                return
+            heapq.heappop(self._heap)
@@ -1,14 +1,16 @@
 import logging
 import threading
 import time
-from typing import List
+from typing import Dict, List, Tuple
 
 import schedule
 
 from .app_context import AppContext
 from .config_manager import ConfigManager
 from .consts import AT, CONFIG_RELOAD_MINUTES, EVERY, KWARGS, SEND_TO, WEEKDAYS_SHORT
+from .db.db_objects import Chat, Reminder
 from .jobs.utils import get_job_runnable
+from .reminder_dispatcher import ReminderDispatcher
 from .strings import load
 from .tg.sender import TelegramSender
 from .utils.singleton import Singleton
@@ -59,6 +61,12 @@ class JobScheduler(Singleton):
         continuous_thread = ScheduleThread()
         continuous_thread.start()
         self.stop_run_event = cease_continuous_run
+
+        send_reminders = get_job_runnable("send_reminders_job")
+        self.reminder_dispatcher = ReminderDispatcher(
+            self.app_context.db_client, lambda: send_reminders(self.app_context)
+        )
+        self.reminder_dispatcher.start()
         logger.info("JobScheduler successfully initialized")
 
     def init_jobs(self):
@@ -107,32 +115,40 @@ class JobScheduler(Singleton):
         logger.info("Finished setting jobs")
 
     @staticmethod
-    def _describe_job(job: schedule.Job, bot) -> str:
+    def _job_func_name(job: schedule.Job) -> str:
         # copied from schedule module
         if hasattr(job.job_func, "__name__"):
-            job_func_name = job.job_func.__name__  # type: ignore
-        else:
-            job_func_name = repr(job.job_func)
+            return job.job_func.__name__  # type: ignore
+        return repr(job.job_func)
 
+    @staticmethod
+    def _job_chat_ids(job: schedule.Job) -> List[int]:
         send_func = job.job_func.keywords.get("send", None)
+        return send_func.chat_ids if send_func else []
+
+    @staticmethod
+    def _describe_job(
+        job: schedule.Job,
+        bot,
+        chat_names: Dict[int, str],
+        reminders: List[Tuple[Reminder, Chat]],
+    ) -> str:
+        job_func_name = JobScheduler._job_func_name(job)
+
         recipient_links = []
-        app_context = AppContext()
-        if send_func:
-            for chat_id in send_func.chat_ids:
-                try:
-                    chat_name = app_context.db_client.get_chat_name(chat_id)
-                    recipient_links.append(
-                        f'<a href="https://web.telegram.org/a/#{chat_id}">{chat_name}</a>'
-                    )
-                except ValueError:
-                    recipient_links.append(
-                        f'<a href="https://web.telegram.org/a/#{chat_id}">{chat_id} (bad ID!)</a>'
-                    )
+        for chat_id in JobScheduler._job_chat_ids(job):
+            if chat_id in chat_names:
+                recipient_links.append(
+                    f'<a href="https://web.telegram.org/a/#{chat_id}">{chat_names[chat_id]}</a>'
+                )
+            else:
+                recipient_links.append(
+                    f'<a href="https://web.telegram.org/a/#{chat_id}">{chat_id} (bad ID!)</a>'
+                )
 
         recipients = ", ".join(recipient_links)
 
         if job_func_name == "SendRemindersJob":
-            reminders = AppContext().db_client.get_reminders_by_user_id(None)
             reminder_descriptions = [
                 load(
                     "jobs__reminder_job_reminder",
@@ -164,7 +180,18 @@ class JobScheduler(Singleton):
 
     @staticmethod
     def list_jobs(bot) -> List[str]:
-        return [JobScheduler._describe_job(job, bot) for job in schedule.jobs]
+        jobs = list(schedule.jobs)
+        db_client = AppContext().db_client
+        # recipients and reminders of all jobs are loaded at once
+        chat_names = db_client.get_chat_names(
+            chat_id for job in jobs for chat_id in JobScheduler._job_chat_ids(job)
+        )
+        reminders = []
+        if any(JobScheduler._job_func_name(job) == "SendRemindersJob" for job in jobs):
+            reminders = db_client.get_reminders_by_user_id(None)
+        return [
+            JobScheduler._describe_job(job, bot, chat_names, reminders) for job in jobs
+        ]
 
     def reschedule_jobs(self):
         logger.info("Clearing all scheduled jobs...")
@@ -179,6 +206,7 @@ class JobScheduler(Singleton):
             ("Scheduler received a signal. Will terminate after ongoing jobs end")
         )
         self.stop_run_event.set()
+        self.reminder_dispatcher.stop()
 
     @staticmethod
     def _get_job_runnable(job_module):
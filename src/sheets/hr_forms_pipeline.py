@@ -0,0 +1,104 @@
+import logging
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ..utils.telegram import normalize_telegram_username
+from .sheets_objects import SheetsItem, SheetsTable
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_contact(value: object) -> str:
+    if value is None:
+        return ""
+    return str(value).strip().lower()
+
+
+# normalizers for the contact fields, others are compared case-insensitively
+CONTACT_NORMALIZERS = {"telegram": normalize_telegram_username}
+
+
+class ContactIndex:
+    """Running sets of normalized contacts seen so far, one per field"""
+
+    def __init__(self, fields: Sequence[str]):
+        self._seen: Dict[str, set] = {field: set() for field in fields}
+
+    def find(self, person: SheetsItem) -> Optional[str]:
+        """First field of person that matches an already seen contact"""
+        for field, seen in self._seen.items():
+            contact = self._normalize(field, getattr(person, field))
+            if contact and contact in seen:
+                return field
+        return None
+
+    def add(self, person: SheetsItem):
+        for field, seen in self._seen.items():
+            contact = self._normalize(field, getattr(person, field))
+            if contact:
+                seen.add(contact)
+
+    @staticmethod
+    def _normalize(field: str, value: object) -> str:
+        return CONTACT_NORMALIZERS.get(field, normalize_contact)(value)
+
+
+class HRFormsPipeline:
+    """
+    Moves new answers of an HR form to the processed forms sheet.
+    Answers without any of required_fields are rejected, answers sharing
+    a contact with an earlier answer are marked as doubles.
+    Contacts are matched against running sets, so a run is linear
+    in the number of answers.
+    """
+
+    def __init__(
+        self,
+        contact_fields: Sequence[str],
+        required_fields: Sequence[str],
+        rejected_status: str,
+        double_status: str,
+        processed_status: str,
+    ):
+        self.contact_fields = contact_fields
+        self.required_fields = required_fields
+        self.rejected_status = rejected_status
+        self.double_status = double_status
+        self.processed_status = processed_status
+
+    def run(
+        self,
+        forms_raw: SheetsTable,
+        forms_processed: SheetsTable,
+        to_processed: Callable[[SheetsItem], dict],
+    ) -> List[SheetsItem]:
+        """
+        Sets statuses of new raw answers and adds accepted ones to
+        forms_processed as to_processed(person). Returns added rows.
+        """
+        contacts = ContactIndex(
+            [field for field in self.contact_fields if forms_raw.has_field(field)]
+        )
+        new_people = []
+        for person in forms_raw:
+            if person.status:
+                contacts.add(person)
+            else:
+                new_people.append(person)
+
+        new_items = []
+        for person in new_people:
+            # filter out incomplete responses
+            if not any(getattr(person, field) for field in self.required_fields):
+                person.status = self.rejected_status
+                continue
+            double_field = contacts.find(person)
+            if double_field is not None:
+                logger.info(f"Double HR form answer, same {double_field}")
+                person.status = self.double_status
+                continue
+
+            # move good ones to another sheet
+            person.status = self.processed_status
+            contacts.add(person)
+            new_items.append(forms_processed.add_one(to_processed(person)))
+        return new_items
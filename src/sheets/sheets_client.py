@@ -1,7 +1,9 @@
 import logging
-from typing import Optional
+import threading
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
 from sheetfu import SpreadsheetApp, Table
+from sheetfu.helpers import append_sheet_name
 from sheetfu.model import Sheet
 
 from ..utils.singleton import Singleton
@@ -11,6 +13,14 @@ logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 5
 CONFIG_PLACEHOLDER = "do_not_set_here_please_go_to_config_override"
+# column of the posts registry used to find already registered cards
+POSTS_REGISTRY_URL_COLUMN = "Трелло"
+
+
+class _CachedTable(NamedTuple):
+    # Drive file version of the spreadsheet the table was downloaded at
+    version: str
+    table: Table
 
 
 class GoogleSheetsClient(Singleton):
@@ -19,6 +29,9 @@ class GoogleSheetsClient(Singleton):
             return
 
         self._sheets_config = sheets_config
+        self._table_cache_lock = threading.Lock()
+        self._local = threading.local()
+        self._client_generation = 0
         self._update_from_config()
         logger.info("GoogleSheetsClient successfully initialized")
 
@@ -40,24 +53,49 @@ class GoogleSheetsClient(Singleton):
             "rubrics_registry_sheet_key"
         ]
         self.strings_sheet_key = self._sheets_config["strings_sheet_key"]
+        with self._table_cache_lock:
+            self._table_cache: Dict[Tuple[str, Optional[str]], _CachedTable] = {}
+        # clients of other threads are re-created on their next use
+        self._client_generation += 1
         self._authorize()
 
     def _authorize(self):
         self.client = SpreadsheetApp(self._sheets_config["api_key_path"])
 
+    @property
+    def client(self) -> SpreadsheetApp:
+        """
+        SpreadsheetApp of the current thread: google api services are built
+        on httplib2, which is not thread-safe.
+        """
+        if getattr(self._local, "generation", None) != self._client_generation:
+            self._authorize()
+        return getattr(self._local, "client", None)
+
+    @client.setter
+    def client(self, client: SpreadsheetApp):
+        self._local.client = client
+        self._local.generation = self._client_generation
+
     def fetch_curators(self) -> Table:
-        return self._fetch_table(self.curators_sheet_key)
+        return self._fetch_cached_table(self.curators_sheet_key)
 
     def fetch_rubrics(self) -> Table:
-        return self._fetch_table(self.rubrics_registry_sheet_key)
+        return self._fetch_cached_table(self.rubrics_registry_sheet_key)
 
     def fetch_strings(self) -> Table:
-        return self._fetch_table(self.strings_sheet_key)
+        return self._fetch_cached_table(self.strings_sheet_key)
 
     def fetch_hr_forms_raw(self) -> Table:
         return self._fetch_table(self.hr_sheet_key, "Ответы на форму")
 
-    def fetch_hr_forms_processed(self) -> Table:
+    def fetch_hr_forms_processed(self, read_only: bool = False) -> Table:
+        """
+        HR acquisition jobs modify and commit the returned table, so it is
+        served from the cache only for read_only callers.
+        """
+        if read_only:
+            return self._fetch_cached_table(self.hr_sheet_key, "Анкеты")
         return self._fetch_table(self.hr_sheet_key, "Анкеты")
 
     def fetch_hr_pt_forms_raw(self) -> Table:
@@ -68,11 +106,13 @@ class GoogleSheetsClient(Singleton):
 
     def fetch_hr_team(self) -> Table:
         if self._has_configured_team_identity_sheet():
-            return self._fetch_table(self.team_identity_sheet_key, "team")
-        return self._fetch_table(self.hr_sheet_key, "Команда (с заморозкой)")
+            return self._fetch_cached_table(self.team_identity_sheet_key, "team")
+        return self._fetch_cached_table(self.hr_sheet_key, "Команда (с заморозкой)")
 
     def fetch_telegram_ids(self) -> Table:
-        return self._fetch_table(self._require_team_identity_sheet_key(), "telegram")
+        return self._fetch_cached_table(
+            self._require_team_identity_sheet_key(), "telegram"
+        )
 
     def update_telegram_ids(self, username_id_pairs):
         sheet = self._open_by_key(self._require_team_identity_sheet_key())
@@ -91,26 +131,32 @@ class GoogleSheetsClient(Singleton):
             table.commit()
         except Exception as e:
             logger.error("Failed to update Telegram IDs", exc_info=e)
+        finally:
+            self._invalidate_table_cache(self._require_team_identity_sheet_key())
         return new_usernames
 
     def fetch_posts_registry(self) -> Table:
-        return self._fetch_table(self.post_registry_sheet_key)
+        return self._fetch_cached_table(self.post_registry_sheet_key)
 
     def update_posts_registry(self, entries):
         sheet = self._open_by_key(self.post_registry_sheet_key)
-        data = sheet.get_sheet_by_id(0).get_data_range()
-        table = Table(data)
+        table = Table(sheet.get_sheet_by_id(0).get_data_range())
+        registered_urls = self._get_registered_urls(table)
         new_posts = []
         try:
             for entry in entries:
-                if self._has_string(data, entry.trello_url):
+                if entry.trello_url in registered_urls:
                     logger.info(f"Card {entry.trello_url} already present in registry")
                     continue
                 table.add_one(entry.to_dict())
+                registered_urls.add(entry.trello_url)
                 new_posts.append(entry.title)
+            # all new rows go in a single batchUpdate request
             table.commit()
         except Exception as e:
             logger.error("Failed to update post registry", exc_info=e)
+        finally:
+            self._invalidate_table_cache(self.post_registry_sheet_key)
         return new_posts
 
     def fetch_sheet(self, sheet_key: str, sheet_name: Optional[str] = None) -> Sheet:
@@ -121,13 +167,93 @@ class GoogleSheetsClient(Singleton):
             else sheet.get_sheet_by_id(0)
         )
 
-    def _has_string(self, data, string: str):
-        return string in str(data.get_values())
+    def get_cell_values(self, sheet: Sheet, a1_cells: List[str]) -> Dict[str, object]:
+        """
+        Values of single cells (e.g. "B2") of the sheet in one values:batchGet
+        request. Empty cells are returned as "".
+        """
+        a1_cells = list(dict.fromkeys(a1_cells))
+        if not a1_cells:
+            return {}
+        response = (
+            sheet.client.sheet_service.spreadsheets()
+            .values()
+            .batchGet(
+                spreadsheetId=sheet.spreadsheet.id,
+                ranges=[append_sheet_name(a1, sheet.name) for a1 in a1_cells],
+                valueRenderOption="UNFORMATTED_VALUE",
+            )
+            .execute()
+        )
+        # value ranges are returned in the order of requested ranges
+        values = {}
+        for a1, value_range in zip(a1_cells, response.get("valueRanges", [])):
+            rows = value_range.get("values") or [[""]]
+            values[a1] = rows[0][0] if rows[0] else ""
+        return values
+
+    @staticmethod
+    def _get_registered_urls(table: Table) -> Set[str]:
+        """
+        Card urls already present in the posts registry table.
+        Falls back to values of all cells if the url column is renamed.
+        """
+        if POSTS_REGISTRY_URL_COLUMN in table.header:
+            column = table.header.index(POSTS_REGISTRY_URL_COLUMN)
+            return {str(item.values[column]).strip() for item in table}
+        logger.warning(
+            f"Column {POSTS_REGISTRY_URL_COLUMN} not found in posts registry, "
+            "looking for card urls in all columns"
+        )
+        return {str(value).strip() for item in table for value in item.values}
 
     def _fetch_table(self, sheet_key: str, sheet_name: Optional[str] = None) -> Table:
         worksheet = self.fetch_sheet(sheet_key, sheet_name)
         return Table(worksheet.get_data_range())
 
+    def _fetch_cached_table(
+        self, sheet_key: str, sheet_name: Optional[str] = None
+    ) -> Table:
+        """
+        Table shared between callers, re-downloaded only when the Drive
+        version of the spreadsheet changes.
+        Callers must not modify the returned table.
+        """
+        cache_key = (sheet_key, sheet_name)
+        with self._table_cache_lock:
+            cached = self._table_cache.get(cache_key)
+        version = self._get_spreadsheet_version(sheet_key)
+        if cached is not None and version is not None and cached.version == version:
+            logger.debug(f"Sheet {cache_key} is not modified, using cached table")
+            return cached.table
+
+        # version is taken before the download, so a concurrent edit
+        # can only cause an extra download later, never a stale table
+        table = self._fetch_table(sheet_key, sheet_name)
+        if version is not None:
+            with self._table_cache_lock:
+                self._table_cache[cache_key] = _CachedTable(version, table)
+        return table
+
+    def _get_spreadsheet_version(self, sheet_key: str) -> Optional[str]:
+        """Drive file version, changes on every edit of the spreadsheet"""
+        try:
+            response = (
+                self.client.drive_service.files()
+                .get(fileId=sheet_key, fields="version", supportsAllDrives=True)
+                .execute()
+            )
+            return response["version"]
+        except Exception as e:
+            logger.warning(f"Failed to get version of sheet {sheet_key}", exc_info=e)
+            return None
+
+    def _invalidate_table_cache(self, sheet_key: str):
+        with self._table_cache_lock:
+            for cache_key in list(self._table_cache):
+                if cache_key[0] == sheet_key:
+                    del self._table_cache[cache_key]
+
     def _has_configured_team_identity_sheet(self) -> bool:
         return bool(self.team_identity_sheet_key) and (
             self.team_identity_sheet_key != CONFIG_PLACEHOLDER
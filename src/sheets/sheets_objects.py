@@ -1,12 +1,15 @@
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Type
 
+from sheetfu.helpers import convert_coordinates_to_a1
+from sheetfu.model import Range
 from sheetfu.modules.table import Item, Table
 
 from ..consts import BoardCardColor, TrelloCardColor
 from ..strings import load
 from ..planka.board_objects import CardCustomFields, TrelloCard
+from .sheets_client import POSTS_REGISTRY_URL_COLUMN
 from .utils import convert_excel_datetime_to_string
 
 logger = logging.getLogger(__name__)
@@ -24,7 +27,7 @@ class RegistryPost:
         "rubric_1": "Рубрика",
         "rubric_2": "Доп.Рубрика",
         "google_doc": "Гугл.док",
-        "trello": "Трелло",
+        "trello": POSTS_REGISTRY_URL_COLUMN,
         "editor": "Редактор",
         "cover_type": "Тип обложки",
         "cover": "Обложка",
@@ -177,46 +180,154 @@ class RegistryPost:
 
 
 class SheetsItem:
+    """
+    Row view over values of a sheetfu Item.
+    Every field_alias key becomes a property reading the value by column
+    index, the indexes are resolved from the table header once per table
+    (see SheetsTable). Writes are tracked in the dirty cells of the table.
+    """
+
+    __slots__ = ("item", "_columns", "_dirty")
     field_alias = {}
 
-    def __init__(self, item: Item):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in cls.field_alias:
+            setattr(cls, name, property(*_field_accessors(name)))
+
+    def __init__(
+        self,
+        item: Item,
+        columns: Optional[Dict[str, Optional[int]]] = None,
+        dirty: Optional[Dict[Tuple[int, int], Item]] = None,
+    ):
         if not self.field_alias:
             raise RuntimeError(f"empty field_alias for {self.__class__}")
         self.item = item
+        self._columns = (
+            columns if columns is not None else self.resolve_columns(item.header)
+        )
+        self._dirty = dirty
+
+    @classmethod
+    def resolve_columns(cls, header: List[str]) -> Dict[str, Optional[int]]:
+        """Column index for each field, None for fields missing in header"""
+        indexes = {title: index for index, title in enumerate(header)}
+        return {
+            name: indexes.get(load(string_id))
+            for name, string_id in cls.field_alias.items()
+        }
 
-    def __getattr__(self, name):
-        if name in self.field_alias:
-            value = self.item.get_field_value(load(self.field_alias[name]))
-            # Excel time format, http://www.cpearson.com/excel/datetime.htm
-            # 40000 is around 2009
-            # 50000 is around 2040, ph I hope Sysblok will thrive in 2040
-            if type(value) is float and 40000 <= value <= 50000:
-                return convert_excel_datetime_to_string(value)
-            else:
-                return value
-        else:
-            return super().__getattribute__(name)
-
-    def __setattr__(self, name, value):
-        if name in self.field_alias:
-            return self.item.set_field_value(
-                load(self.field_alias[name]),
-                value,
+    def _column(self, name: str) -> int:
+        column = self._columns[name]
+        if column is None:
+            raise ValueError(
+                f"{load(self.field_alias[name])} is not in {self.__class__.__name__} "
+                "sheet header"
             )
-        else:
-            return super().__setattr__(name, value)
+        return column
 
-    @classmethod
-    def add_one_to_table(cls, table: Table, item_dict_alias: dict) -> Item:
-        """
-        This is ugly, but sheetfu doesn't have a better API
-        I will fix that at some point
-        """
-        item_dict = {load(cls.field_alias[k]): v for k, v in item_dict_alias.items()}
-        return cls(table.add_one(item_dict))
+    def _get_value(self, name: str):
+        value = self.item.values[self._column(name)]
+        # Excel time format, http://www.cpearson.com/excel/datetime.htm
+        # 40000 is around 2009
+        # 50000 is around 2040, ph I hope Sysblok will thrive in 2040
+        if type(value) is float and 40000 <= value <= 50000:
+            return convert_excel_datetime_to_string(value)
+        return value
+
+    def _set_value(self, name: str, value):
+        column = self._column(name)
+        if self._dirty is None:
+            # standalone item, write through sheetfu
+            self.item.set_field_value(self.item.header[column], value)
+            return
+        self.item.values[column] = value
+        self._dirty[(self.item.row_index, column)] = self.item
+
+
+def _field_accessors(name: str):
+    def getter(self):
+        return self._get_value(name)
+
+    def setter(self, value):
+        self._set_value(name, value)
+
+    return getter, setter
+
+
+class SheetsTable:
+    """
+    Sheet table as item_cls rows.
+    Changed cells are kept in a dirty set and written on commit,
+    one range per run of adjacent cells in a row, all in a single
+    batchUpdate request, so that other cells (formulas, concurrent edits)
+    are left untouched.
+    """
+
+    def __init__(self, table: Table, item_cls: Type[SheetsItem]):
+        self.table = table
+        self.item_cls = item_cls
+        self.columns = item_cls.resolve_columns(table.header)
+        # (row index, column index) -> item of the row
+        self._dirty: Dict[Tuple[int, int], Item] = {}
+        self.items = [item_cls(item, self.columns, self._dirty) for item in table]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def has_field(self, name: str) -> bool:
+        return self.columns.get(name) is not None
+
+    def add_one(self, item_dict_alias: dict) -> SheetsItem:
+        item_dict = {
+            self.table.header[column]: item_dict_alias[name]
+            for name, column in self.columns.items()
+            if column is not None and name in item_dict_alias
+        }
+        row = self.item_cls(self.table.add_one(item_dict), self.columns, self._dirty)
+        self.items.append(row)
+        return row
+
+    def commit(self):
+        run = []
+        for row_index, column in sorted(self._dirty):
+            if run and (row_index, column) != (run[-1][0], run[-1][1] + 1):
+                self._write_cells(run)
+                run = []
+            run.append((row_index, column))
+        if run:
+            self._write_cells(run)
+        self._dirty.clear()
+        self.table.commit()
+
+    def _write_cells(self, cells: List[Tuple[int, int]]):
+        """Writes a run of adjacent cells of one row"""
+        row_index, first_column = cells[0]
+        item = self._dirty[cells[0]]
+        coordinates = self.table.items_range.coordinates
+        a1 = convert_coordinates_to_a1(
+            row=coordinates.row + row_index,
+            column=coordinates.column + first_column,
+            number_of_row=1,
+            number_of_column=len(cells),
+            sheet_name=coordinates.sheet_name,
+        )
+        Range(
+            client=self.table.full_range.client,
+            sheet=self.table.full_range.sheet,
+            a1=a1,
+        ).set_values(
+            [item.values[first_column : first_column + len(cells)]],
+            batch_to=self.table,
+        )
 
 
 class HRPersonRaw(SheetsItem):
+    __slots__ = ()
     field_alias = {
         "ts": "sheets__hr__raw__timestamp",
         "name": "sheets__hr__raw__name",
@@ -230,6 +341,7 @@ class HRPersonRaw(SheetsItem):
 
 
 class HRPersonProcessed(SheetsItem):
+    __slots__ = ()
     field_alias = {
         "id": "sheets__hr__processed__id",
         "name": "sheets__hr__processed__name",
@@ -247,6 +359,7 @@ class HRPersonProcessed(SheetsItem):
 
 
 class HRPersonPTRaw(SheetsItem):
+    __slots__ = ()
     field_alias = {
         "ts": "sheets__hr__pt__raw__timestamp",
         "name": "sheets__hr__pt__raw__name",
@@ -259,6 +372,7 @@ class HRPersonPTRaw(SheetsItem):
 
 
 class HRPersonPTProcessed(SheetsItem):
+    __slots__ = ()
     field_alias = {
         "id": "sheets__hr__pt__processed__id",
         "name": "sheets__hr__pt__processed__name",
@@ -272,6 +386,7 @@ class HRPersonPTProcessed(SheetsItem):
 
 
 class PostRegistryItem(SheetsItem):
+    __slots__ = ()
     field_alias = {
         "name": "sheets__post_registry__column_name",
         "vk_link": "sheets__post_registry__column_vk_link",
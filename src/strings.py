@@ -1,16 +1,24 @@
 import logging
 from collections import defaultdict
+from string import Formatter
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 
-from sqlalchemy import Column, String, create_engine
+from sheetfu import Table
+from sqlalchemy import Column, String
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+from .db.engine import create_db_engine
+from .db.sheet_sync import sync_table
 from .sheets.sheets_client import GoogleSheetsClient
 from .utils.singleton import Singleton
 
 logger = logging.getLogger(__name__)
 Base = declarative_base()
 
+_FORMATTER = Formatter()
+
 
 class DBString(Base):
     __tablename__ = "strings"
@@ -22,12 +30,65 @@ class DBString(Base):
         self.value = value
 
 
+class StringTemplate:
+    """
+    Pre-parsed string for format_map with default "?" values.
+    Only plain {name} / {name!r:spec} fields are rendered directly,
+    anything fancier falls back to str.format_map.
+    """
+
+    __slots__ = ("value", "_parts")
+
+    def __init__(self, value: str):
+        self.value = value
+        self._parts = self._parse(value)
+
+    def render(self, kwargs: dict) -> str:
+        if self._parts is None:
+            return self.value.format_map(defaultdict(lambda: "?", kwargs))
+        chunks = []
+        for literal, field_name, format_spec, conversion in self._parts:
+            chunks.append(literal)
+            if field_name is None:
+                continue
+            arg = kwargs.get(field_name, "?")
+            if conversion:
+                arg = _FORMATTER.convert_field(arg, conversion)
+            chunks.append(format(arg, format_spec))
+        return "".join(chunks)
+
+    @staticmethod
+    def _parse(value: str):
+        try:
+            parts = list(_FORMATTER.parse(value))
+        except ValueError:
+            # let format_map raise the same error on render
+            return None
+        for _, field_name, format_spec, _ in parts:
+            if field_name is None:
+                continue
+            if (
+                not field_name
+                or field_name.isdigit()
+                or "." in field_name
+                or "[" in field_name
+                or "{" in format_spec
+            ):
+                return None
+        return tuple(parts)
+
+
 class StringsDBClient(Singleton):
     def __init__(self, strings_db_config=None):
         if self.was_initialized():
             return
 
         self._strings_db_config = strings_db_config
+        # (strings by id, parsed templates by id), swapped as a whole on reload
+        self._catalog: Tuple[Mapping[str, str], Dict[str, StringTemplate]] = (
+            MappingProxyType({}),
+            {},
+        )
         self._update_from_config()
         logger.info("StringDBClient successfully initialized")
 
@@ -37,57 +98,70 @@ class StringsDBClient(Singleton):
         self._update_from_config()
 
     def _update_from_config(self):
-        self.engine = create_engine(
-            self._strings_db_config["uri"],
-            connect_args={"check_same_thread": False},
-            echo=False,
-        )
+        self.engine = create_db_engine(self._strings_db_config)
         session_factory = sessionmaker(bind=self.engine)
         self.Session = scoped_session(session_factory)
         Base.metadata.create_all(self.engine)
+        self.reload_catalog()
 
     def fetch_strings_sheet(self, sheets_client: GoogleSheetsClient):
-        session = self.Session()
         try:
-            # clean this table
-            session.query(DBString).delete()
-            # re-download it
             strings = sheets_client.fetch_strings()
-            string_ids = set()
+        except Exception as e:
+            logger.warning("Failed to fetch strings sheet", exc_info=e)
+            return 0
+        return self.sync_strings_sheet(strings)
+
+    def sync_strings_sheet(self, strings: Table) -> int:
+        """Writes downloaded strings sheet to the DB and reloads the catalog"""
+        session = self.Session()
+        try:
+            rows = []
             for item in strings:
                 string_id = item.get_field_value("Id")
                 if string_id is None:
                     # we use that to separate different strings
                     continue
-                if string_id in string_ids:
-                    logger.error(f"found duplicate string id: {string_id}")
-                    continue
-                string_ids.add(string_id)
-                string_value = item.get_field_value("Message")
-                string = DBString(string_id, string_value)
-                if string is None:
-                    continue
-                session.add(string)
+                rows.append({"id": string_id, "value": item.get_field_value("Message")})
+            result = sync_table(session.connection(), DBString.__table__, rows)
             session.commit()
         except Exception as e:
             logger.warning("Failed to update string table from sheet", exc_info=e)
             session.rollback()
             return 0
+        logger.info(f"Strings table synced: {result}")
+        self.reload_catalog()
         return len(strings)
 
-    def get_string(self, string_id: str) -> str:
+    def reload_catalog(self) -> int:
+        """
+        Reads the whole strings table into memory and atomically replaces
+        the catalog used by get_string. Returns number of strings loaded.
+        """
         session = self.Session()
-        message = session.query(DBString).filter(DBString.id == string_id).first()
-        if not message:
+        rows = session.query(DBString.id, DBString.value).all()
+        strings = MappingProxyType({string_id: value for string_id, value in rows})
+        self._catalog = (strings, {})
+        logger.info(f"Loaded {len(strings)} strings into catalog")
+        return len(strings)
+
+    def get_string(self, string_id: str) -> str:
+        strings, _ = self._catalog
+        value = strings.get(string_id)
+        if value is None:
             logger.error(f"Message not found for id {string_id}")
             return f"<{string_id}>"
-        return message.value
+        return value
+
+    def get_template(self, string_id: str) -> StringTemplate:
+        strings, templates = self._catalog
+        template = templates.get(string_id)
+        if template is None:
+            template = StringTemplate(self.get_string(string_id))
+            if string_id in strings:
+                templates[string_id] = template
+        return template
 
 
 def load(string_id: str, **kwargs) -> str:
-    db_client = StringsDBClient()
-    return (
-        db_client.get_string(string_id)
-        .format_map(defaultdict(lambda: "?", kwargs))
-        .strip()
-    )
+    return StringsDBClient().get_template(string_id).render(kwargs).strip()
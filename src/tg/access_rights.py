@@ -0,0 +1,43 @@
+from typing import Iterable, Optional, Union
+
+from ..utils.telegram import normalize_telegram_username
+
+
+class AccessRights:
+    """
+    Precomputed sets behind admin/manager permission checks.
+    Admins come from the telegram config (chat ids or logins),
+    managers are curators from the curators sheet.
+    Rebuilt as a whole when either source changes.
+    """
+
+    def __init__(
+        self,
+        admin_chat_ids: Iterable[Union[int, str]],
+        curator_logins: Iterable[str],
+        generation: int = 0,
+    ):
+        self.generation = generation
+        admin_chat_ids = list(admin_chat_ids)
+        self.admin_ids = frozenset(
+            chat_id for chat_id in admin_chat_ids if isinstance(chat_id, int)
+        )
+        self.admin_logins = frozenset(
+            normalize_telegram_username(chat_id)
+            for chat_id in admin_chat_ids
+            if isinstance(chat_id, str) and normalize_telegram_username(chat_id)
+        )
+        self.manager_logins = frozenset(
+            normalize_telegram_username(login)
+            for login in curator_logins
+            if normalize_telegram_username(login)
+        )
+
+    def is_admin(self, user_id: Optional[int], username: Optional[str]) -> bool:
+        return (
+            user_id in self.admin_ids
+            or normalize_telegram_username(username) in self.admin_logins
+        )
+
+    def is_manager(self, username: Optional[str]) -> bool:
+        return normalize_telegram_username(username) in self.manager_logins
@@ -39,20 +39,11 @@ def handle_stateless_message(update, tg_context):
 
             team_member_id = None
             if username:
-                normalized_username = username.lstrip("@")
-                team_members = app_context.db_client.get_all_members()
-                matching_member = next(
-                    (
-                        m
-                        for m in team_members
-                        if m.telegram
-                        and m.telegram.strip().lstrip("@").lower()
-                        == normalized_username.lower()
-                    ),
-                    None,
+                team_member_id = (
+                    app_context.db_client.find_team_member_id_by_telegram_username(
+                        username
+                    )
                 )
-                if matching_member:
-                    team_member_id = matching_member.id
 
             app_context.db_client.upsert_user_from_telegram(
                 telegram_user_id=user_id,
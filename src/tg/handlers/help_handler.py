@@ -10,6 +10,8 @@ logger = logging.getLogger(__name__)
 @direct_message_only
 def help(update, tg_context, handlers_info: dict):
     message = ""
+    is_admin = is_sender_admin(update)
+    is_manager = not is_admin and is_sender_manager(update)
 
     for category_alias in sorted(handlers_info.keys(), key=lambda cat: cat.value):
         print(category_alias)
@@ -22,11 +24,11 @@ def help(update, tg_context, handlers_info: dict):
             continue
         handlers = handlers_info[category_alias]
         listed_handlers = []
-        if is_sender_admin(update):
+        if is_admin:
             listed_handlers = list(handlers["admin"].items()) + list(
                 handlers["manager"].items()
             )
-        elif is_sender_manager(update):
+        elif is_manager:
             listed_handlers = list(handlers["manager"].items())
         listed_handlers += list(handlers["user"].items())
 
@@ -1,4 +1,4 @@
-from typing import Iterable
+from typing import Dict, Iterable, Optional
 
 from ...app_context import AppContext
 from ...db.db_client import DBClient
@@ -10,6 +10,7 @@ from .utils import admin_only, direct_message_only, reply
 @direct_message_only
 def list_chats(update, tg_context):
     chats = DBClient().get_all_chats()
+    chat_names = {chat.id: chat.title for chat in chats}
     app_context = AppContext()
     admins = app_context.admin_chat_ids
     managers = app_context.manager_chat_ids
@@ -22,9 +23,9 @@ def list_chats(update, tg_context):
             groups.append(chat.title)
     text = load(
         "get_usage_list__message",
-        admins=_format_tg_usernames(admins),
-        managers=_format_tg_usernames(managers),
-        curators=_format_tg_usernames(curators),
+        admins=_format_tg_usernames(admins, chat_names),
+        managers=_format_tg_usernames(managers, chat_names),
+        curators=_format_tg_usernames(curators, chat_names),
         groups="\n".join(
             [
                 load("get_usage_list__username_format", username=group)
@@ -35,22 +36,26 @@ def list_chats(update, tg_context):
     reply(text, update)
 
 
-def _format_tg_usernames(usernames: Iterable[str]) -> str:
+def _format_tg_usernames(usernames: Iterable[str], chat_names: Dict[int, str]) -> str:
     formatted_usernames = []
     for username in usernames:
-        try:
-            # check if username is actually a chat_id, that can happen in admin/moderator list
-            int_username = int(username)
-            # if it is, we try to determine a username from DB
-            try:
-                username = f"@{DBClient().get_chat_name(int_username)}"
-            except ValueError:
-                # if no name was found, just leave it as is
-                pass
-        except ValueError:
-            if not username.startswith("@"):
-                username = f"@{username}"
+        # username can actually be a chat_id, that can happen in admin/moderator list
+        chat_id = _as_chat_id(username)
+        if chat_id is not None:
+            # if it is, we try to determine a username from DB,
+            # if no name was found, just leave it as is
+            if chat_id in chat_names:
+                username = f"@{chat_names[chat_id]}"
+        elif not username.startswith("@"):
+            username = f"@{username}"
         formatted_usernames.append(
             load("get_usage_list__username_format", username=username)
         )
     return "\n".join(sorted(formatted_usernames))
+
+
+def _as_chat_id(username) -> Optional[int]:
+    try:
+        return int(username)
+    except ValueError:
+        return None
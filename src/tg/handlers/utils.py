@@ -98,14 +98,15 @@ def direct_message_only(func):
 
 
 def is_sender_admin(update) -> bool:
-    chats = AppContext().admin_chat_ids
-    return get_sender_id(update) in chats or get_sender_username(update) in chats
+    return (
+        AppContext()
+        .get_access_rights()
+        .is_admin(get_sender_id(update), get_sender_username(update))
+    )
 
 
 def is_sender_manager(update) -> bool:
-    telegram_login = get_sender_username(update)
-    curator = AppContext().db_client.get_curator_by_telegram(telegram_login)
-    return curator is not None
+    return AppContext().get_access_rights().is_manager(get_sender_username(update))
 
 
 def get_sender_id(update) -> int:
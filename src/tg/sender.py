@@ -2,9 +2,10 @@
 
 import asyncio
 import logging
+import math
 import re
 import time
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import telegram
 
@@ -23,6 +24,11 @@ SEND_CONNECT_TIMEOUT_SEC = 10
 # round-trip), kept generously above what a legitimate worst case should take.
 SEND_BRIDGE_TIMEOUT_SEC = 60
 
+# Chats served at once by send_to_chats_concurrently. Telegram allows about
+# 30 messages per second per bot, and one message per second per chat,
+# so messages to one chat are always sent one after another.
+MAX_CONCURRENT_CHATS = 10
+
 
 class TelegramSender(Singleton):
     def __init__(
@@ -85,6 +91,71 @@ class TelegramSender(Singleton):
         Sends a message to a single chat_id.
         """
         coro = self._send_to_chat_id_async(message_text, chat_id, **kwargs)
+        return self._run_on_loop(coro, SEND_BRIDGE_TIMEOUT_SEC)
+
+    def send_to_chats_concurrently(
+        self, messages_by_chat: Dict[int, List[Tuple[str, dict]]]
+    ) -> Dict[int, List[Tuple[bool, float]]]:
+        """
+        Sends (message_text, kwargs) messages to several chats at once,
+        at most max_concurrent_chats at a time. Messages to the same chat
+        are sent in the given order.
+        Returns (sent, seconds since start) for every message, by chat id.
+        Messages whose delivery couldn't be confirmed (e.g. the bridge to the
+        bot loop timed out) are reported as not sent.
+        """
+        if not messages_by_chat:
+            return {}
+        start = time.monotonic()
+        total_messages = sum(len(messages) for messages in messages_by_chat.values())
+        max_chat_messages = max(len(messages) for messages in messages_by_chat.values())
+        timeout = SEND_BRIDGE_TIMEOUT_SEC * (
+            math.ceil(total_messages / self.max_concurrent_chats) + max_chat_messages
+        )
+        coro = self._send_to_chats_async(messages_by_chat)
+        try:
+            results = self._run_on_loop(coro, timeout)
+        except Exception as e:
+            logger.error("Could not send messages to chats", exc_info=e)
+            results = None
+        if results is None:
+            seconds = time.monotonic() - start
+            results = {
+                chat_id: [(False, seconds)] * len(messages)
+                for chat_id, messages in messages_by_chat.items()
+            }
+        return results
+
+    async def _send_to_chats_async(
+        self, messages_by_chat: Dict[int, List[Tuple[str, dict]]]
+    ) -> Dict[int, List[Tuple[bool, float]]]:
+        semaphore = asyncio.Semaphore(self.max_concurrent_chats)
+        start = time.monotonic()
+
+        async def send_to_chat(chat_id: int, messages: List[Tuple[str, dict]]):
+            results = []
+            async with semaphore:
+                for message_text, kwargs in messages:
+                    try:
+                        sent = await self._send_to_chat_id_async(
+                            message_text, chat_id, **kwargs
+                        )
+                    except Exception as e:
+                        logger.error(
+                            f"Could not send a message to {chat_id}", exc_info=e
+                        )
+                        sent = False
+                    results.append((bool(sent), time.monotonic() - start))
+            return results
+
+        chat_ids = list(messages_by_chat)
+        results = await asyncio.gather(
+            *(send_to_chat(chat_id, messages_by_chat[chat_id]) for chat_id in chat_ids)
+        )
+        return dict(zip(chat_ids, results))
+
+    def _run_on_loop(self, coro, timeout: float):
+        """Runs coroutine on the bot loop from any thread and returns its result"""
         try:
             running_loop = asyncio.get_running_loop()
         except RuntimeError:
@@ -106,7 +177,7 @@ class TelegramSender(Singleton):
             # Normal case: called from a handler/scheduler thread while PTB is
             # polling on its own loop in the main thread.
             future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-            return future.result(timeout=SEND_BRIDGE_TIMEOUT_SEC)
+            return future.result(timeout=timeout)
         # Called before run_polling() has started the loop (e.g. the startup
         # message in app.py, or the AppContext-init-failure error log in
         # bot.py). We're on the same (main) thread that owns this loop and
@@ -260,6 +331,9 @@ class TelegramSender(Singleton):
         self.disable_web_page_preview = self._tg_config.get(
             "disable_web_page_preview", True
         )
+        self.max_concurrent_chats = self._tg_config.get(
+            "max_concurrent_chats", MAX_CONCURRENT_CHATS
+        )
 
 
 def pretty_send(paragraphs: List[str], send: Callable[[str], None]) -> str:
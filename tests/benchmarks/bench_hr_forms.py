@@ -0,0 +1,104 @@
+"""
+Compares duplicate detection of new HR form answers rebuilding the set
+of accepted telegram logins for every answer (as before) with the running
+sets of HRFormsPipeline, on a backlog of 10k new answers.
+The sheets are not accessed, rows are plain in-memory objects.
+
+Run from the repo root: python -m tests.benchmarks.bench_hr_forms
+"""
+
+import time
+from types import SimpleNamespace
+
+from src.sheets.hr_forms_pipeline import HRFormsPipeline
+from src.utils.telegram import normalize_telegram_username
+
+EXISTING_ANSWERS = 2000
+NEW_ANSWERS = 10000
+
+
+class FormsTable(list):
+    def has_field(self, name):
+        return True
+
+    def add_one(self, item_dict):
+        row = SimpleNamespace(**item_dict)
+        self.append(row)
+        return row
+
+
+def _make_forms_raw() -> FormsTable:
+    rows = FormsTable()
+    for i in range(EXISTING_ANSWERS + NEW_ANSWERS):
+        # every 10th answer repeats an earlier login
+        login = i - 7 if i % 10 == 9 else i
+        rows.append(
+            SimpleNamespace(
+                name=f"Person {i}",
+                telegram=f"@User{login}",
+                email=f"user{i}@example.com",
+                other_contacts="",
+                status="processed" if i < EXISTING_ANSWERS else "",
+            )
+        )
+    return rows
+
+
+def _to_processed(person) -> dict:
+    return {"name": person.name, "telegram": person.telegram}
+
+
+def _process_by_rebuilding_sets(forms_raw, forms_processed):
+    # the old HRAcquisitionJob._process_raw_forms loop
+    existing_telegrams = {
+        normalize_telegram_username(p.telegram)
+        for p in forms_raw
+        if p.status and p.telegram
+    }
+    new_items = []
+    for person in [p for p in forms_raw if not p.status]:
+        if not person.telegram and not person.other_contacts:
+            person.status = "rejected"
+            continue
+        if person.telegram:
+            normalized = normalize_telegram_username(person.telegram)
+            new_telegrams = {
+                normalize_telegram_username(p.telegram) for p in new_items if p.telegram
+            }
+            if normalized in existing_telegrams or normalized in new_telegrams:
+                person.status = "double"
+                continue
+        person.status = "processed"
+        new_items.append(forms_processed.add_one(_to_processed(person)))
+    return new_items
+
+
+def _process_by_pipeline(forms_raw, forms_processed):
+    pipeline = HRFormsPipeline(
+        contact_fields=("telegram", "email"),
+        required_fields=("telegram", "other_contacts"),
+        rejected_status="rejected",
+        double_status="double",
+        processed_status="processed",
+    )
+    return pipeline.run(forms_raw, forms_processed, _to_processed)
+
+
+def main():
+    for name, process in (
+        ("rebuilding sets", _process_by_rebuilding_sets),
+        ("pipeline", _process_by_pipeline),
+    ):
+        forms_raw = _make_forms_raw()
+        start = time.perf_counter()
+        new_items = process(forms_raw, FormsTable())
+        seconds = time.perf_counter() - start
+        doubles = sum(person.status == "double" for person in forms_raw)
+        print(
+            f"{name:>15}: {seconds:.3f}s, {len(new_items)} processed, "
+            f"{doubles} doubles of {NEW_ANSWERS} new answers"
+        )
+
+
+if __name__ == "__main__":
+    main()
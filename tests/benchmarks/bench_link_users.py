@@ -0,0 +1,83 @@
+"""
+Compares linking users to team members one ORM object at a time
+(as before) with the set-based DBClient._link_users_to_team_members,
+on a synthetic team of 5k members and users.
+
+Run from the repo root: python -m tests.benchmarks.bench_link_users
+"""
+
+import time
+
+from src.db.db_client import DBClient
+from src.db.db_objects import TeamMember, User
+
+TEAM_SIZE = 5000
+
+
+def _link_users_to_team_members_by_objects(session):
+    users_by_tg_id = {
+        u.telegram_user_id: u for u in session.query(User).all() if u.telegram_user_id
+    }
+    users_by_username = {
+        u.telegram_username.lower(): u
+        for u in session.query(User).all()
+        if u.telegram_username
+    }
+    for member in session.query(TeamMember).all():
+        user = None
+        if member.telegram_id:
+            user = users_by_tg_id.get(member.telegram_id)
+        if user is None and member.telegram:
+            normalized = member.telegram.strip().lstrip("@").lower()
+            user = users_by_username.get(normalized)
+        if user:
+            if member.telegram_id is None:
+                member.telegram_id = user.telegram_user_id
+            if user.team_member_id != member.id:
+                user.team_member_id = member.id
+    session.commit()
+
+
+def _make_db_client() -> DBClient:
+    DBClient.drop_instance()
+    db_client = DBClient(db_config={"uri": "sqlite:///:memory:"})
+    session = db_client.Session()
+    session.add_all(
+        TeamMember(
+            id=str(i),
+            telegram=f"@User{i}",
+            # half of the members are already linked by telegram id
+            telegram_id=i if i % 2 else None,
+        )
+        for i in range(TEAM_SIZE)
+    )
+    session.add_all(
+        User(telegram_user_id=i, telegram_username=f"user{i}") for i in range(TEAM_SIZE)
+    )
+    session.commit()
+    session.expunge_all()
+    return db_client
+
+
+def main():
+    for name, link in (
+        (
+            "objects",
+            lambda db_client, session: _link_users_to_team_members_by_objects(session),
+        ),
+        (
+            "set-based",
+            lambda db_client, session: db_client._link_users_to_team_members(session),
+        ),
+    ):
+        db_client = _make_db_client()
+        session = db_client.Session()
+        start = time.perf_counter()
+        link(db_client, session)
+        seconds = time.perf_counter() - start
+        linked = session.query(User).filter(User.team_member_id.isnot(None)).count()
+        print(f"{name:>9}: {seconds:.3f}s, {linked}/{TEAM_SIZE} users linked")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compares per-card get_custom_fields as it used to be implemented
+(a scan over all customFieldValues per card) with get_custom_fields_bulk.
+
+Run from the repo root: python -m tests.benchmarks.bench_planka_custom_fields
+"""
+
+import time
+
+import src.planka.planka_client as planka_client_module
+from src.planka.planka_client import PlankaClient
+
+from .planka_board import CUSTOM_FIELD_NAMES, make_board
+
+BOARD_ID = "bench_board"
+
+
+def _get_custom_fields_by_scan(data: dict, card_id: str) -> dict:
+    included = data["included"]
+    name_to_id = {cf["name"]: cf["id"] for cf in included["customFields"]}
+    card_items = {
+        item["customFieldId"]: item.get("content")
+        for item in included["customFieldValues"]
+        if item.get("cardId") == card_id
+    }
+    return {name: card_items.get(name_to_id.get(name)) for name in name_to_id}
+
+
+def main():
+    planka_client_module.load = lambda string_id, **kwargs: CUSTOM_FIELD_NAMES.get(
+        string_id, string_id
+    )
+    for num_cards in (100, 1000, 10000):
+        data = make_board(BOARD_ID, num_cards)
+        card_ids = [card["id"] for card in data["included"]["cards"]]
+
+        PlankaClient.drop_instance()
+        client = PlankaClient(planka_config={"board_id": BOARD_ID})
+        client._make_request = lambda uri, payload=None: (200, data)
+
+        # the scan grows quadratically, so time a sample and extrapolate
+        sample = card_ids[: min(len(card_ids), 200)]
+        start = time.perf_counter()
+        for card_id in sample:
+            _get_custom_fields_by_scan(data, card_id)
+        scan_seconds = (time.perf_counter() - start) * len(card_ids) / len(sample)
+
+        start = time.perf_counter()
+        client.get_custom_fields_bulk(card_ids)
+        bulk_seconds = time.perf_counter() - start
+
+        print(
+            f"{num_cards:>6} cards: scan {scan_seconds:8.3f}s, "
+            f"bulk (incl. snapshot build) {bulk_seconds:8.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
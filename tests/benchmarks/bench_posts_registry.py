@@ -0,0 +1,81 @@
+"""
+Compares duplicate detection in GoogleSheetsClient.update_posts_registry:
+substring search in str() of the whole registry per entry (as before)
+and exact matches against the set of registered card urls,
+on a synthetic registry of 20k rows.
+The sheet is not accessed, only the in-memory part is measured.
+
+Run from the repo root: python -m tests.benchmarks.bench_posts_registry
+"""
+
+import time
+
+from sheetfu.modules.table import Item
+
+from src.sheets.sheets_client import GoogleSheetsClient
+from src.sheets.sheets_objects import RegistryPost
+
+REGISTRY_SIZE = 20000
+ENTRIES = 200
+
+
+class RegistryTable(list):
+    def __init__(self, header, rows):
+        super().__init__(
+            Item(index, header, values) for index, values in enumerate(rows)
+        )
+        self.header = header
+
+    def get_values(self):
+        return [self.header] + [item.values for item in self]
+
+
+def _make_registry() -> RegistryTable:
+    header = list(RegistryPost.key_title_map.values())
+    trello_column = header.index(RegistryPost.key_title_map["trello"])
+    rows = []
+    for i in range(REGISTRY_SIZE):
+        row = [f"value {i}"] * len(header)
+        row[trello_column] = f"https://trello.com/c/card{i}"
+        rows.append(row)
+    return RegistryTable(header, rows)
+
+
+def _new_urls_by_substring(registry: RegistryTable, urls):
+    # the old check, which also did one sheet read per entry
+    return [url for url in urls if url not in str(registry.get_values())]
+
+
+def _new_urls_by_set(registry: RegistryTable, urls):
+    registered_urls = GoogleSheetsClient._get_registered_urls(registry)
+    new_urls = []
+    for url in urls:
+        if url not in registered_urls:
+            registered_urls.add(url)
+            new_urls.append(url)
+    return new_urls
+
+
+def main():
+    registry = _make_registry()
+    # half registered, half new; card1 is a prefix of registered card10..card19999
+    urls = [f"https://trello.com/c/card{i * 97}" for i in range(1, ENTRIES // 2)] + [
+        f"https://trello.com/c/new{i}" for i in range(ENTRIES // 2)
+    ]
+    registry.pop(1)
+    urls.append("https://trello.com/c/card1")
+    for name, find_new in (
+        ("substring", _new_urls_by_substring),
+        ("set", _new_urls_by_set),
+    ):
+        start = time.perf_counter()
+        new_urls = find_new(registry, urls)
+        seconds = time.perf_counter() - start
+        print(
+            f"{name:>9}: {seconds:.3f}s, {len(new_urls)}/{len(urls)} new, "
+            f"prefix card found new: {'https://trello.com/c/card1' in new_urls}"
+        )
+
+
+if __name__ == "__main__":
+    main()
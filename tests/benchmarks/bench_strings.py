@@ -0,0 +1,48 @@
+"""
+Compares strings.load served from the in-memory catalog
+with the previous implementation doing one SELECT per call.
+
+Run from the repo root: python -m tests.benchmarks.bench_strings
+"""
+
+import timeit
+from collections import defaultdict
+
+from src.strings import DBString, StringsDBClient, load
+
+NUM_STRINGS = 500
+CALLS = 20000
+
+
+def _load_from_db(string_id: str, **kwargs) -> str:
+    session = StringsDBClient().Session()
+    message = session.query(DBString).filter(DBString.id == string_id).first()
+    value = message.value if message else f"<{string_id}>"
+    return value.format_map(defaultdict(lambda: "?", kwargs)).strip()
+
+
+def main():
+    client = StringsDBClient(strings_db_config={"uri": "sqlite:///:memory:"})
+    session = client.Session()
+    session.add_all(
+        DBString(f"string_{i}", f"Card {{name}} is due {{date}} ({i})")
+        for i in range(NUM_STRINGS)
+    )
+    session.commit()
+    client.reload_catalog()
+
+    string_ids = [f"string_{i % NUM_STRINGS}" for i in range(CALLS)]
+    kwargs = {"name": "Some card", "date": "01.01.2026"}
+
+    for name, func in (("db", _load_from_db), ("catalog", load)):
+        seconds = timeit.timeit(
+            lambda: [func(string_id, **kwargs) for string_id in string_ids], number=1
+        )
+        print(
+            f"{name:>8}: {CALLS} calls in {seconds:.3f}s, "
+            f"{seconds / CALLS * 1e6:.1f}us/call"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compares team member lookups scanning the whole team table in Python
+(as before the *_norm columns), indexed SELECTs on the *_norm columns
+and the in-memory identity resolver used by DBClient.find_* methods.
+
+Run from the repo root: python -m tests.benchmarks.bench_team_lookup
+"""
+
+import time
+
+from sqlalchemy import or_
+
+from src.db.db_client import DBClient
+from src.db.db_objects import TeamMember, normalize_identity
+from src.utils.telegram import normalize_telegram_username
+
+LOOKUPS = 200
+
+
+def _find_author_telegram_by_scan(db_client: DBClient, trello_id: str):
+    normalized = normalize_telegram_username(trello_id)
+    members = db_client.Session().query(TeamMember).all()
+    member = next(
+        (
+            m
+            for m in members
+            if normalize_telegram_username(m.trello) == normalized
+            or normalize_telegram_username(m.focalboard) == normalized
+        ),
+        None,
+    )
+    return member.telegram if member else None
+
+
+def _find_author_telegram_by_index(db_client: DBClient, trello_id: str):
+    normalized = normalize_identity(trello_id)
+    member = (
+        db_client.Session()
+        .query(TeamMember)
+        .filter(
+            or_(
+                TeamMember.trello_norm == normalized,
+                TeamMember.focalboard_norm == normalized,
+            )
+        )
+        .first()
+    )
+    return member.telegram if member else None
+
+
+def main():
+    for team_size in (100, 1000, 10000):
+        DBClient.drop_instance()
+        db_client = DBClient(db_config={"uri": "sqlite:///:memory:"})
+        session = db_client.Session()
+        session.add_all(
+            TeamMember(
+                id=str(i),
+                telegram=f"@Telegram{i}",
+                trello=f"@Trello{i}",
+                focalboard=f"@Focalboard{i}",
+            )
+            for i in range(team_size)
+        )
+        session.commit()
+        session.expunge_all()
+        trello_ids = [f"@trello{i * team_size // LOOKUPS}" for i in range(LOOKUPS)]
+
+        results = {}
+        for name, func in (
+            (
+                "scan",
+                lambda trello_id: _find_author_telegram_by_scan(db_client, trello_id),
+            ),
+            (
+                "indexed",
+                lambda trello_id: _find_author_telegram_by_index(db_client, trello_id),
+            ),
+            ("resolver", db_client.find_author_telegram_by_trello),
+        ):
+            start = time.perf_counter()
+            results[name] = [func(trello_id) for trello_id in trello_ids]
+            seconds = time.perf_counter() - start
+            print(
+                f"{team_size:>6} members, {name:>8}: "
+                f"{seconds / LOOKUPS * 1e3:8.3f}ms/lookup"
+            )
+        assert results["scan"] == results["indexed"] == results["resolver"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Synthetic Planka board payloads, shaped like tests/unit/static/planka"""
+
+CUSTOM_FIELD_NAMES = {
+    "trello_custom_field__post_title": "Название поста",
+    "trello_custom_field__author": "Автор",
+    "trello_custom_field__editor": "Редактор",
+    "trello_custom_field__illustrator": "Иллюстратор",
+    "trello_custom_field__cover": "Обложка",
+    "trello_custom_field__google_doc": "Google Doc",
+}
+
+
+def make_board(board_id: str, num_cards: int, num_lists: int = 10) -> dict:
+    users = [
+        {"id": f"user_{i}", "name": f"User {i}", "username": f"user{i}"}
+        for i in range(50)
+    ]
+    lists = [
+        {
+            "id": f"list_{i}",
+            "boardId": board_id,
+            "type": "active",
+            "position": 65536 * (num_lists - i),
+            "name": f"List {i}",
+        }
+        for i in range(num_lists)
+    ]
+    labels = [{"id": f"label_{i}", "name": f"Label {i}"} for i in range(20)]
+    custom_fields = [
+        {"id": f"cf_{i}", "name": name, "customFieldGroupId": "cf_group"}
+        for i, name in enumerate(CUSTOM_FIELD_NAMES.values())
+    ]
+    cards, card_labels, card_memberships, custom_field_values = [], [], [], []
+    for i in range(num_cards):
+        card_id = f"card_{i}"
+        cards.append(
+            {
+                "id": card_id,
+                "listId": f"list_{i % num_lists}",
+                "name": f"Card {i}",
+                "dueDate": "2026-05-09T10:15:00.000Z",
+            }
+        )
+        card_labels.append({"cardId": card_id, "labelId": f"label_{i % 20}"})
+        card_memberships.append({"cardId": card_id, "userId": f"user_{i % 50}"})
+        for custom_field in custom_fields:
+            custom_field_values.append(
+                {
+                    "cardId": card_id,
+                    "customFieldGroupId": "cf_group",
+                    "customFieldId": custom_field["id"],
+                    "content": f"{custom_field['name']} {i}",
+                }
+            )
+    return {
+        "item": {"id": board_id, "name": f"Board {board_id}"},
+        "included": {
+            "users": users,
+            "boardMemberships": [
+                {"boardId": board_id, "userId": user["id"]} for user in users
+            ],
+            "labels": labels,
+            "lists": lists,
+            "cards": cards,
+            "cardMemberships": card_memberships,
+            "cardLabels": card_labels,
+            "customFields": custom_fields,
+            "customFieldValues": custom_field_values,
+        },
+    }
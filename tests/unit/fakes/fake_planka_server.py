@@ -0,0 +1,170 @@
+import copy
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakePlankaServer:
+    """
+    Minimal Planka API over HTTP on localhost, backed by board payloads
+    in the same format as tests/unit/static/planka. Card changes made
+    through its helpers are recorded as board actions, like Planka does.
+    """
+
+    def __init__(self, projects: dict, boards: dict):
+        self.projects = copy.deepcopy(projects)
+        self.boards = copy.deepcopy(boards)
+        self.actions = {board_id: [] for board_id in boards}
+        self.requests = []
+        # path -> status code to answer with instead of the payload
+        self.failures = {}
+        self.actions_page_size = 50
+        self._clock = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_action(self, board_id: str, action_type: str, card_id: str = None):
+        with self._lock:
+            self.actions[board_id].insert(
+                0,
+                {
+                    "id": f"action_{self._clock}",
+                    "boardId": board_id,
+                    "cardId": card_id,
+                    "type": action_type,
+                    "createdAt": self._tick(),
+                },
+            )
+
+    def move_card(self, board_id: str, card_id: str, list_id: str):
+        card = self._find_card(board_id, card_id)
+        card["listId"] = list_id
+        card["updatedAt"] = self._tick()
+        self.add_action(board_id, "moveCard", card_id)
+
+    def create_card(self, board_id: str, card: dict):
+        card = dict(card, boardId=board_id, updatedAt=self._tick())
+        self.boards[board_id]["included"]["cards"].append(card)
+        self.add_action(board_id, "createCard", card["id"])
+
+    def update_card(self, board_id: str, card_id: str, **fields):
+        # card edits like renames are not recorded as actions
+        card = self._find_card(board_id, card_id)
+        card.update(fields, updatedAt=self._tick())
+
+    def set_custom_field_value(
+        self, board_id: str, card_id: str, custom_field_id: str, content: str
+    ):
+        # neither an action nor a card updatedAt change
+        values = self.boards[board_id]["included"].setdefault("customFieldValues", [])
+        values[:] = [
+            value
+            for value in values
+            if (value["cardId"], value["customFieldId"]) != (card_id, custom_field_id)
+        ]
+        values.append(
+            {
+                "id": f"{card_id}_{custom_field_id}",
+                "cardId": card_id,
+                "customFieldId": custom_field_id,
+                "content": content,
+                "updatedAt": self._tick(),
+            }
+        )
+
+    def delete_card(self, board_id: str, card_id: str):
+        included = self.boards[board_id]["included"]
+        included["cards"] = [
+            card for card in included["cards"] if card["id"] != card_id
+        ]
+
+    def add_member_to_card(self, board_id: str, card_id: str, user_id: str):
+        self.boards[board_id]["included"]["cardMemberships"].append(
+            {"id": f"{card_id}_{user_id}", "cardId": card_id, "userId": user_id}
+        )
+        self.add_action(board_id, "addMemberToCard", card_id)
+
+    def _find_card(self, board_id: str, card_id: str) -> dict:
+        for card in self.boards[board_id]["included"]["cards"]:
+            if card["id"] == card_id:
+                return card
+        raise KeyError(card_id)
+
+    def _tick(self) -> str:
+        self._clock += 1
+        return f"2026-06-01T00:00:{self._clock:02d}.000Z"
+
+    def _route(self, path: str):
+        if path in self.failures:
+            return self.failures[path], {"code": "E_FAILED"}
+        if path == "/api/projects":
+            return 200, self.projects
+        match = re.fullmatch(r"/api/boards/([^/]+)/actions", path)
+        if match:
+            actions = self.actions.get(match.group(1), [])
+            return 200, {"items": actions[: self.actions_page_size]}
+        match = re.fullmatch(r"/api/boards/([^/]+)", path)
+        if match and match.group(1) in self.boards:
+            return 200, self.boards[match.group(1)]
+        match = re.fullmatch(r"/api/cards/([^/]+)", path)
+        if match:
+            return self._card_payload(match.group(1))
+        return 404, {"code": "E_NOT_FOUND"}
+
+    def _card_payload(self, card_id: str):
+        for board in self.boards.values():
+            for card in board["included"]["cards"]:
+                if card["id"] == card_id:
+                    return 200, {
+                        "item": card,
+                        "included": self._cards_included(board, {card_id}),
+                    }
+        return 404, {"code": "E_NOT_FOUND"}
+
+    @staticmethod
+    def _cards_included(board: dict, card_ids: set) -> dict:
+        return {
+            collection: [
+                item
+                for item in board["included"].get(collection, [])
+                if item.get("cardId") in card_ids
+            ]
+            for collection in ("cardMemberships", "cardLabels", "customFieldValues")
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                with server._lock:
+                    server.requests.append(path)
+                    status, payload = server._route(path)
+                    body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
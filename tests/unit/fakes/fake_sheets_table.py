@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from sheetfu.modules.table import Item
+
+
+class FakeSheetsTable:
+    """In-memory stand-in for sheetfu Table, batches requests like the real one"""
+
+    def __init__(self, header, rows):
+        self.header = header
+        self.items = [
+            Item(index, header, values, parent_table=self)
+            for index, values in enumerate(rows)
+        ]
+        self.items_range = SimpleNamespace(
+            coordinates=SimpleNamespace(
+                row=2, column=1, number_of_columns=len(header), sheet_name="Sheet"
+            )
+        )
+        self.full_range = SimpleNamespace(
+            client=None, sheet=SimpleNamespace(sid=0, name="Sheet")
+        )
+        self.batches = []
+        self.commits = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add_one(self, item_dict):
+        item = Item(
+            len(self.items),
+            self.header,
+            [item_dict.get(title) for title in self.header],
+            parent_table=self,
+        )
+        self.items.append(item)
+        return item
+
+    def commit(self):
+        self.commits += 1
@@ -0,0 +1,21 @@
+from src.tg.access_rights import AccessRights
+
+
+def test_admins_match_by_id_or_normalized_login():
+    access_rights = AccessRights([123, "@AdminLogin", "other_admin"], [])
+
+    assert access_rights.is_admin(123, None)
+    assert access_rights.is_admin(1, "adminlogin")
+    assert access_rights.is_admin(1, "Other_Admin")
+    assert not access_rights.is_admin(1, "someone")
+    assert not access_rights.is_admin(None, None)
+
+
+def test_managers_are_normalized_curator_logins():
+    access_rights = AccessRights([], ["@Curator", " @second ", "", None])
+
+    assert access_rights.manager_logins == {"curator", "second"}
+    assert access_rights.is_manager("CURATOR")
+    assert access_rights.is_manager("@second")
+    assert not access_rights.is_manager("")
+    assert not access_rights.is_manager(None)
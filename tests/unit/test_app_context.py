@@ -0,0 +1,89 @@
+import threading
+import time
+
+from src.app_context import _fetch_concurrently
+
+
+def test_fetch_concurrently_runs_fetchers_in_parallel():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _fetch(name):
+        def fetch():
+            # passes only when all fetchers run at the same time
+            barrier.wait()
+            return f"{name} table"
+
+        return fetch
+
+    results, durations = _fetch_concurrently(
+        {name: _fetch(name) for name in ("strings", "curators", "team")},
+        workers=4,
+        timeout_sec=5,
+    )
+
+    assert results == {
+        "strings": "strings table",
+        "curators": "curators table",
+        "team": "team table",
+    }
+    assert set(durations) == set(results)
+
+
+def test_fetch_concurrently_skips_failed_and_timed_out_fetchers():
+    release = threading.Event()
+
+    def _fail():
+        raise ConnectionError("sheets are down")
+
+    def _hang():
+        release.wait(5)
+        return "late table"
+
+    start = time.monotonic()
+    try:
+        results, _ = _fetch_concurrently(
+            {"strings": lambda: "strings table", "team": _fail, "rubrics": _hang},
+            workers=2,
+            timeout_sec=0.2,
+        )
+    finally:
+        release.set()
+
+    assert results == {"strings": "strings table"}
+    assert time.monotonic() - start < 2
+
+
+def test_fetch_concurrently_times_queued_fetchers_from_their_start():
+    def _slow_fetch():
+        time.sleep(0.15)
+        return "table"
+
+    results, durations = _fetch_concurrently(
+        {"strings": _slow_fetch, "curators": _slow_fetch, "team": _slow_fetch},
+        workers=1,
+        timeout_sec=0.3,
+    )
+
+    assert results == {"strings": "table", "curators": "table", "team": "table"}
+    assert all(duration < 0.3 for duration in durations.values())
+
+
+def test_fetch_concurrently_drops_queued_fetchers_without_free_workers():
+    release = threading.Event()
+
+    def _hang():
+        release.wait(5)
+        return "late table"
+
+    start = time.monotonic()
+    try:
+        results, _ = _fetch_concurrently(
+            {"strings": _hang, "team": lambda: "team table"},
+            workers=1,
+            timeout_sec=0.2,
+        )
+    finally:
+        release.set()
+
+    assert results == {}
+    assert time.monotonic() - start < 2
@@ -1,7 +1,12 @@
+from datetime import timedelta
+
 import pytest
+from sqlalchemy import create_engine, inspect, text
+from utils.query_counter import assert_max_queries
 
 from src.db.db_client import DBClient
-from src.db.db_objects import TeamMember
+from src.db.db_objects import Chat, Reminder, TeamMember, User
+from src.strings import load
 
 
 @pytest.fixture(autouse=True)
@@ -49,3 +54,252 @@ def test_find_author_telegram_by_trello_reads_team_members(mock_db_client):
         mock_db_client.find_author_telegram_by_trello("@focalboarduser")
         == "@FocalboardTelegram"
     )
+
+
+def test_team_member_lookups_use_normalized_columns(mock_db_client):
+    session = mock_db_client.Session()
+    session.add(
+        TeamMember(
+            id="1",
+            telegram=" @SomeTelegram",
+            focalboard="@SomeFocalboard ",
+            telegram_id=42,
+        )
+    )
+    session.add(TeamMember(id="2", telegram="", focalboard=None))
+    session.commit()
+
+    member = session.query(TeamMember).filter(TeamMember.id == "1").one()
+    assert member.telegram_norm == "sometelegram"
+    assert member.focalboard_norm == "somefocalboard"
+    assert member.trello_norm is None
+    assert (
+        mock_db_client.find_focalboard_username_by_telegram_username("@sometelegram")
+        == "@SomeFocalboard "
+    )
+    assert (
+        mock_db_client.find_telegram_id_by_focalboard_username("SOMEFOCALBOARD") == 42
+    )
+    assert mock_db_client.find_focalboard_username_by_telegram_username("@") is None
+
+
+def test_old_team_table_gets_normalized_columns(tmp_path):
+    db_uri = f"sqlite:///{tmp_path / 'old.sqlite'}"
+    engine = create_engine(db_uri)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE team (id VARCHAR PRIMARY KEY, name VARCHAR, "
+                "status VARCHAR, curator VARCHAR, manager VARCHAR, "
+                "telegram VARCHAR, trello VARCHAR, focalboard VARCHAR)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO team (id, telegram, trello) "
+                "VALUES ('1', '@OldTelegram', '@OldTrello')"
+            )
+        )
+    engine.dispose()
+
+    db_client = DBClient(db_config={"uri": db_uri})
+
+    column_names = {
+        column["name"] for column in inspect(db_client.engine).get_columns("team")
+    }
+    assert {"telegram_id", "telegram_norm", "trello_norm"} <= column_names
+    assert db_client.find_author_telegram_by_trello("oldtrello") == "@OldTelegram"
+
+
+class FakeSheetItem:
+    def __init__(self, **values):
+        self.values = values
+
+    def get_field_value(self, field_name):
+        return self.values.get(field_name)
+
+
+def test_identity_resolver_is_rebuilt_after_sheet_sync(
+    mock_db_client, mock_sheets_client, mock_strings_db_client, monkeypatch
+):
+    session = mock_db_client.Session()
+    session.add(TeamMember(id="1", telegram="@Member", focalboard="@MemberBoard"))
+    session.commit()
+
+    resolver = mock_db_client.get_identity_resolver()
+    assert mock_db_client.get_identity_resolver() is resolver
+    assert mock_db_client.find_focalboard_username_by_telegram_username("member") == (
+        "@MemberBoard"
+    )
+    assert mock_db_client.find_team_member_id_by_telegram_username("@MEMBER") == "1"
+    assert not resolver.is_curator("curator")
+    assert mock_db_client.get_identity_resolver_stats() == {
+        "generation": resolver.generation,
+        "hits": 2,
+        "misses": 1,
+        "builds": 1,
+    }
+
+    monkeypatch.setattr(
+        mock_sheets_client,
+        "fetch_curators",
+        lambda: [
+            FakeSheetItem(
+                **{
+                    load("sheets__name"): "Curator",
+                    load("sheets__role"): "Curator NLP",
+                    load("sheets__telegram"): "@Curator",
+                }
+            )
+        ],
+    )
+    assert mock_db_client.fetch_curators_sheet(mock_sheets_client) == 1
+
+    new_resolver = mock_db_client.get_identity_resolver()
+    assert new_resolver is not resolver
+    assert new_resolver.generation > resolver.generation
+    assert new_resolver.is_curator("curator")
+    assert mock_db_client.get_identity_resolver_stats()["builds"] == 2
+
+
+def test_fetch_team_sheet_updates_changed_members_only(
+    mock_db_client, mock_sheets_client, mock_strings_db_client, monkeypatch
+):
+    session = mock_db_client.Session()
+    session.add_all(
+        [
+            TeamMember(id="1", telegram="@Same", telegram_id=1),
+            TeamMember(id="2", telegram="@Before", telegram_id=2),
+            TeamMember(id="3", telegram="@Removed", telegram_id=3),
+        ]
+    )
+    session.commit()
+
+    def _member(member_id, telegram):
+        return FakeSheetItem(
+            **{
+                load("sheets__team__id"): member_id,
+                load("sheets__team__telegram"): telegram,
+            }
+        )
+
+    monkeypatch.setattr(
+        mock_sheets_client,
+        "fetch_hr_team",
+        lambda: [_member("1", "@Same"), _member("2", "@After"), _member("4", "@New")],
+    )
+    assert mock_db_client.fetch_team_sheet(mock_sheets_client) == 3
+
+    members = {
+        member.id: (member.telegram_norm, member.telegram_id)
+        for member in mock_db_client.get_all_members()
+    }
+    # telegram id is kept for the unchanged login only
+    assert members == {
+        "1": ("same", 1),
+        "2": ("after", None),
+        "4": ("new", None),
+    }
+    assert mock_db_client.find_team_member_id_by_telegram_username("@new") == "4"
+
+
+def test_link_users_to_team_members(mock_db_client):
+    session = mock_db_client.Session()
+    session.add_all(
+        [
+            TeamMember(id="by_login", telegram="@LoginUser"),
+            TeamMember(id="by_id", telegram="@renamed", telegram_id=20),
+            TeamMember(id="unknown", telegram="@nobody"),
+            User(telegram_user_id=10, telegram_username="loginuser"),
+            User(telegram_user_id=20, telegram_username="old_name"),
+        ]
+    )
+    session.commit()
+
+    mock_db_client._link_users_to_team_members(session)
+
+    members = {m.id: m.telegram_id for m in mock_db_client.get_all_members()}
+    assert members == {"by_login": 10, "by_id": 20, "unknown": None}
+    assert mock_db_client.get_user_by_telegram_id(10).team_member_id == "by_login"
+    assert mock_db_client.get_user_by_telegram_id(20).team_member_id == "by_id"
+
+
+def test_update_config_rebuilds_engine_only_on_change(tmp_path):
+    db_config = {"uri": f"sqlite:///{tmp_path / 'first.sqlite'}"}
+    db_client = DBClient(db_config=db_config)
+    engine = db_client.engine
+
+    db_client.update_config(dict(db_config))
+    assert db_client.engine is engine
+
+    db_client.update_config({"uri": f"sqlite:///{tmp_path / 'second.sqlite'}"})
+    assert db_client.engine is not engine
+    assert (tmp_path / "second.sqlite").exists()
+    assert db_client.get_all_members() == []
+
+
+def test_get_reminders_to_send_claims_due_reminders(mock_db_client):
+    now = DBClient._get_now_msk_naive()
+    session = mock_db_client.Session()
+    session.add_all(
+        [
+            Reminder(id=1, name="due", next_reminder_datetime=now, frequency_days=7),
+            Reminder(
+                id=2,
+                name="lagging",
+                next_reminder_datetime=now - timedelta(hours=4),
+                frequency_days=1,
+            ),
+            Reminder(
+                id=3,
+                name="later",
+                next_reminder_datetime=now + timedelta(hours=1),
+                frequency_days=7,
+            ),
+        ]
+    )
+    session.commit()
+    changes = []
+    mock_db_client.add_reminder_listener(lambda *change: changes.append(change))
+
+    reminders = mock_db_client.get_reminders_to_send()
+
+    assert [reminder.name for reminder in reminders] == ["due"]
+    assert sorted(changes) == [
+        (1, now + timedelta(days=7)),
+        (2, now - timedelta(hours=4) + timedelta(days=1)),
+    ]
+    assert dict(mock_db_client.get_reminder_times()) == {
+        1: now + timedelta(days=7),
+        2: now + timedelta(hours=20),
+        3: now + timedelta(hours=1),
+    }
+    assert mock_db_client.get_reminders_to_send() == []
+
+    mock_db_client.delete_reminder(3)
+    assert changes[-1] == (3, None)
+
+
+def test_reminders_and_chats_are_loaded_in_constant_queries(mock_db_client):
+    session = mock_db_client.Session()
+    session.add_all([Chat(id=-i, title=f"chat {i}") for i in range(1, 6)])
+    session.add_all(
+        [
+            Reminder(id=i, group_chat_id=-i, creator_chat_id=1, name=f"r{i}")
+            for i in range(1, 6)
+        ]
+    )
+    session.commit()
+
+    with assert_max_queries(mock_db_client.engine, 3):
+        reminders = mock_db_client.get_reminders_by_user_id(1)
+        chat_names = mock_db_client.get_chat_names([-1, -2, 100])
+        chats = mock_db_client.get_all_chats()
+        # a commit in the scoped session doesn't expire loaded objects
+        mock_db_client.Session().commit()
+        descriptions = [(reminder.name, chat.title) for reminder, chat in reminders]
+        titles = [chat.title for chat in chats]
+
+    assert sorted(descriptions) == [(f"r{i}", f"chat {i}") for i in range(1, 6)]
+    assert chat_names == {-1: "chat 1", -2: "chat 2"}
+    assert len(titles) == 5
@@ -0,0 +1,65 @@
+import threading
+
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from src.db.engine import create_db_engine
+
+
+def _pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.execute(f"PRAGMA {name}").scalar()
+
+
+def test_file_sqlite_gets_profile(tmp_path):
+    engine = create_db_engine({"uri": f"sqlite:///{tmp_path / 'db.sqlite'}"})
+
+    assert isinstance(engine.pool, NullPool)
+    assert _pragma(engine, "journal_mode") == "wal"
+    # NORMAL
+    assert _pragma(engine, "synchronous") == 1
+    assert _pragma(engine, "busy_timeout") == 5000
+
+
+def test_sqlite_profile_can_be_overridden(tmp_path):
+    engine = create_db_engine(
+        {
+            "uri": f"sqlite:///{tmp_path / 'db.sqlite'}",
+            "sqlite": {"journal_mode": "delete", "busy_timeout_ms": 100},
+        }
+    )
+
+    assert _pragma(engine, "journal_mode") == "delete"
+    assert _pragma(engine, "busy_timeout") == 100
+
+
+def test_memory_sqlite_keeps_default_pool():
+    engine = create_db_engine({"uri": "sqlite:///:memory:"})
+
+    assert not isinstance(engine.pool, NullPool)
+    assert _pragma(engine, "journal_mode") == "memory"
+
+
+def test_threads_holding_sessions_dont_exhaust_connections(tmp_path):
+    engine = create_db_engine({"uri": f"sqlite:///{tmp_path / 'db.sqlite'}"})
+    # like DBClient.Session: thread-local, never closed after reads
+    Session = scoped_session(sessionmaker(bind=engine))
+    threads_count = 30
+    barrier = threading.Barrier(threads_count, timeout=5)
+    errors = []
+
+    def read():
+        try:
+            Session().execute("SELECT 1").scalar()
+            # every thread keeps its connection while the others read
+            barrier.wait()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert errors == []
@@ -1,5 +1,9 @@
 import pytest
+from fakes.fake_sheets_table import FakeSheetsTable
 
+from src.sheets import sheets_objects
+from src.sheets.hr_forms_pipeline import HRFormsPipeline
+from src.sheets.sheets_objects import HRPersonProcessed, HRPersonRaw, SheetsTable
 from src.utils.telegram import normalize_telegram_username
 
 
@@ -13,3 +17,108 @@ from src.utils.telegram import normalize_telegram_username
 )
 def test_normalize_telegram_username_handles_sheet_values(raw_telegram, expected):
     assert normalize_telegram_username(raw_telegram) == expected
+
+
+RAW_HEADER = [
+    "sheets__hr__raw__timestamp",
+    "sheets__hr__raw__name",
+    "sheets__hr__raw__other_contacts",
+    "sheets__hr__raw__email",
+    "sheets__hr__raw__telegram",
+    "sheets__hr__raw__status",
+]
+PROCESSED_HEADER = [
+    "sheets__hr__processed__id",
+    "sheets__hr__processed__name",
+    "sheets__hr__processed__telegram",
+    "sheets__hr__processed__status",
+]
+
+
+@pytest.fixture
+def string_ids(monkeypatch):
+    # strings are not loaded in tests, use string ids as sheet titles
+    monkeypatch.setattr(sheets_objects, "load", lambda string_id, **kwargs: string_id)
+
+
+def _hr_acquisition_pipeline():
+    # configured as in HRAcquisitionJob
+    return HRFormsPipeline(
+        contact_fields=("telegram", "email"),
+        required_fields=("telegram", "other_contacts"),
+        rejected_status="rejected",
+        double_status="double",
+        processed_status="processed",
+    )
+
+
+def _answer(name, telegram="", email="", other_contacts="", status=""):
+    return [44000.5, name, other_contacts, email, telegram, status]
+
+
+def test_hr_forms_pipeline_marks_rejected_doubles_and_processed(string_ids):
+    forms_raw = SheetsTable(
+        FakeSheetsTable(
+            RAW_HEADER,
+            [
+                _answer("Old", telegram="@Old", email="old@example.com", status="done"),
+                _answer("Old again", telegram="old"),
+                _answer("Old email", telegram="@other", email=" OLD@example.com"),
+                _answer("No contacts"),
+                _answer("New", telegram="@New"),
+                _answer("New again", telegram="@new "),
+                _answer("Contacts only", other_contacts="vk.com/someone"),
+            ],
+        ),
+        HRPersonRaw,
+    )
+    forms_processed = SheetsTable(
+        FakeSheetsTable(PROCESSED_HEADER, []), HRPersonProcessed
+    )
+
+    new_items = _hr_acquisition_pipeline().run(
+        forms_raw,
+        forms_processed,
+        lambda person: {
+            "id": len(forms_processed) + 2,
+            "name": person.name,
+            "telegram": person.telegram,
+        },
+    )
+
+    assert [person.status for person in forms_raw] == [
+        "done",
+        "double",
+        "double",
+        "rejected",
+        "processed",
+        "double",
+        "processed",
+    ]
+    assert [(item.id, item.name, item.telegram) for item in new_items] == [
+        (2, "New", "@New"),
+        (3, "Contacts only", ""),
+    ]
+
+
+def test_hr_forms_pipeline_skips_contact_fields_missing_in_sheet(string_ids):
+    header = [title for title in RAW_HEADER if title != "sheets__hr__raw__email"]
+    forms_raw = SheetsTable(
+        FakeSheetsTable(
+            header,
+            [
+                [44000.5, "First", "", "@first", ""],
+                [44000.5, "Second", "", "@first", ""],
+            ],
+        ),
+        HRPersonRaw,
+    )
+    forms_processed = SheetsTable(
+        FakeSheetsTable(PROCESSED_HEADER, []), HRPersonProcessed
+    )
+    new_items = _hr_acquisition_pipeline().run(
+        forms_raw, forms_processed, lambda person: {"name": person.name}
+    )
+
+    assert [item.name for item in new_items] == ["First"]
+    assert [person.status for person in forms_raw] == ["processed", "double"]
@@ -1,12 +1,21 @@
+import gc
 import os
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from types import SimpleNamespace
 
 import pytest
 from conftest import STATIC_TEST_DIR
 from utils.json_loader import JsonLoader
 
 from src.consts import TrelloCardColor
+import src.planka.planka_client as planka_client_module
+from src.planka.board_snapshot import BoardSnapshot
 from src.planka.planka_client import PlankaClient
+from src.planka.snapshot_store import SnapshotStore
 
 PLANKA_TEST_DIR = os.path.join(STATIC_TEST_DIR, "planka")
 
@@ -153,3 +162,311 @@ def test_board_details_are_cached_for_current_job_loop(mock_planka):
     mock_planka.get_cards("list_second")
 
     assert mock_planka.requests.count("boards/board_razvitie") == 1
+
+
+def test_unsorted_lists_keep_payload_order(mock_planka):
+    lists = mock_planka.get_lists()
+
+    assert [item.id for item in lists] == ["list_second", "list_first"]
+
+
+def test_members_are_read_from_board_memberships(mock_planka):
+    members = mock_planka.get_members("board_private")
+
+    assert [(member.id, member.username) for member in members] == [
+        ("user_other", "other")
+    ]
+
+
+def test_board_snapshot_is_shared_between_getters(mock_planka):
+    mock_planka.get_lists()
+    mock_planka.get_labels()
+    mock_planka.get_members("board_razvitie")
+    mock_planka.get_list("board_razvitie", "list_first")
+
+    assert mock_planka.requests == ["boards/board_razvitie"]
+    snapshot = mock_planka._board_cache["board_razvitie"]
+    assert isinstance(snapshot, BoardSnapshot)
+    assert [card["id"] for card in snapshot.get_cards()] == [
+        "card_planka",
+        "card_tests",
+    ]
+
+
+@pytest.fixture
+def mock_planka_custom_fields(monkeypatch, mock_planka):
+    board = JsonLoader(PLANKA_TEST_DIR).load_json("board_razvitie.json")
+    board["included"]["customFields"] = [
+        {"id": "cf_title", "name": "Title", "customFieldGroupId": "group"},
+        {"id": "cf_author", "name": "Author", "customFieldGroupId": "group"},
+    ]
+    board["included"]["customFieldValues"] = [
+        {"cardId": "card_planka", "customFieldId": "cf_title", "content": "Post"},
+        {"cardId": "card_planka", "customFieldId": "cf_author", "content": "a, b"},
+        {"cardId": "card_tests", "customFieldId": "cf_author", "content": "c"},
+    ]
+    field_names = {
+        "trello_custom_field__post_title": "Title",
+        "trello_custom_field__author": "Author",
+    }
+    monkeypatch.setattr(
+        planka_client_module,
+        "load",
+        lambda string_id, **kwargs: field_names.get(string_id, string_id),
+    )
+    monkeypatch.setattr(
+        mock_planka, "_make_request", lambda uri, payload=None: (200, board)
+    )
+    return mock_planka
+
+
+def test_custom_fields_bulk(mock_planka_custom_fields):
+    fields = mock_planka_custom_fields.get_custom_fields_bulk(
+        ["card_planka", "card_tests", "card_unknown"]
+    )
+
+    assert fields["card_planka"].title == "Post"
+    assert fields["card_planka"].authors == ["a", "b"]
+    assert fields["card_tests"].title is None
+    assert fields["card_tests"].authors == ["c"]
+    assert fields["card_unknown"].authors == []
+
+
+def test_custom_fields_single_card_matches_bulk(mock_planka_custom_fields):
+    card_fields = mock_planka_custom_fields.get_custom_fields("card_planka")
+
+    assert card_fields.title == "Post"
+    assert card_fields.authors == ["a", "b"]
+    assert card_fields.editors == []
+
+
+def test_requests_go_through_pooled_session(monkeypatch, planka_config):
+    client = PlankaClient(planka_config=dict(planka_config, read_timeout=7))
+    calls = []
+
+    class FakeResponse:
+        ok = True
+        status_code = 200
+        url = "https://planka.example.com/api/boards/1"
+
+        def json(self):
+            return {"item": {}}
+
+    def _request(method, url, **kwargs):
+        calls.append((method, url, kwargs["timeout"]))
+        return FakeResponse()
+
+    monkeypatch.setattr(client._session, "request", _request)
+
+    assert client._make_request("boards/1") == (200, {"item": {}})
+    assert client._make_request("boards/2") == (200, {"item": {}})
+    assert calls[0] == ("GET", "https://planka.example.com/api/boards/1", (5, 7))
+    assert client._session.headers["X-Api-Key"] == "stub-api-key"
+    stats = client.request_stats.snapshot()
+    assert list(stats) == ["boards"]
+    assert stats["boards"]["count"] == 2
+    assert stats["boards"]["errors"] == 0
+
+
+def test_boards_for_telegram_user_fetches_boards_concurrently(monkeypatch, mock_planka):
+    original_make_request = PlankaClient._make_request
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def _slow_make_request(self, uri, payload=None):
+        with lock:
+            in_flight.append(uri)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.05)
+        with lock:
+            in_flight.remove(uri)
+        return original_make_request(self, uri, payload)
+
+    monkeypatch.setattr(PlankaClient, "_make_request", _slow_make_request)
+
+    boards = mock_planka.get_boards_for_telegram_user("tg_user", FakeDBClient("@other"))
+
+    assert [board.id for board in boards] == ["board_razvitie", "board_private"]
+    assert max(max_in_flight) == 2
+
+
+def test_concurrent_board_misses_share_one_fetch(monkeypatch, mock_planka):
+    original_make_request = PlankaClient._make_request
+
+    def _slow_make_request(self, uri, payload=None):
+        time.sleep(0.05)
+        return original_make_request(self, uri, payload)
+
+    monkeypatch.setattr(PlankaClient, "_make_request", _slow_make_request)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda _: mock_planka.get_lists("board_razvitie"), range(8))
+        )
+
+    assert all(len(lists) == 2 for lists in results)
+    assert mock_planka.requests == ["boards/board_razvitie"]
+
+
+def test_boards_for_telegram_user_reuses_membership_index(mock_planka):
+    db_client = FakeDBClient("@Other")
+    first = mock_planka.get_boards_for_telegram_user("tg_user", db_client)
+    requests_after_first_call = list(mock_planka.requests)
+    second = mock_planka.get_boards_for_telegram_user("tg_user", db_client)
+
+    assert [board.id for board in first] == ["board_razvitie", "board_private"]
+    assert [board.id for board in second] == ["board_razvitie", "board_private"]
+    assert mock_planka.requests == requests_after_first_call
+    stats = mock_planka.get_membership_index_stats()
+    assert stats["refresh_count"] == 1
+    assert stats["users"] == 2
+    assert stats["boards"] == 2
+
+
+def test_stale_membership_index_is_refreshed_in_background(monkeypatch, mock_planka):
+    db_client = FakeDBClient("@manager")
+    mock_planka._planka_config["membership_index_refresh_sec"] = 0
+    mock_planka.get_boards_for_telegram_user("tg_user", db_client)
+
+    refreshed = threading.Event()
+    original_refresh = PlankaClient.refresh_membership_index
+
+    def _refresh(self):
+        index = original_refresh(self)
+        refreshed.set()
+        return index
+
+    monkeypatch.setattr(PlankaClient, "refresh_membership_index", _refresh)
+    boards = mock_planka.get_boards_for_telegram_user("tg_user", db_client)
+
+    assert [board.id for board in boards] == ["board_razvitie"]
+    assert refreshed.wait(timeout=5)
+    assert mock_planka.get_membership_index_stats()["refresh_count"] == 2
+
+
+@pytest.fixture
+def mock_planka_swr(monkeypatch, planka_config):
+    planka_config = dict(
+        planka_config, board_cache_soft_ttl=10, board_cache_hard_ttl=100
+    )
+    loader = JsonLoader(PLANKA_TEST_DIR)
+    requests = []
+
+    def _make_request(_, uri, payload=None):
+        requests.append(uri)
+        return 200, loader.load_json("board_razvitie.json")
+
+    monkeypatch.setattr(PlankaClient, "_make_request", _make_request)
+    monkeypatch.setattr(PlankaClient, "_make_patch_request", lambda *args, **kw: None)
+    client = PlankaClient(planka_config=planka_config)
+    client.requests = requests
+    return client
+
+
+def _age_cached_board(client, board_id, seconds):
+    client._board_cache[board_id].fetched_at -= seconds
+
+
+def test_stale_board_is_served_and_refreshed_in_background(mock_planka_swr):
+    first = mock_planka_swr._get_board_snapshot("board_razvitie")
+    _age_cached_board(mock_planka_swr, "board_razvitie", 50)
+
+    stale = mock_planka_swr._get_board_snapshot("board_razvitie")
+    mock_planka_swr._board_fetch_executor.shutdown(wait=True)
+
+    assert stale is first
+    assert mock_planka_swr.requests == ["boards/board_razvitie"] * 2
+    assert mock_planka_swr._board_cache["board_razvitie"] is not first
+
+
+def test_board_past_hard_ttl_is_fetched_synchronously(mock_planka_swr):
+    first = mock_planka_swr._get_board_snapshot("board_razvitie")
+    _age_cached_board(mock_planka_swr, "board_razvitie", 150)
+
+    fresh = mock_planka_swr._get_board_snapshot("board_razvitie")
+
+    assert fresh is not first
+    assert fresh.age() < 10
+
+
+def test_card_update_invalidates_board(monkeypatch, mock_planka_swr):
+    snapshot = mock_planka_swr._get_board_snapshot("board_razvitie")
+    snapshot.custom_fields_by_name["Cover"] = {
+        "id": "cf_cover",
+        "customFieldGroupId": "group",
+    }
+    monkeypatch.setattr(
+        planka_client_module, "load", lambda string_id, **kwargs: string_id
+    )
+
+    mock_planka_swr.set_card_custom_field(
+        SimpleNamespace(id="card_planka"), SimpleNamespace(value="Cover"), "url"
+    )
+
+    assert "board_razvitie" not in mock_planka_swr._board_cache
+
+
+def test_snapshots_from_disk_are_served_after_restart(
+    monkeypatch, tmp_path, planka_config, mock_planka
+):
+    planka_config = dict(planka_config, snapshot_dir=str(tmp_path))
+    mock_planka.update_config(planka_config)
+    mock_planka.get_lists()
+    mock_planka.get_boards_for_user()
+    assert sorted(os.listdir(tmp_path)) == [
+        "board_razvitie.json.gz",
+        "projects.json.gz",
+    ]
+
+    PlankaClient.drop_instance()
+    fetched = threading.Event()
+    release = threading.Event()
+
+    def _blocked_make_request(self, uri, payload=None):
+        release.wait(timeout=5)
+        fetched.set()
+        return 200, {"included": {}}
+
+    monkeypatch.setattr(PlankaClient, "_make_request", _blocked_make_request)
+    restarted = PlankaClient(planka_config=planka_config)
+
+    assert [item.id for item in restarted.get_lists()] == ["list_second", "list_first"]
+    assert [board.id for board in restarted.get_boards_for_user()] == [
+        "board_razvitie",
+        "board_private",
+    ]
+    release.set()
+    restarted._board_fetch_executor.shutdown(wait=True)
+    assert fetched.is_set()
+    assert restarted.get_lists() == []
+
+
+def test_snapshot_store_closes_written_file(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        store.save("board", {"name": "Доска"}, fetched_at=1.0)
+        gc.collect()
+
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+    assert store.load("board") == ({"name": "Доска"}, 1.0)
+    assert os.listdir(tmp_path) == ["board.json.gz"]
+
+
+def test_snapshots_from_disk_respect_max_age(
+    monkeypatch, tmp_path, planka_config, mock_planka
+):
+    planka_config = dict(
+        planka_config, snapshot_dir=str(tmp_path), snapshot_max_age_sec=0
+    )
+    mock_planka.update_config(planka_config)
+    mock_planka.get_lists()
+
+    PlankaClient.drop_instance()
+    restarted = PlankaClient(planka_config=planka_config)
+    restarted.requests = mock_planka.requests
+    time.sleep(0.01)
+    restarted.get_lists()
+
+    assert mock_planka.requests == ["boards/board_razvitie"] * 2
@@ -0,0 +1,168 @@
+import os
+
+import pytest
+from conftest import STATIC_TEST_DIR
+from fakes.fake_planka_server import FakePlankaServer
+from utils.json_loader import JsonLoader
+
+from src.planka.planka_client import PlankaClient
+
+PLANKA_TEST_DIR = os.path.join(STATIC_TEST_DIR, "planka")
+BOARD_ID = "board_razvitie"
+
+
+@pytest.fixture
+def planka_server():
+    loader = JsonLoader(PLANKA_TEST_DIR)
+    server = FakePlankaServer(
+        projects=loader.load_json("projects.json"),
+        boards={
+            "board_razvitie": loader.load_json("board_razvitie.json"),
+            "board_private": loader.load_json("board_private.json"),
+        },
+    )
+    # boards with an empty action feed are reloaded on their first action
+    server.add_action(BOARD_ID, "createCard", "card_planka")
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def planka_client(planka_server):
+    PlankaClient.drop_instance()
+    client = PlankaClient(
+        planka_config={
+            "url": planka_server.url,
+            "api_key": "stub-api-key",
+            "board_id": BOARD_ID,
+            "incremental_sync": True,
+            "max_retries": 0,
+            # every read goes to the server, to see how the board is synced
+            "board_cache_soft_ttl": 0,
+            "board_cache_hard_ttl": 0,
+        }
+    )
+    yield client
+    PlankaClient.drop_instance()
+
+
+def _card_ids(client, list_id):
+    return [card.id for card in client.get_cards(list_id)]
+
+
+def test_unchanged_board_is_not_downloaded_again(planka_server, planka_client):
+    _card_ids(planka_client, "list_first")
+    planka_server.requests.clear()
+
+    assert _card_ids(planka_client, "list_first") == ["card_planka"]
+    assert planka_server.requests == [f"/api/boards/{BOARD_ID}/actions"]
+    assert planka_client.board_sync_stats == {
+        "full": 1,
+        "incremental": 1,
+        "fallbacks": 0,
+    }
+
+
+def test_card_actions_are_applied_as_deltas(planka_server, planka_client):
+    _card_ids(planka_client, "list_first")
+    planka_server.move_card(BOARD_ID, "card_planka", "list_second")
+    planka_server.create_card(
+        BOARD_ID, {"id": "card_new", "listId": "list_first", "name": "New card"}
+    )
+    planka_server.add_member_to_card(BOARD_ID, "card_new", "user_other")
+    planka_server.requests.clear()
+
+    assert _card_ids(planka_client, "list_first") == ["card_new"]
+    assert sorted(planka_server.requests) == [
+        f"/api/boards/{BOARD_ID}/actions",
+        "/api/cards/card_new",
+        "/api/cards/card_planka",
+    ]
+    assert _card_ids(planka_client, "list_second") == ["card_planka", "card_tests"]
+    new_card = planka_client.get_cards("list_first")[0]
+    assert [member.username for member in new_card.members] == ["other"]
+    assert planka_client.board_sync_stats["full"] == 1
+
+
+def test_deleted_card_is_dropped_from_snapshot(planka_server, planka_client):
+    _card_ids(planka_client, "list_second")
+    planka_server.delete_card(BOARD_ID, "card_tests")
+    planka_server.add_action(BOARD_ID, "moveCard", "card_tests")
+
+    assert _card_ids(planka_client, "list_second") == []
+    assert planka_client.board_sync_stats["full"] == 1
+
+
+def test_board_level_action_falls_back_to_full_reload(planka_server, planka_client):
+    _card_ids(planka_client, "list_first")
+    planka_server.add_action(BOARD_ID, "createList")
+    planka_server.requests.clear()
+
+    _card_ids(planka_client, "list_first")
+
+    assert f"/api/boards/{BOARD_ID}" in planka_server.requests
+    assert planka_client.board_sync_stats["fallbacks"] == 1
+    assert planka_client.board_sync_stats["full"] == 2
+
+
+def test_board_is_reloaded_after_full_sync_interval(planka_server, planka_client):
+    planka_client.full_sync_interval = 0
+    _card_ids(planka_client, "list_first")
+    planka_server.delete_card(BOARD_ID, "card_planka")
+
+    assert _card_ids(planka_client, "list_first") == []
+    assert planka_client.board_sync_stats["incremental"] == 0
+
+
+def test_card_edits_without_actions_wait_for_full_sync(planka_server, planka_client):
+    _card_ids(planka_client, "list_first")
+    planka_server.update_card(BOARD_ID, "card_planka", name="Renamed")
+    planka_server.set_custom_field_value(
+        BOARD_ID, "card_tests", "custom_field_cover", "Cover"
+    )
+
+    assert [card.name for card in planka_client.get_cards("list_first")] == [
+        "Implement Planka"
+    ]
+    planka_client.full_sync_interval = 0
+    assert [card.name for card in planka_client.get_cards("list_first")] == ["Renamed"]
+    snapshot = planka_client._get_board_snapshot(BOARD_ID)
+    assert snapshot.custom_field_values[("card_tests", "custom_field_cover")] == (
+        "Cover"
+    )
+    assert planka_client.board_sync_stats["full"] >= 2
+
+
+def test_actions_beyond_one_page_fall_back_to_full_reload(planka_server, planka_client):
+    planka_server.actions_page_size = 2
+    _card_ids(planka_client, "list_first")
+    # the last seen action is out of the page
+    for _ in range(3):
+        planka_server.add_action(BOARD_ID, "moveCard", "card_planka")
+
+    _card_ids(planka_client, "list_first")
+
+    assert planka_client.board_sync_stats["fallbacks"] == 1
+    assert planka_client.board_sync_stats["full"] == 2
+
+
+def test_failed_card_request_falls_back_to_full_reload(planka_server, planka_client):
+    _card_ids(planka_client, "list_second")
+    planka_server.move_card(BOARD_ID, "card_tests", "list_first")
+    planka_server.failures["/api/cards/card_tests"] = 500
+
+    # not treated as a deletion
+    assert _card_ids(planka_client, "list_first") == ["card_planka", "card_tests"]
+    assert planka_client.board_sync_stats["fallbacks"] == 1
+    assert planka_client.board_sync_stats["full"] == 2
+
+
+def test_card_moved_to_new_list_falls_back_to_full_reload(planka_server, planka_client):
+    _card_ids(planka_client, "list_second")
+    planka_server.update_card(BOARD_ID, "card_tests", listId="list_new")
+    planka_server.add_action(BOARD_ID, "moveCard", "card_tests")
+
+    assert _card_ids(planka_client, "list_second") == []
+    assert planka_client.board_sync_stats["fallbacks"] == 1
+    assert planka_client.board_sync_stats["full"] == 2
@@ -0,0 +1,77 @@
+import threading
+from datetime import timedelta
+
+from src.db.db_client import DBClient
+from src.reminder_dispatcher import ReminderDispatcher
+
+
+class FakeDBClient:
+    def __init__(self, reminder_times):
+        self.reminder_times = reminder_times
+        self.listeners = []
+
+    def add_reminder_listener(self, listener):
+        self.listeners.append(listener)
+
+    def get_reminder_times(self):
+        return self.reminder_times
+
+
+def test_dispatcher_fires_at_due_time_and_follows_changes():
+    now = DBClient._get_now_msk_naive()
+    db_client = FakeDBClient(
+        [(1, now + timedelta(hours=1)), (2, now + timedelta(days=1))]
+    )
+    fired = threading.Event()
+
+    def send_reminders():
+        # claimed reminders are removed by the DB
+        db_client.reminder_times = []
+        for listener in db_client.listeners:
+            listener(2, None)
+        fired.set()
+
+    dispatcher = ReminderDispatcher(db_client, send_reminders)
+    dispatcher.start()
+    try:
+        assert db_client.listeners == [dispatcher.schedule]
+        assert dispatcher.next_due() == now + timedelta(hours=1)
+        assert not fired.wait(0.1)
+
+        # deleted reminder is skipped
+        dispatcher.schedule(1, None)
+        assert dispatcher.next_due() == now + timedelta(days=1)
+
+        # updated reminder fires right away
+        dispatcher.schedule(2, now)
+        assert fired.wait(2)
+        dispatcher.stop()
+        dispatcher._thread.join(2)
+        assert dispatcher.next_due() is None
+    finally:
+        dispatcher.stop()
+
+
+def test_dispatcher_retries_reminders_not_claimed_by_failed_send():
+    now = DBClient._get_now_msk_naive()
+    db_client = FakeDBClient([(1, now), (2, now)])
+    sent = threading.Event()
+
+    def send_reminders():
+        # reminder 1 is claimed and rescheduled, sending 2 fails before that
+        db_client.reminder_times = [(1, now + timedelta(days=7)), (2, now)]
+        dispatcher.schedule(1, now + timedelta(days=7))
+        sent.set()
+        raise RuntimeError("Telegram is down")
+
+    dispatcher = ReminderDispatcher(db_client, send_reminders)
+    dispatcher.start()
+    try:
+        assert sent.wait(2)
+        dispatcher.stop()
+        dispatcher._thread.join(2)
+        assert dispatcher.next_due() == dispatcher._next_times[2]
+        assert now < dispatcher._next_times[2] <= now + timedelta(minutes=2)
+        assert dispatcher._next_times[1] == now + timedelta(days=7)
+    finally:
+        dispatcher.stop()
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from src.tg.sender import TelegramSender
+
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+        self.active = 0
+        self.max_active = 0
+
+    async def _send(self, chat_id, item):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.sent.append((chat_id, item))
+        self.active -= 1
+
+    async def send_message(self, text, chat_id, **kwargs):
+        await self._send(chat_id, text)
+
+    async def send_poll(self, chat_id, question, **kwargs):
+        await self._send(chat_id, question)
+
+
+@pytest.fixture
+def sender(mock_config_manager):
+    TelegramSender.drop_instance()
+    tg_config = dict(mock_config_manager.get_telegram_config())
+    tg_config["max_concurrent_chats"] = 2
+    yield TelegramSender(
+        bot=FakeBot(), tg_config=tg_config, loop=asyncio.new_event_loop()
+    )
+    TelegramSender.drop_instance()
+
+
+def test_send_to_chats_concurrently_keeps_order_within_chat(sender):
+    poll = {"question": "poll", "options": ["yes", "no"], "is_anonymous": False}
+    messages_by_chat = {
+        chat_id: [(f"text {chat_id}", {}), ("", {"poll_options": poll})]
+        for chat_id in range(4)
+    }
+
+    results = sender.send_to_chats_concurrently(messages_by_chat)
+
+    assert sender.bot.max_active == 2
+    for chat_id in range(4):
+        assert [item for chat, item in sender.bot.sent if chat == chat_id] == [
+            f"text {chat_id}",
+            "poll",
+        ]
+        (text_sent, text_seconds), (poll_sent, poll_seconds) = results[chat_id]
+        assert text_sent and poll_sent
+        assert 0 < text_seconds < poll_seconds
+    assert sender.send_to_chats_concurrently({}) == {}
+
+
+@pytest.mark.parametrize("error", [None, TimeoutError()])
+def test_send_to_chats_concurrently_reports_unconfirmed_messages(
+    sender, monkeypatch, error
+):
+    def run_on_loop(coro, timeout):
+        coro.close()
+        if error is not None:
+            raise error
+
+    monkeypatch.setattr(sender, "_run_on_loop", run_on_loop)
+
+    results = sender.send_to_chats_concurrently(
+        {1: [("a", {}), ("b", {})], 2: [("c", {})]}
+    )
+
+    assert {
+        chat_id: [sent for sent, _ in chat] for chat_id, chat in results.items()
+    } == {
+        1: [False, False],
+        2: [False],
+    }
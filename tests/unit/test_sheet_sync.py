@@ -0,0 +1,99 @@
+from sqlalchemy import Column, MetaData, String, Table, create_engine, select
+
+from src.db.sheet_sync import SyncResult, sync_table
+
+metadata = MetaData()
+curators = Table(
+    "curators",
+    metadata,
+    Column("role", String, primary_key=True),
+    Column("name", String, primary_key=True),
+    Column("telegram", String),
+)
+
+
+def _make_engine(rows):
+    engine = create_engine("sqlite:///:memory:")
+    metadata.create_all(engine)
+    if rows:
+        with engine.begin() as connection:
+            connection.execute(curators.insert(), rows)
+    return engine
+
+
+def _read_rows(engine):
+    with engine.connect() as connection:
+        return {
+            (row["role"], row["name"]): row["telegram"]
+            for row in connection.execute(select([curators]))
+        }
+
+
+def test_sync_table_applies_only_changes():
+    engine = _make_engine(
+        [
+            {"role": "NLP", "name": "Ann", "telegram": "@ann"},
+            {"role": "NLP", "name": "Bob", "telegram": "@bob"},
+            {"role": "Art", "name": "Ann", "telegram": "@ann"},
+        ]
+    )
+
+    with engine.begin() as connection:
+        result = sync_table(
+            connection,
+            curators,
+            [
+                {"role": "NLP", "name": "Ann", "telegram": "@ann"},
+                {"role": "NLP", "name": "Bob", "telegram": "@new_bob"},
+                {"role": "Math", "name": "Eve", "telegram": "@eve"},
+            ],
+        )
+
+    assert result == SyncResult(inserted=1, updated=1, deleted=1, unchanged=1)
+    assert _read_rows(engine) == {
+        ("NLP", "Ann"): "@ann",
+        ("NLP", "Bob"): "@new_bob",
+        ("Math", "Eve"): "@eve",
+    }
+
+
+def test_sync_table_keeps_first_duplicate_and_empties_table():
+    engine = _make_engine([])
+
+    with engine.begin() as connection:
+        result = sync_table(
+            connection,
+            curators,
+            [
+                {"role": "NLP", "name": "Ann", "telegram": "@first"},
+                {"role": "NLP", "name": "Ann", "telegram": "@second"},
+            ],
+        )
+    assert result == SyncResult(inserted=1)
+    assert _read_rows(engine) == {("NLP", "Ann"): "@first"}
+
+    with engine.begin() as connection:
+        assert sync_table(connection, curators, []) == SyncResult(deleted=1)
+    assert _read_rows(engine) == {}
+
+
+def test_sync_table_compares_sheet_numbers_as_strings():
+    engine = _make_engine(
+        [
+            {"role": "1", "name": "Ann", "telegram": "5"},
+            {"role": "2", "name": "Bob", "telegram": None},
+        ]
+    )
+
+    with engine.begin() as connection:
+        result = sync_table(
+            connection,
+            curators,
+            [
+                {"role": 1, "name": "Ann", "telegram": 5},
+                {"role": 2, "name": "Bob", "telegram": 7},
+            ],
+        )
+
+    assert result == SyncResult(updated=1, unchanged=1)
+    assert _read_rows(engine) == {("1", "Ann"): "5", ("2", "Bob"): "7"}
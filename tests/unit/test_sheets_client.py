@@ -1,7 +1,10 @@
 import os
+import threading
+from types import SimpleNamespace
 
 import pytest
 from conftest import SHEETS_TEST_DIR
+from sheetfu.modules.table import Item
 from utils.json_loader import JsonLoader
 
 from src.sheets.sheets_client import GoogleSheetsClient
@@ -129,3 +132,181 @@ def test_fetch_rubrics(mock_sheets_client):
 @pytest.mark.skip(reason="TODO")
 def test_fill_posts_registry(mock_sheets_client):
     mock_sheets_client.update_posts_registry([])
+
+
+class FakeSheetsRequest:
+    def __init__(self, response, calls, **kwargs):
+        self.response = response
+        calls.append(kwargs)
+
+    def execute(self):
+        return self.response
+
+
+def test_get_cell_values_uses_single_batch_get(monkeypatch):
+    client = _make_sheets_client(monkeypatch, _base_sheets_config())
+    calls = []
+    response = {
+        "valueRanges": [
+            {"range": "Report!B2", "values": [[42]]},
+            {"range": "Report!C3"},
+            {"range": "Report!D4", "values": [["text"]]},
+        ]
+    }
+    service = SimpleNamespace(
+        spreadsheets=lambda: SimpleNamespace(
+            values=lambda: SimpleNamespace(
+                batchGet=lambda **kwargs: FakeSheetsRequest(response, calls, **kwargs)
+            )
+        )
+    )
+    sheet = SimpleNamespace(
+        client=SimpleNamespace(sheet_service=service),
+        spreadsheet=SimpleNamespace(id="spreadsheet_id"),
+        name="Report",
+    )
+
+    values = client.get_cell_values(sheet, ["B2", "C3", "B2", "D4"])
+
+    assert values == {"B2": 42, "C3": "", "D4": "text"}
+    assert calls == [
+        {
+            "spreadsheetId": "spreadsheet_id",
+            "ranges": ["Report!B2", "Report!C3", "Report!D4"],
+            "valueRenderOption": "UNFORMATTED_VALUE",
+        }
+    ]
+    assert client.get_cell_values(sheet, []) == {}
+
+
+def _make_versioned_sheets_client(monkeypatch, versions, downloads):
+    client = _make_sheets_client(monkeypatch, _base_sheets_config())
+    version_calls = []
+    drive_service = SimpleNamespace(
+        files=lambda: SimpleNamespace(
+            get=lambda **kwargs: FakeSheetsRequest(
+                {"version": versions[kwargs["fileId"]]}, version_calls, **kwargs
+            )
+        )
+    )
+    client.client = SimpleNamespace(drive_service=drive_service)
+
+    def _fetch_table(self, sheet_key, sheet_name=None):
+        downloads.append((sheet_key, sheet_name))
+        return f"{sheet_key} table {len(downloads)}"
+
+    monkeypatch.setattr(GoogleSheetsClient, "_fetch_table", _fetch_table)
+    return client, version_calls
+
+
+def test_fetch_curators_redownloads_only_modified_sheet(monkeypatch):
+    versions = {"curators_sheet_key": "1"}
+    downloads = []
+    client, version_calls = _make_versioned_sheets_client(
+        monkeypatch, versions, downloads
+    )
+
+    assert client.fetch_curators() == "curators_sheet_key table 1"
+    assert client.fetch_curators() == "curators_sheet_key table 1"
+    versions["curators_sheet_key"] = "2"
+    assert client.fetch_curators() == "curators_sheet_key table 2"
+
+    assert downloads == [("curators_sheet_key", None)] * 2
+    assert len(version_calls) == 3
+
+
+def test_fetch_hr_forms_processed_is_cached_for_read_only_callers(monkeypatch):
+    versions = {"hr_sheet_key": "1"}
+    downloads = []
+    client, _ = _make_versioned_sheets_client(monkeypatch, versions, downloads)
+
+    client.fetch_hr_forms_processed(read_only=True)
+    client.fetch_hr_forms_processed(read_only=True)
+    client.fetch_hr_forms_processed()
+
+    assert downloads == [("hr_sheet_key", "Анкеты")] * 2
+
+
+def test_client_is_created_per_thread(monkeypatch):
+    created = []
+
+    def _authorize(self):
+        created.append(threading.current_thread().name)
+        self.client = object()
+
+    monkeypatch.setattr(GoogleSheetsClient, "_authorize", _authorize)
+    client = GoogleSheetsClient(sheets_config=_base_sheets_config())
+    main_client = client.client
+    other_clients = []
+    thread = threading.Thread(
+        target=lambda: other_clients.extend([client.client, client.client]),
+        name="worker",
+    )
+    thread.start()
+    thread.join()
+
+    assert client.client is main_client
+    assert other_clients[0] is other_clients[1] is not main_client
+    assert created == [threading.current_thread().name, "worker"]
+
+    client.update_config(_base_sheets_config())
+    assert client.client is not main_client
+
+
+class FakeRegistryTable:
+    def __init__(self, header, rows):
+        self.header = header
+        self.items = [Item(index, header, values) for index, values in enumerate(rows)]
+        self.added = []
+        self.commits = 0
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def add_one(self, item_dict):
+        self.added.append(item_dict)
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_update_posts_registry_skips_registered_urls_exactly(monkeypatch):
+    client = _make_sheets_client(monkeypatch, _base_sheets_config())
+    table = FakeRegistryTable(
+        ["Название поста", "Трелло"],
+        [["Old", "https://trello.com/c/abc1"], ["Older", "https://trello.com/c/xyz"]],
+    )
+    monkeypatch.setattr("src.sheets.sheets_client.Table", lambda data_range: table)
+    monkeypatch.setattr(
+        GoogleSheetsClient,
+        "_open_by_key",
+        lambda self, key: SimpleNamespace(
+            get_sheet_by_id=lambda sheet_id: SimpleNamespace(
+                get_data_range=lambda: None
+            )
+        ),
+    )
+
+    def _entry(title, url):
+        return SimpleNamespace(
+            title=title,
+            trello_url=url,
+            to_dict=lambda: {"Название поста": title, "Трелло": url},
+        )
+
+    new_posts = client.update_posts_registry(
+        [
+            # prefix of a registered url is a different card
+            _entry("Prefix", "https://trello.com/c/abc"),
+            _entry("Registered", "https://trello.com/c/xyz"),
+            _entry("New", "https://trello.com/c/new"),
+            _entry("New again", "https://trello.com/c/new"),
+        ]
+    )
+
+    assert new_posts == ["Prefix", "New"]
+    assert [row["Трелло"] for row in table.added] == [
+        "https://trello.com/c/abc",
+        "https://trello.com/c/new",
+    ]
+    assert table.commits == 1
@@ -0,0 +1,89 @@
+import pytest
+from fakes.fake_sheets_table import FakeSheetsTable
+
+from src.sheets import sheets_objects
+from src.sheets.sheets_objects import HRPersonRaw, SheetsTable
+
+HEADER = [
+    "sheets__hr__raw__timestamp",
+    "sheets__hr__raw__name",
+    "sheets__hr__raw__telegram",
+    "sheets__hr__raw__status",
+]
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    loads = []
+
+    def _load(string_id, **kwargs):
+        loads.append(string_id)
+        return string_id
+
+    monkeypatch.setattr(sheets_objects, "load", _load)
+    return loads
+
+
+def _rows(count):
+    return [
+        [44000.5, f"Name {i}", f"@user{i}", "" if i % 2 else "done"]
+        for i in range(count)
+    ]
+
+
+def test_sheets_table_resolves_columns_once(loads):
+    people = list(SheetsTable(FakeSheetsTable(HEADER, _rows(50)), HRPersonRaw))
+
+    assert [person.name for person in people[:2]] == ["Name 0", "Name 1"]
+    assert all(person.telegram and person.ts for person in people)
+    assert len(loads) == len(HRPersonRaw.field_alias)
+
+
+def test_sheets_table_missing_column_fails_on_access(loads):
+    person = next(iter(SheetsTable(FakeSheetsTable(HEADER, _rows(1)), HRPersonRaw)))
+
+    assert person.name == "Name 0"
+    with pytest.raises(ValueError, match="sheets__hr__raw__email"):
+        person.email
+
+
+def test_sheets_table_commits_dirty_cells_in_one_batch(loads):
+    table = FakeSheetsTable(HEADER, _rows(5))
+    forms = SheetsTable(table, HRPersonRaw)
+    people = list(forms)
+
+    people[1].status = "double"
+    people[2].status = "processed"
+    people[2].telegram = "@renamed"
+    people[4].name = "Renamed"
+    people[4].status = "rejected"
+    added = forms.add_one({"name": "New", "telegram": "@new"})
+
+    assert table.batches == []
+    assert people[4].name == "Renamed"
+    assert added.name == "New" and added.status is None
+    assert len(forms) == 6
+
+    forms.commit()
+
+    # only changed cells are written, adjacent cells of a row as one range
+    ranges = [request["updateCells"]["range"] for request in table.batches]
+    assert [
+        (
+            r["startRowIndex"],
+            r["endRowIndex"],
+            r["startColumnIndex"],
+            r["endColumnIndex"],
+        )
+        for r in ranges
+    ] == [(2, 3, 3, 4), (3, 4, 2, 4), (5, 6, 1, 2), (5, 6, 3, 4)]
+    written = [
+        [value["userEnteredValue"]["stringValue"] for value in row["values"]]
+        for request in table.batches
+        for row in request["updateCells"]["rows"]
+    ]
+    assert written == [["double"], ["@renamed", "processed"], ["Renamed"], ["rejected"]]
+    assert table.commits == 1
+
+    forms.commit()
+    assert len(table.batches) == 4
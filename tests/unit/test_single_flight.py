@@ -0,0 +1,44 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def _func():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        owner = executor.submit(single_flight.do, "key", _func)
+        assert started.wait(timeout=5)
+        waiters = [executor.submit(single_flight.do, "key", _func) for _ in range(3)]
+        # give waiters time to join the call in flight
+        time.sleep(0.1)
+        release.set()
+        results = [owner.result()] + [waiter.result() for waiter in waiters]
+
+    assert results == ["result"] * 4
+    assert calls == [1]
+    assert single_flight.in_flight() == 0
+
+
+def test_exception_is_propagated_and_key_released():
+    single_flight = SingleFlight()
+
+    def _fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        single_flight.do("key", _fail)
+    assert single_flight.do("key", lambda: "retried") == "retried"
@@ -0,0 +1,85 @@
+from collections import defaultdict
+
+import pytest
+from sqlalchemy import event
+
+from src.strings import DBString, StringsDBClient, StringTemplate, load
+
+
+@pytest.fixture(autouse=True)
+def reset_strings_db_client_singleton():
+    StringsDBClient.drop_instance()
+    yield
+    StringsDBClient.drop_instance()
+
+
+class FakeItem:
+    def __init__(self, string_id, message):
+        self.values = {"Id": string_id, "Message": message}
+
+    def get_field_value(self, name):
+        return self.values[name]
+
+
+class FakeSheetsClient:
+    def __init__(self, strings):
+        self.strings = strings
+
+    def fetch_strings(self):
+        return [FakeItem(string_id, message) for string_id, message in self.strings]
+
+
+def _count_queries(engine):
+    queries = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args, **kwargs: queries.append(args)
+    )
+    return queries
+
+
+def test_load_is_served_from_catalog(mock_strings_db_client):
+    mock_strings_db_client.fetch_strings_sheet(
+        FakeSheetsClient([("greeting", " Hello, {name}! "), ("plain", "no args")])
+    )
+    queries = _count_queries(mock_strings_db_client.engine)
+
+    assert load("greeting", name="world") == "Hello, world!"
+    assert load("greeting") == "Hello, ?!"
+    assert load("plain") == "no args"
+    assert load("missing") == "<missing>"
+    assert queries == []
+
+
+def test_fetch_strings_sheet_swaps_catalog(mock_strings_db_client):
+    mock_strings_db_client.fetch_strings_sheet(FakeSheetsClient([("key", "old")]))
+    assert load("key") == "old"
+
+    mock_strings_db_client.fetch_strings_sheet(FakeSheetsClient([("key", "new")]))
+    assert load("key") == "new"
+
+
+def test_catalog_is_loaded_from_existing_table(mock_strings_db_client):
+    session = mock_strings_db_client.Session()
+    session.add(DBString("key", "stored"))
+    session.commit()
+    assert load("key") == "<key>"
+
+    assert mock_strings_db_client.reload_catalog() == 1
+    assert load("key") == "stored"
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "{a} and {b}",
+        "{{escaped}} {a}",
+        "{a!r} {b:>5}",
+        "{a.real}",
+        "{b:{a}}",
+        "no fields",
+    ],
+)
+def test_template_matches_format_map(value):
+    kwargs = {"a": 1}
+    expected = value.format_map(defaultdict(lambda: "?", kwargs))
+    assert StringTemplate(value).render(kwargs) == expected
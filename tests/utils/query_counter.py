@@ -0,0 +1,37 @@
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Records SQL statements executed on the engine while active"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def assert_max_queries(engine: Engine, max_queries: int):
+    with QueryCounter(engine) as counter:
+        yield counter
+    assert counter.count <= max_queries, (
+        f"Expected at most {max_queries} queries, got {counter.count}:\n"
+        + "\n".join(counter.statements)
+    )